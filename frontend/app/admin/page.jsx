@@ -3,6 +3,7 @@
 import { useSession } from "next-auth/react"
 import { useRouter } from "next/navigation"
 import { useEffect, useState } from "react"
+import { apiFetch } from "@/lib/api"
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
 import { Button } from "@/components/ui/button"
 import { Tabs, TabsContent, TabsList, TabsTrigger } from "@/components/ui/tabs"
@@ -29,13 +30,8 @@ function PendingKYCList() {
     useEffect(() => {
         const loadKYC = async () => {
             try {
-                const token = typeof window !== "undefined" ? localStorage.getItem("npw_token") : null
                 const headers = { "Content-Type": "application/json" }
-                if (token) {
-                    headers["Authorization"] = `Bearer ${token}`
-                }
-
-                const res = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/accounts/kyc/pending/`, { headers })
+                const res = await apiFetch(`${process.env.NEXT_PUBLIC_API_URL}/accounts/kyc/pending/`, { headers })
                 if (res.ok) {
                     const data = await res.json()
                     setKycList(Array.isArray(data) ? data : [])
@@ -52,15 +48,11 @@ function PendingKYCList() {
     const handleVerify = async (kycId, action) => {
         setProcessing(kycId)
         try {
-            const token = typeof window !== "undefined" ? localStorage.getItem("npw_token") : null
             const headers = {
                 "Content-Type": "application/json",
             }
-            if (token) {
-                headers["Authorization"] = `Bearer ${token}`
-            }
 
-            const res = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/accounts/kyc/${kycId}/verify/`, {
+            const res = await apiFetch(`${process.env.NEXT_PUBLIC_API_URL}/accounts/kyc/${kycId}/verify/`, {
                 method: "POST",
                 headers,
                 body: JSON.stringify({ action, admin_notes: "" }),
@@ -2,6 +2,7 @@
 
 import { signIn, getSession } from "next-auth/react"
 import { useRouter, useSearchParams } from "next/navigation"
+import { storeTokens } from "@/lib/api"
 import { useEffect, useState } from "react"
 import { Button } from "@/components/ui/button"
 import { Card, CardContent, CardHeader, CardTitle, CardDescription } from "@/components/ui/card"
@@ -160,7 +161,7 @@ export default function SignInPage() {
       
       // For login, store token and proceed to dashboard
       if (typeof window !== "undefined") {
-        localStorage.setItem("npw_token", data.token)
+        storeTokens(data)
         localStorage.setItem("npw_role", actualRole)
         if (data?.user?.email) localStorage.setItem("npw_user_email", data.user.email)
         if (data?.user?.name || formData.username) localStorage.setItem("npw_user_name", data.user.name || formData.username)
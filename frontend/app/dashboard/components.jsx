@@ -6,6 +6,7 @@ import { Button } from "@/components/ui/button"
 import { useSession } from "next-auth/react"
 import { Star, Calendar, CheckCircle, Clock, XCircle, MessageSquare } from "lucide-react"
 import Link from "next/link"
+import { apiFetch, getToken } from "@/lib/api"
 
 export function ServicesList({ role, session }) {
     const [items, setItems] = useState([])
@@ -16,12 +17,8 @@ export function ServicesList({ role, session }) {
         const run = async () => {
             setLoading(true)
             try {
-                const localToken = typeof window !== "undefined" ? localStorage.getItem("npw_token") : null
-                const bearer = localToken || session?.accessToken || null
-                const headers = bearer ? {
-                    "Authorization": `Bearer ${bearer}`,
-                    "Content-Type": "application/json"
-                } : { "Content-Type": "application/json" }
+                const bearer = getToken() || session?.accessToken || null
+                const headers = { "Content-Type": "application/json" }
 
                 // Map role - "client" is displayed but backend uses "customer"
                 const backendRole = role === "client" ? "customer" : role
@@ -35,7 +32,7 @@ export function ServicesList({ role, session }) {
                     url = `${process.env.NEXT_PUBLIC_API_URL}/services/services/`
                 }
 
-                const res = await fetch(url, { headers })
+                const res = await apiFetch(url, { headers }, session?.accessToken)
                 if (!res.ok) throw new Error("Failed to load services")
                 
                 const data = await res.json()
@@ -108,19 +105,15 @@ export function BookingsList({ role, session }) {
         const run = async () => {
             setLoading(true)
             try {
-                const localToken = typeof window !== "undefined" ? localStorage.getItem("npw_token") : null
-                const bearer = localToken || session?.accessToken || null
+                const bearer = getToken() || session?.accessToken || null
                 if (!bearer) {
                     setError("Sign in to view bookings.")
                     setItems([])
                     return
                 }
-                const headers = {
-                    "Authorization": `Bearer ${bearer}`,
-                    "Content-Type": "application/json"
-                }
+                const headers = { "Content-Type": "application/json" }
 
-                const res = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/bookings/mine/`, { headers })
+                const res = await apiFetch(`${process.env.NEXT_PUBLIC_API_URL}/bookings/mine/`, { headers }, session?.accessToken)
                 if (!res.ok) throw new Error("Failed to load bookings")
 
                 const data = await res.json()
@@ -139,13 +132,9 @@ export function BookingsList({ role, session }) {
         setError("")
         setSuccess("")
         try {
-            const token = typeof window !== "undefined" ? localStorage.getItem("npw_token") : null
-            const headers = token ? {
-                "Authorization": `Bearer ${token}`,
-                "Content-Type": "application/json"
-            } : { "Content-Type": "application/json" }
+            const headers = { "Content-Type": "application/json" }
 
-            const res = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/bookings/${bookingId}/rate/`, {
+            const res = await apiFetch(`${process.env.NEXT_PUBLIC_API_URL}/bookings/${bookingId}/rate/`, {
                 method: "PATCH",
                 headers,
                 body: JSON.stringify({ rating, review }),
@@ -157,7 +146,7 @@ export function BookingsList({ role, session }) {
             setSuccess("Thanks for your review!")
             
             // Refresh bookings
-            const refreshed = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/bookings/mine/`, {
+            const refreshed = await apiFetch(`${process.env.NEXT_PUBLIC_API_URL}/bookings/mine/`, {
                 headers
             }).then((r) => r.json()).catch(() => [])
             setItems(Array.isArray(refreshed) ? refreshed : [])
@@ -170,13 +159,9 @@ export function BookingsList({ role, session }) {
         setError("")
         setSuccess("")
         try {
-            const token = typeof window !== "undefined" ? localStorage.getItem("npw_token") : null
-            const headers = token ? {
-                "Authorization": `Bearer ${token}`,
-                "Content-Type": "application/json"
-            } : { "Content-Type": "application/json" }
+            const headers = { "Content-Type": "application/json" }
 
-            const res = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/bookings/${bookingId}/status/`, {
+            const res = await apiFetch(`${process.env.NEXT_PUBLIC_API_URL}/bookings/${bookingId}/status/`, {
                 method: "PATCH",
                 headers,
                 body: JSON.stringify({ status }),
@@ -188,7 +173,7 @@ export function BookingsList({ role, session }) {
             setSuccess("Status updated!")
             
             // Refresh bookings
-            const refreshed = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/bookings/mine/`, {
+            const refreshed = await apiFetch(`${process.env.NEXT_PUBLIC_API_URL}/bookings/mine/`, {
                 headers
             }).then((r) => r.json()).catch(() => [])
             setItems(Array.isArray(refreshed) ? refreshed : [])
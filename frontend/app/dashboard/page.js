@@ -22,6 +22,7 @@ import {
 import Link from "next/link";
 import { signOut } from "next-auth/react";
 import { ServicesList, BookingsList } from "./components";
+import { apiFetch, getToken, logout } from "@/lib/api";
 
 export default function DashboardPage() {
   const { data: session, status } = useSession();
@@ -52,16 +53,14 @@ export default function DashboardPage() {
     // Get user's actual role from backend
     const fetchUserRole = async () => {
       try {
-        const token = typeof window !== "undefined" ? localStorage.getItem("npw_token") : null;
-        if (!token || !process.env.NEXT_PUBLIC_API_URL || !session?.user?.email) {
+        if (!getToken() || !process.env.NEXT_PUBLIC_API_URL || !session?.user?.email) {
           return;
         }
 
         // Fetch user data from backend to get actual role
-        const userRes = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/accounts/user-stats/`, {
+        const userRes = await apiFetch(`${process.env.NEXT_PUBLIC_API_URL}/accounts/user-stats/`, {
           headers: {
             "Content-Type": "application/json",
-            "Authorization": `Bearer ${token}`
           }
         });
 
@@ -115,35 +114,23 @@ export default function DashboardPage() {
 
       try {
         // Use token from localStorage if available, otherwise try session token
-        const token = typeof window !== "undefined" ? localStorage.getItem("npw_token") : null;
-        const authHeader = token 
-          ? `Bearer ${token}` 
-          : session?.accessToken 
-          ? `Bearer ${session.accessToken}` 
-          : null;
-
-        if (!authHeader) {
+        if (!getToken() && !session?.accessToken) {
           console.warn("No auth token available for stats");
           setLoadingStats(false);
           return;
         }
 
-        const res = await fetch(
+        // Refreshes an expired access token; tokens are cleared if that fails
+        const res = await apiFetch(
           `${process.env.NEXT_PUBLIC_API_URL}/accounts/user-stats/`,
           {
             headers: {
               "Content-Type": "application/json",
-              Authorization: authHeader,
             },
-          }
+          },
+          session?.accessToken
         );
         if (!res.ok) {
-          if (res.status === 401) {
-            // Token expired, clear it
-            if (typeof window !== "undefined") {
-              localStorage.removeItem("npw_token");
-            }
-          }
           // Graceful fallback
           setStats({});
         } else {
@@ -175,10 +162,11 @@ export default function DashboardPage() {
     return null;
   }
 
-  const handleSignOut = () => {
+  const handleSignOut = async () => {
     if (typeof window !== "undefined") {
       localStorage.removeItem("npw_role");
     }
+    await logout();
     signOut({ callbackUrl: "/" });
   };
 
@@ -3,6 +3,7 @@
 import { useSession } from "next-auth/react"
 import { useRouter } from "next/navigation"
 import { useEffect, useState } from "react"
+import { apiFetch } from "@/lib/api"
 import { Button } from "@/components/ui/button"
 import { Card, CardContent, CardHeader, CardTitle, CardDescription } from "@/components/ui/card"
 import { Input } from "@/components/ui/input"
@@ -46,15 +47,11 @@ export default function KYCPage() {
         // Check KYC status
         const checkStatus = async () => {
             try {
-                const token = typeof window !== "undefined" ? localStorage.getItem("npw_token") : null
                 const headers = {
                     "Content-Type": "application/json",
                 }
-                if (token) {
-                    headers["Authorization"] = `Bearer ${token}`
-                }
 
-                const res = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/accounts/kyc/status/`, {
+                const res = await apiFetch(`${process.env.NEXT_PUBLIC_API_URL}/accounts/kyc/status/`, {
                     headers
                 })
                 
@@ -125,11 +122,7 @@ export default function KYCPage() {
         }
 
         try {
-            const token = typeof window !== "undefined" ? localStorage.getItem("npw_token") : null
             const headers = {}
-            if (token) {
-                headers["Authorization"] = `Bearer ${token}`
-            }
 
             const formDataToSend = new FormData()
             formDataToSend.append("photo", formData.photo)
@@ -145,7 +138,7 @@ export default function KYCPage() {
                 formDataToSend.append("passport", formData.passport)
             }
 
-            const res = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/accounts/kyc/submit/`, {
+            const res = await apiFetch(`${process.env.NEXT_PUBLIC_API_URL}/accounts/kyc/submit/`, {
                 method: "POST",
                 headers,
                 body: formDataToSend,
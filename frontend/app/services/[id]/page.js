@@ -3,6 +3,7 @@
 import { useEffect, useState } from "react"
 import { useParams, useRouter } from "next/navigation"
 import { useSession } from "next-auth/react"
+import { apiFetch } from "@/lib/api"
 import { Card, CardContent, CardHeader, CardTitle, CardDescription } from "@/components/ui/card"
 import { Button } from "@/components/ui/button"
 import { Star, MapPin, Clock, ArrowLeft, MessageSquare } from "lucide-react"
@@ -43,13 +44,9 @@ export default function ServiceDetailPage() {
         
         setIsBooking(true)
         try {
-            const token = typeof window !== "undefined" ? localStorage.getItem("npw_token") : null
-            const headers = token ? {
-                "Authorization": `Bearer ${token}`,
-                "Content-Type": "application/json"
-            } : { "Content-Type": "application/json" }
+            const headers = { "Content-Type": "application/json" }
 
-            const res = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/bookings/create/`, {
+            const res = await apiFetch(`${process.env.NEXT_PUBLIC_API_URL}/bookings/create/`, {
                 method: "POST",
                 headers,
                 body: JSON.stringify({ service: service.id }),
@@ -3,6 +3,7 @@
 import { useSession } from "next-auth/react"
 import { useRouter } from "next/navigation"
 import { useEffect, useState } from "react"
+import { apiFetch, getToken } from "@/lib/api"
 import { Button } from "@/components/ui/button"
 import { Input } from "@/components/ui/input"
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
@@ -37,13 +38,8 @@ export default function NewServicePage() {
       // Check KYC status
       const checkKYC = async () => {
         try {
-          const token = typeof window !== "undefined" ? localStorage.getItem("npw_token") : null
           const headers = { "Content-Type": "application/json" }
-          if (token) {
-            headers["Authorization"] = `Bearer ${token}`
-          }
-
-          const res = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/accounts/kyc/status/`, { headers })
+          const res = await apiFetch(`${process.env.NEXT_PUBLIC_API_URL}/accounts/kyc/status/`, { headers })
           if (res.ok) {
             const data = await res.json()
             if (data.status !== "approved") {
@@ -85,11 +81,8 @@ export default function NewServicePage() {
     setError("")
     setLoading(true)
     try {
-      const token = typeof window !== "undefined" ? localStorage.getItem("npw_token") : null
       const headers = {}
-      if (token) {
-        headers["Authorization"] = `Bearer ${token}`
-      } else {
+      if (!getToken()) {
         headers["X-User-Email"] = session?.user?.email || ""
       }
 
@@ -108,7 +101,7 @@ export default function NewServicePage() {
       if (form.degree_photo) body.append("degree_photo", form.degree_photo)
       if (form.degree_description) body.append("degree_description", form.degree_description)
 
-      const res = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/services/services/create/`, {
+      const res = await apiFetch(`${process.env.NEXT_PUBLIC_API_URL}/services/services/create/`, {
         method: "POST",
         headers,
         body,
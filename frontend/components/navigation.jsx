@@ -12,6 +12,7 @@ import {
     DropdownMenuSeparator
 } from "@/components/ui/dropdown-menu"
 import { User, LogOut, Settings, Briefcase, Calendar } from "lucide-react"
+import { logout } from "@/lib/api"
 
 export default function Navigation() {
     const { data: session, status } = useSession()
@@ -20,9 +21,9 @@ export default function Navigation() {
     const localName = isBrowser ? localStorage.getItem("npw_user_name") : null
     const localEmail = isBrowser ? localStorage.getItem("npw_user_email") : null
 
-    const handleSignOut = () => {
+    const handleSignOut = async () => {
+        await logout()
         if (typeof window !== "undefined") {
-            localStorage.removeItem("npw_token")
             localStorage.removeItem("npw_role")
             localStorage.removeItem("npw_user_name")
             localStorage.removeItem("npw_user_email")
@@ -0,0 +1,96 @@
+// Calls to the Django API with the access token from sign-in.
+//
+// Access tokens are short-lived (JWT_ACCESS_TOKEN_LIFETIME, 15 minutes by
+// default). When one is rejected with a 401, apiFetch trades the stored
+// refresh token for a new pair and retries the request once. Each refresh
+// token works only once, so concurrent 401s share a single refresh.
+
+const API_URL = process.env.NEXT_PUBLIC_API_URL
+const TOKEN_KEY = "npw_token"
+const REFRESH_KEY = "npw_refresh"
+
+const isBrowser = () => typeof window !== "undefined"
+
+export function getToken() {
+    return isBrowser() ? localStorage.getItem(TOKEN_KEY) : null
+}
+
+export function storeTokens(data) {
+    if (!isBrowser()) return
+    localStorage.setItem(TOKEN_KEY, data.token)
+    if (data.refresh) localStorage.setItem(REFRESH_KEY, data.refresh)
+}
+
+export function clearTokens() {
+    if (!isBrowser()) return
+    localStorage.removeItem(TOKEN_KEY)
+    localStorage.removeItem(REFRESH_KEY)
+}
+
+let refreshing = null
+
+async function requestNewTokens() {
+    const refresh = isBrowser() ? localStorage.getItem(REFRESH_KEY) : null
+    if (!refresh) return null
+    try {
+        const res = await fetch(`${API_URL}/accounts/token/refresh/`, {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ refresh }),
+        })
+        if (!res.ok) {
+            // Expired, revoked or already used: the user has to sign in again
+            clearTokens()
+            return null
+        }
+        const data = await res.json()
+        storeTokens(data)
+        return data.token
+    } catch (e) {
+        console.error("Failed to refresh token", e)
+        return null
+    }
+}
+
+export function refreshAccessToken() {
+    if (!refreshing) {
+        refreshing = requestNewTokens().finally(() => {
+            refreshing = null
+        })
+    }
+    return refreshing
+}
+
+// fetch() with "Authorization: Bearer <access token>". fallbackToken is sent
+// when there is no stored token (e.g. the NextAuth session's token).
+export async function apiFetch(url, options = {}, fallbackToken = null) {
+    const send = (token) => {
+        const headers = { ...(options.headers || {}) }
+        if (token) headers["Authorization"] = `Bearer ${token}`
+        return fetch(url, { ...options, headers })
+    }
+
+    const token = getToken()
+    const res = await send(token || fallbackToken)
+    if (res.status !== 401 || !token) return res
+
+    const fresh = await refreshAccessToken()
+    return fresh ? send(fresh) : res
+}
+
+// Revoke the stored tokens on the server, then forget them.
+export async function logout() {
+    const token = getToken()
+    const refresh = isBrowser() ? localStorage.getItem(REFRESH_KEY) : null
+    clearTokens()
+    if (!token) return
+    try {
+        await fetch(`${API_URL}/accounts/logout/`, {
+            method: "POST",
+            headers: { "Content-Type": "application/json", "Authorization": `Bearer ${token}` },
+            body: JSON.stringify({ refresh }),
+        })
+    } catch (e) {
+        console.error("Failed to revoke tokens", e)
+    }
+}
@@ -8,10 +8,11 @@ class UserAdmin(DjangoUserAdmin):
     list_display = ("username", "email", "role", "is_active", "is_staff")
     list_filter = ("role", "is_staff", "is_superuser", "is_active")
     search_fields = ("username", "email", "display_name", "phone_number")
+    readonly_fields = ("kyc_status", "is_kyc_verified")
     fieldsets = (
         (None, {"fields": ("username", "password")} ),
         ("Personal info", {"fields": ("display_name", "first_name", "last_name", "email", "phone_number", "avatar_url", "bio")} ),
-        ("Marketplace", {"fields": ("role", "is_email_verified")} ),
+        ("Marketplace", {"fields": ("role", "is_email_verified", "kyc_status", "is_kyc_verified")} ),
         ("Permissions", {"fields": ("is_active", "is_staff", "is_superuser", "groups", "user_permissions")} ),
         ("Important dates", {"fields": ("last_login", "date_joined")} ),
     )
@@ -0,0 +1,152 @@
+"""
+Principals built from access-token claims, without loading the user.
+
+Most authenticated views only look at ``request.user.id``, ``role`` and
+``is_kyc_verified``. With ``JWT_CLAIMS_PRINCIPAL`` on, access tokens carry
+those as signed claims (``uid``, ``role``, ``kyc``) and ``JWTAuthentication``
+turns them into a ``User`` with only ``id``, ``email``, ``role`` and
+``is_kyc_verified`` loaded - no cache lookup, no query. It is a real
+``User``, so it can be assigned to foreign keys and used in filters.
+
+Touching any other field loads the rest of the row in one query (secrets
+only when asked for); ``stats()`` counts how often that happens and which
+fields triggered it, to show which views still need the full user.
+
+The claims are a snapshot taken when the token was issued, so they are only
+trusted while access tokens are short-lived: the mode stays off when
+``JWT_ACCESS_TOKEN_LIFETIME`` exceeds ``JWT_CLAIMS_MAX_AGE`` (15 minutes by
+default). A change to the user - role, KYC, deactivation, deletion - stamps
+it (``invalidate``, called from ``accounts.signals``), and tokens issued
+before the stamp go through ``accounts.principal_cache`` instead, which
+loads the current row. The stamping worker sees it at once; others read
+stamps from the principal cache's shared tier, at most ``CHECK_SECONDS``
+late, or without one, not until the token is refreshed. Tokens without the
+claims (issued before the setting was turned on) also use the principal
+cache.
+"""
+
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core import checks
+from django.db import DEFAULT_DB_ALIAS
+
+from newpwork_backend_new.caching import LRUCache
+from .models import User
+from .principal_cache import EXCLUDED_FIELDS, principal_cache
+
+FIELDS = ["id", "email", "role", "is_kyc_verified"]
+CHANGED_PREFIX = "jwt-claims-changed"
+# Seconds a worker trusts its last look at a user's shared change stamp
+CHECK_SECONDS = 5
+
+
+def max_age() -> int:
+    return getattr(settings, "JWT_CLAIMS_MAX_AGE", 15 * 60)
+
+
+def requested() -> bool:
+    return getattr(settings, "JWT_CLAIMS_PRINCIPAL", False)
+
+
+def enabled() -> bool:
+    from .tokens import ACCESS, _lifetime
+
+    return requested() and _lifetime(ACCESS) <= max_age()
+
+
+@checks.register(checks.Tags.security)
+def check_claims_lifetime(app_configs, **kwargs):
+    if requested() and not enabled():
+        return [
+            checks.Warning(
+                "JWT_CLAIMS_PRINCIPAL is on but JWT_ACCESS_TOKEN_LIFETIME exceeds JWT_CLAIMS_MAX_AGE, "
+                "so it has no effect.",
+                hint="Claims in long-lived tokens would keep a demoted or deactivated user's old "
+                "access; shorten the access token lifetime.",
+                id="newpwork.W002",
+            )
+        ]
+    return []
+
+
+def principal_claims(user) -> dict:
+    """The claims an access token for ``user`` carries in this mode."""
+    return {"uid": user.pk, "role": user.role, "kyc": user.is_kyc_verified}
+
+
+class ClaimsPrincipals:
+    def __init__(self):
+        self.built = 0
+        self.loads = 0
+        self.load_fields = Counter()
+        self.stale = 0
+        # user id -> time of a change made by this worker
+        self._changed = LRUCache(max_entries=10000, ttl=max_age())
+        # user id -> change stamp read from the shared cache (0.0: none)
+        self._checked = LRUCache(max_entries=10000, ttl=CHECK_SECONDS)
+
+    @staticmethod
+    def _changed_key(user_id) -> str:
+        return f"{CHANGED_PREFIX}:{user_id}"
+
+    def invalidate(self, user_id):
+        """Stop trusting the claims of tokens issued to ``user_id`` so far."""
+        now = time.time()
+        self._changed.set(user_id, now)
+        shared = principal_cache.shared
+        if shared is not None:
+            # Tokens issued before now expire within max_age()
+            shared.set(self._changed_key(user_id), now, max_age())
+
+    def _changed_at(self, user_id) -> float:
+        changed = self._changed.get(user_id)
+        if changed is not None:
+            return changed
+        shared = principal_cache.shared
+        if shared is None:
+            return 0.0
+        changed = self._checked.get(user_id)
+        if changed is None:
+            changed = shared.get(self._changed_key(user_id), 0.0)
+            self._checked.set(user_id, changed)
+        return changed
+
+    def get_user(self, claims: dict):
+        """The principal for ``claims``, or None if the token predates them or the user changed."""
+        if "uid" not in claims:
+            return None
+        if claims["iat"] <= self._changed_at(claims["uid"]):
+            self.stale += 1
+            return None
+        self.built += 1
+        user = User.from_db(
+            DEFAULT_DB_ALIAS, FIELDS, [claims["uid"], claims["email"], claims["role"], claims["kyc"]]
+        )
+        user._from_claims = True
+        return user
+
+    def fields_to_load(self, user, fields) -> list:
+        """Called by ``User.refresh_from_db`` when a deferred field is touched."""
+        self.loads += 1
+        self.load_fields.update(fields)
+        return sorted(set(fields) | (user.get_deferred_fields() - EXCLUDED_FIELDS))
+
+    def stats(self) -> dict:
+        return {
+            "enabled": enabled(),
+            "max_age": max_age(),
+            "principals": self.built,
+            "database_loads": self.loads,
+            "load_ratio": round(self.loads / self.built, 4) if self.built else None,
+            "load_fields": dict(self.load_fields.most_common(10)),
+            "stale_tokens": self.stale,
+        }
+
+    def clear(self):
+        self._changed.clear()
+        self._checked.clear()
+
+
+claims_principals = ClaimsPrincipals()
@@ -0,0 +1,157 @@
+"""
+Password hashing off the request thread.
+
+Hashing a password (``register``) or checking one (``login``) is deliberately
+slow: tens of milliseconds of CPU per call. Done on the request thread, a
+burst of logins takes every core the worker has and all other endpoints
+queue behind it. ``make_password``/``check_password`` here run the work in a
+small process pool instead, and admit at most ``MAX_PENDING`` jobs (running
+plus queued) per server process. Past that, ``HashingBusy`` is raised, and
+the views answer 503 with a ``Retry-After`` header without waiting for a slot.
+
+The hasher itself is chosen by ``DJANGO_PASSWORD_HASHER`` (see
+``PASSWORD_HASHERS`` in settings). ``Argon2PasswordHasher`` takes its cost
+from ``PASSWORD_HASHING["ARGON2"]``. A successful login whose hash was made by
+another hasher or at another cost is re-hashed with the current one, so
+changing the profile upgrades users as they sign in.
+
+Settings (all optional)::
+
+    PASSWORD_HASHING = {
+        "WORKERS": 2,        # pool processes; 0 = hash on the request thread
+        "MAX_PENDING": 32,   # jobs admitted at once, per server process
+        "TIMEOUT": 10,       # seconds to wait for a job before giving up
+        "RETRY_AFTER": 1,    # seconds, for the 503 response
+        "ARGON2": {"time_cost": 2, "memory_cost": 19456, "parallelism": 1},
+    }
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import django
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+def _config() -> dict:
+    config = {"WORKERS": 2, "MAX_PENDING": 32, "TIMEOUT": 10, "RETRY_AFTER": 1, "ARGON2": {}}
+    config.update(getattr(settings, "PASSWORD_HASHING", {}))
+    return config
+
+
+class HashingBusy(Exception):
+    """Too many hashing jobs are pending; the client should retry later."""
+
+    def __init__(self, retry_after):
+        super().__init__("password hashing is at capacity")
+        self.retry_after = retry_after
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Argon2 with the cost from ``PASSWORD_HASHING["ARGON2"]``.
+
+    The algorithm name is unchanged, so hashes made at another cost still
+    verify, and ``must_update`` flags them for a re-hash on login.
+    """
+
+    def __init__(self):
+        for name, value in _config()["ARGON2"].items():
+            setattr(self, name, value)
+
+
+def _setup_worker(settings_module):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    django.setup()
+
+
+def _verify(password, encoded):
+    return hashers.verify_password(password, encoded)
+
+
+class HashingPool:
+    def __init__(self):
+        config = _config()
+        self.workers = config["WORKERS"]
+        self.timeout = config["TIMEOUT"]
+        self.retry_after = config["RETRY_AFTER"]
+        self.slots = threading.BoundedSemaphore(config["MAX_PENDING"])
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def _get_executor(self):
+        # One pool per server process: a pool inherited through fork is unusable
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    # Server processes run threads, which fork does not copy safely
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_setup_worker,
+                    initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", "newpwork_backend_new.settings"),),
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def _reset(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, func, *args):
+        """``func(*args)`` in the pool, or ``HashingBusy`` when it is full."""
+        if not self.slots.acquire(blocking=False):
+            self.rejected += 1
+            raise HashingBusy(self.retry_after)
+        if not self.workers:
+            try:
+                return func(*args)
+            finally:
+                self.slots.release()
+
+        executor = self._get_executor()
+        try:
+            future = executor.submit(func, *args)
+        except BrokenExecutor:
+            self.slots.release()
+            self._reset(executor)
+            raise HashingBusy(self.retry_after)
+        # A job we stop waiting for still occupies a worker until it finishes
+        future.add_done_callback(lambda _: self.slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise HashingBusy(self.retry_after)
+        except BrokenExecutor:
+            self._reset(executor)
+            raise HashingBusy(self.retry_after)
+
+    def stats(self) -> dict:
+        return {"workers": self.workers, "rejected": self.rejected}
+
+
+pool = HashingPool()
+
+
+def make_password(password) -> str:
+    """Hash ``password`` with the preferred hasher."""
+    return pool.run(hashers.make_password, password)
+
+
+def check_password(user, password) -> bool:
+    """Whether ``password`` is ``user``'s; upgrades an outdated hash."""
+    is_correct, must_update = pool.run(_verify, password, user.password)
+    if is_correct and must_update:
+        try:
+            user.password = make_password(password)
+        except HashingBusy:
+            # The upgrade can wait for the next login
+            return True
+        user.save(update_fields=["password"])
+    return is_correct
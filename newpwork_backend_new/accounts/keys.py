@@ -0,0 +1,173 @@
+"""
+Asymmetric keys for signing access/refresh tokens.
+
+Tokens signed with a private key (Ed25519 ``EdDSA`` or RSA ``RS256``) can be
+verified by anything holding the public key - an edge proxy, a sidecar,
+another service - without the secret that mints them. The public keys are
+published as a JWKS document at ``/.well-known/jwks.json``; every token names
+its key in the ``kid`` header.
+
+The keyring lives in ``JWT_KEYS_DIR``: ``keyring.json`` lists the keys and
+their state, each private key is ``<kid>.pem`` (mode 0600). ``manage.py
+rotate_jwt_keys`` moves every key one step along::
+
+    next     published, not yet signing - verifiers fetch it ahead of use,
+             and tokens it signs are already accepted
+    current  signs new tokens
+    retired  published until the tokens it signed have expired
+             (JWT_REFRESH_TOKEN_LIFETIME after retirement), then deleted
+
+Run it on a schedule longer than verifiers' JWKS cache time (the endpoint
+sends ``max-age=JWKS_MAX_AGE``). Workers notice a rotated keyring within
+``RELOAD_SECONDS``, or straight away when a token names a kid they have not
+loaded - a worker that has already switched to the new current key may have
+signed it.
+
+Without a current key (``rotate_jwt_keys`` never run), tokens are signed
+with HS256 and ``NEXTAUTH_SECRET`` as before. HS256 tokens are accepted while
+``JWT_ACCEPT_HS256`` is on, which covers tokens issued before the switch.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from django.conf import settings
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+
+MANIFEST = "keyring.json"
+NEXT, CURRENT, RETIRED = "next", "current", "retired"
+ALGORITHMS = {"EdDSA": OKPAlgorithm, "RS256": RSAAlgorithm}
+# Seconds between checks of the manifest for a rotation
+RELOAD_SECONDS = 10
+
+
+def generate_private_key(algorithm):
+    if algorithm == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    if algorithm == "RS256":
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    raise ValueError(f"Unsupported signing algorithm: {algorithm}")
+
+
+class SigningKey:
+    def __init__(self, kid, algorithm, state, private_key, retired_at=None):
+        self.kid = kid
+        self.algorithm = algorithm
+        self.state = state
+        self.private_key = private_key
+        self.public_key = private_key.public_key()
+        self.retired_at = retired_at
+
+    def jwk(self) -> dict:
+        jwk = ALGORITHMS[self.algorithm].to_jwk(self.public_key, as_dict=True)
+        return {**jwk, "kid": self.kid, "alg": self.algorithm, "use": "sig"}
+
+
+class Keyring:
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.keys = {}
+        self._mtime = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.directory / MANIFEST
+
+    def _load(self):
+        try:
+            mtime = self.manifest_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self.keys, self._mtime = {}, None
+            return
+        if mtime == self._mtime:
+            return
+        entries = json.loads(self.manifest_path.read_text())
+        keys = {}
+        for entry in entries:
+            try:
+                pem = (self.directory / f"{entry['kid']}.pem").read_bytes()
+            except FileNotFoundError:
+                # Pruned by a rotation that replaced the manifest meanwhile
+                continue
+            private_key = serialization.load_pem_private_key(pem, password=None)
+            keys[entry["kid"]] = SigningKey(
+                entry["kid"], entry["algorithm"], entry["state"], private_key, entry.get("retired_at")
+            )
+        self.keys, self._mtime = keys, mtime
+
+    def refresh(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._checked_at < RELOAD_SECONDS:
+            return
+        with self._lock:
+            self._load()
+            self._checked_at = now
+
+    def current(self):
+        """The key new tokens are signed with, or None."""
+        self.refresh()
+        return next((key for key in self.keys.values() if key.state == CURRENT), None)
+
+    def get(self, kid):
+        """The key ``kid`` names, if tokens signed with it are accepted."""
+        self.refresh()
+        if kid not in self.keys:
+            # Only a stat() of the manifest unless it has changed
+            self.refresh(force=True)
+        return self.keys.get(kid)
+
+    def jwks(self) -> dict:
+        self.refresh()
+        return {"keys": [key.jwk() for key in self.keys.values()]}
+
+    def rotate(self, algorithm, retain_seconds) -> dict:
+        """Advance next -> current -> retired; returns ``{kid: state}`` afterwards."""
+        with self._lock:
+            self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+            self._mtime = None
+            self._load()
+            now = time.time()
+            entries = {}
+            for key in self.keys.values():
+                if key.state == RETIRED and key.retired_at + retain_seconds <= now:
+                    (self.directory / f"{key.kid}.pem").unlink(missing_ok=True)
+                    continue
+                state, retired_at = key.state, key.retired_at
+                if state == CURRENT:
+                    state, retired_at = RETIRED, now
+                elif state == NEXT:
+                    state = CURRENT
+                entries[key.kid] = {"kid": key.kid, "algorithm": key.algorithm, "state": state, "retired_at": retired_at}
+
+            if not any(entry["state"] == CURRENT for entry in entries.values()):
+                entries.update(self._new_key(algorithm, CURRENT))
+            entries.update(self._new_key(algorithm, NEXT))
+
+            # Replace the manifest in one step, so readers never see half of it
+            tmp = self.manifest_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(list(entries.values()), indent=2))
+            os.replace(tmp, self.manifest_path)
+            self._checked_at = 0.0
+            return {kid: entry["state"] for kid, entry in entries.items()}
+
+    def _new_key(self, algorithm, state) -> dict:
+        kid = f"{datetime.now(timezone.utc):%Y%m%d}-{uuid.uuid4().hex[:8]}"
+        pem = generate_private_key(algorithm).private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        )
+        fd = os.open(self.directory / f"{kid}.pem", os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(pem)
+        return {kid: {"kid": kid, "algorithm": algorithm, "state": state, "retired_at": None}}
+
+
+keyring = Keyring(getattr(settings, "JWT_KEYS_DIR", Path(settings.BASE_DIR) / "jwt_keys"))
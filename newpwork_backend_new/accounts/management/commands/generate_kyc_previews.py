@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from accounts.models import KYCVerification
+from accounts.previews import generate_previews
+
+
+class Command(BaseCommand):
+    help = 'Generate review-queue previews for KYC submissions that are missing them'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate previews that already exist',
+        )
+
+    def handle(self, *args, **options):
+        queryset = KYCVerification.objects.order_by('pk')
+        if not options['force']:
+            queryset = queryset.filter(photo_preview='') | queryset.filter(citizenship_preview='')
+
+        generated = 0
+        for kyc_id in queryset.values_list('pk', flat=True).iterator():
+            generated += generate_previews(kyc_id, force=options['force'])
+        self.stdout.write(self.style.SUCCESS(f'Generated {generated} previews'))
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from accounts.keys import ALGORITHMS, keyring
+
+
+class Command(BaseCommand):
+    help = 'Rotate the JWT signing keys: next becomes current, current is retired'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--algorithm',
+            choices=sorted(ALGORITHMS),
+            default=getattr(settings, 'JWT_SIGNING_ALGORITHM', 'EdDSA'),
+            help='Algorithm for newly generated keys',
+        )
+
+    def handle(self, *args, **options):
+        # Retired keys stay published as long as a refresh token they signed can live
+        states = keyring.rotate(options['algorithm'], settings.JWT_REFRESH_TOKEN_LIFETIME)
+        for kid, state in states.items():
+            self.stdout.write(f'{kid}  {state}')
+        self.stdout.write(self.style.SUCCESS(f'Rotated keys in {keyring.directory}'))
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:12
+
+import accounts.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_kycverification'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='kycverification',
+            name='citizenship',
+            field=models.FileField(help_text='Citizenship document', storage=accounts.storage.get_kyc_storage, upload_to='kyc/citizenship/'),
+        ),
+        migrations.AlterField(
+            model_name='kycverification',
+            name='driving_license',
+            field=models.FileField(blank=True, null=True, storage=accounts.storage.get_kyc_storage, upload_to='kyc/driving_license/'),
+        ),
+        migrations.AlterField(
+            model_name='kycverification',
+            name='passport',
+            field=models.FileField(blank=True, null=True, storage=accounts.storage.get_kyc_storage, upload_to='kyc/passport/'),
+        ),
+        migrations.AlterField(
+            model_name='kycverification',
+            name='photo',
+            field=models.ImageField(help_text='Profile photo', storage=accounts.storage.get_kyc_storage, upload_to='kyc/photos/'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:14
+
+import accounts.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_kyc_content_addressed_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='kycverification',
+            name='citizenship_preview',
+            field=models.ImageField(blank=True, editable=False, storage=accounts.storage.get_kyc_storage, upload_to='kyc/previews/citizenship/'),
+        ),
+        migrations.AddField(
+            model_name='kycverification',
+            name='photo_preview',
+            field=models.ImageField(blank=True, editable=False, storage=accounts.storage.get_kyc_storage, upload_to='kyc/previews/photos/'),
+        ),
+    ]
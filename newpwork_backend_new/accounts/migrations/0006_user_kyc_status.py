@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:15
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_kyc_status(apps, schema_editor):
+    User = apps.get_model('accounts', 'User')
+    KYCVerification = apps.get_model('accounts', 'KYCVerification')
+    kyc_status = KYCVerification.objects.filter(user_id=OuterRef('pk')).values('status')[:1]
+    User.objects.filter(kyc_verification__isnull=False).update(kyc_status=Subquery(kyc_status))
+    User.objects.filter(kyc_status='approved').update(is_kyc_verified=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_kyc_previews'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='is_kyc_verified',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='kyc_status',
+            field=models.CharField(choices=[('not_submitted', 'Not submitted'), ('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected')], default='not_submitted', editable=False, max_length=20),
+        ),
+        migrations.RunPython(backfill_kyc_status, migrations.RunPython.noop),
+    ]
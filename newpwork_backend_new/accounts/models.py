@@ -2,12 +2,19 @@ from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext_lazy as _
 from django.conf import settings
+from .storage import get_kyc_storage
 
 class UserRole(models.TextChoices):
     CUSTOMER = "customer", _("Customer")
     PROVIDER = "provider", _("Provider")
     ADMIN = "admin", _("Admin")
 
+class KYCStatus(models.TextChoices):
+    NOT_SUBMITTED = "not_submitted", _("Not submitted")
+    PENDING = "pending", _("Pending")
+    APPROVED = "approved", _("Approved")
+    REJECTED = "rejected", _("Rejected")
+
 class User(AbstractUser):
     """
     Custom user model for marketplace authentication and profiles.
@@ -28,13 +35,29 @@ class User(AbstractUser):
     google_id = models.CharField(max_length=255, blank=True, null=True, unique=True)
     access_token = models.CharField(max_length=512, blank=True, null=True)
 
+    # Mirror of kyc_verification.status, kept in sync by KYCVerification.sync_user
+    kyc_status = models.CharField(
+        max_length=20, choices=KYCStatus.choices, default=KYCStatus.NOT_SUBMITTED, editable=False
+    )
+    is_kyc_verified = models.BooleanField(default=False, editable=False)
+
     REQUIRED_FIELDS = ["email"]
 
+    # Set on principals built from token claims (accounts.claims)
+    _from_claims = False
+
     def __str__(self) -> str:
         if self.display_name:
             return self.display_name
         return self.get_username()
 
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        if self._from_claims and fields is not None:
+            # A deferred field was touched: load the rest of the row in one query
+            from .claims import claims_principals
+            fields = claims_principals.fields_to_load(self, fields)
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+
     @property
     def is_customer(self) -> bool:
         return self.role == UserRole.CUSTOMER
@@ -53,16 +76,20 @@ class KYCVerification(models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="kyc_verification")
     
     # Mandatory fields
-    photo = models.ImageField(upload_to="kyc/photos/", help_text="Profile photo")
+    photo = models.ImageField(upload_to="kyc/photos/", storage=get_kyc_storage, help_text="Profile photo")
     full_name = models.CharField(max_length=150)
     address = models.TextField()
     phone_number = models.CharField(max_length=20)
     email = models.EmailField()
-    citizenship = models.FileField(upload_to="kyc/citizenship/", help_text="Citizenship document")
+    citizenship = models.FileField(upload_to="kyc/citizenship/", storage=get_kyc_storage, help_text="Citizenship document")
     
     # Optional fields
-    driving_license = models.FileField(upload_to="kyc/driving_license/", blank=True, null=True)
-    passport = models.FileField(upload_to="kyc/passport/", blank=True, null=True)
+    driving_license = models.FileField(upload_to="kyc/driving_license/", storage=get_kyc_storage, blank=True, null=True)
+    passport = models.FileField(upload_to="kyc/passport/", storage=get_kyc_storage, blank=True, null=True)
+
+    # Downscaled copies for the review queue, filled in by accounts.previews
+    photo_preview = models.ImageField(upload_to="kyc/previews/photos/", storage=get_kyc_storage, blank=True, editable=False)
+    citizenship_preview = models.ImageField(upload_to="kyc/previews/citizenship/", storage=get_kyc_storage, blank=True, editable=False)
     
     # Verification status
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
@@ -89,3 +116,24 @@ class KYCVerification(models.Model):
     @property
     def is_verified(self) -> bool:
         return self.status == self.Status.APPROVED
+
+    def sync_user(self, deleted: bool = False):
+        """Copy this submission's status onto the user's KYC fields."""
+        kyc_status = KYCStatus.NOT_SUBMITTED if deleted else self.status
+        is_verified = kyc_status == KYCStatus.APPROVED
+        User.objects.filter(pk=self.user_id).update(kyc_status=kyc_status, is_kyc_verified=is_verified)
+        if self._meta.get_field("user").is_cached(self):
+            self.user.kyc_status = kyc_status
+            self.user.is_kyc_verified = is_verified
+
+
+class RevokedToken(models.Model):
+    """A JWT (by its ``jti``) that must be rejected until it expires."""
+
+    jti = models.CharField(max_length=64, unique=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True, related_name="revoked_tokens")
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f"Revoked token {self.jti}"
@@ -0,0 +1,137 @@
+"""
+Small previews of KYC images for the admin review queue.
+
+When a KYC submission is saved, its photo and citizenship scan are scaled
+down to WebP (JPEG where Pillow lacks WebP support) by a small thread pool,
+after the transaction commits, so the upload request does not wait for image
+work. Non-image documents (e.g. PDF scans) get no preview.
+
+Settings (all optional)::
+
+    KYC_PREVIEW_SIZE = (320, 320)   # bounding box in pixels
+    KYC_PREVIEW_QUALITY = 70
+    KYC_PREVIEW_WORKERS = 2         # 0 renders synchronously on commit
+"""
+
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from .models import KYCVerification
+
+logger = logging.getLogger(__name__)
+
+# source field -> preview field
+PREVIEW_FIELDS = {
+    "photo": "photo_preview",
+    "citizenship": "citizenship_preview",
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _preview_format():
+    return ("WEBP", ".webp") if features.check("webp") else ("JPEG", ".jpg")
+
+
+def render_preview(file):
+    """Return a ``ContentFile`` with a downscaled copy of ``file``, or None
+    when the file is not an image Pillow can read."""
+    size = tuple(getattr(settings, "KYC_PREVIEW_SIZE", (320, 320)))
+    quality = getattr(settings, "KYC_PREVIEW_QUALITY", 70)
+    image_format, extension = _preview_format()
+
+    try:
+        file.open("rb")
+        with Image.open(file) as image:
+            # Lets the JPEG decoder scale down while decoding
+            image.draft("RGB", size)
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail(size)
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            buffer = io.BytesIO()
+            image.save(buffer, image_format, quality=quality)
+    except (UnidentifiedImageError, OSError):
+        return None
+    finally:
+        file.close()
+
+    name = os.path.splitext(os.path.basename(file.name))[0] + extension
+    return ContentFile(buffer.getvalue(), name=name)
+
+
+def generate_previews(kyc_id, force=False) -> int:
+    """Render missing previews for one submission; returns how many were stored."""
+    kyc = KYCVerification.objects.filter(pk=kyc_id).first()
+    if kyc is None:
+        return 0
+
+    updates = {}
+    for source_name, preview_name in PREVIEW_FIELDS.items():
+        source = getattr(kyc, source_name)
+        preview = getattr(kyc, preview_name)
+        if not source or (preview and not force):
+            continue
+        content = render_preview(source)
+        if content is None:
+            continue
+        field = preview.field
+        updates[preview_name] = field.storage.save(field.generate_filename(kyc, content.name), content)
+
+    if updates:
+        # update() rather than save(): no post_save, so no re-scheduling
+        KYCVerification.objects.filter(pk=kyc_id).update(**updates)
+    return len(updates)
+
+
+def needs_previews(kyc) -> bool:
+    return any(
+        getattr(kyc, source) and not getattr(kyc, preview) for source, preview in PREVIEW_FIELDS.items()
+    )
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "KYC_PREVIEW_WORKERS", 2),
+                thread_name_prefix="kyc-preview",
+            )
+        return _executor
+
+
+def _generate(kyc_id):
+    try:
+        generate_previews(kyc_id)
+    except Exception:
+        logger.exception("Could not generate previews for KYC %s", kyc_id)
+
+
+def _run_in_worker(kyc_id):
+    try:
+        _generate(kyc_id)
+    finally:
+        # Worker threads own their connection; don't leave it open between jobs
+        connection.close()
+
+
+def _submit(kyc_id):
+    if getattr(settings, "KYC_PREVIEW_WORKERS", 2) <= 0:
+        _generate(kyc_id)
+    else:
+        _get_executor().submit(_run_in_worker, kyc_id)
+
+
+def schedule_previews(kyc_id):
+    """Queue preview generation once the current transaction commits."""
+    transaction.on_commit(lambda: _submit(kyc_id))
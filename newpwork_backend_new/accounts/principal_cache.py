@@ -0,0 +1,125 @@
+"""
+Cache of authenticated principals for JWTAuthentication.
+
+A verified token names its user by email. Instead of loading that user on
+every request, a snapshot of the row is kept in a bounded in-process LRU
+(with TTL) and, optionally, in a shared Django cache so other workers can
+reuse it. Each request gets a fresh ``User`` instance built from the
+snapshot, so views can mutate ``request.user`` without affecting the cache.
+
+Entries are invalidated by the ``User``/``KYCVerification`` signal receivers
+in ``accounts.signals``. Invalidation is immediate for the local process and
+the shared tier; other workers' local copies expire after the local TTL.
+
+Settings (all optional)::
+
+    JWT_PRINCIPAL_CACHE = {
+        "MAX_ENTRIES": 10000,   # local LRU size
+        "TTL": 60,              # seconds a local entry stays valid
+        "SHARED_CACHE": None,   # alias in CACHES for the shared tier
+        "SHARED_TTL": 300,      # seconds a shared entry stays valid
+    }
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+from newpwork_backend_new.caching import LRUCache
+from .models import User
+
+# Secrets never leave the database row; they stay deferred on cached principals.
+EXCLUDED_FIELDS = {"password", "access_token"}
+
+KEY_PREFIX = "jwt-principal"
+
+
+def _config() -> dict:
+    config = {"MAX_ENTRIES": 10000, "TTL": 60, "SHARED_CACHE": None, "SHARED_TTL": 300}
+    config.update(getattr(settings, "JWT_PRINCIPAL_CACHE", {}))
+    return config
+
+
+def _snapshot_fields() -> list:
+    return [f.attname for f in User._meta.concrete_fields if f.attname not in EXCLUDED_FIELDS]
+
+
+class PrincipalCache:
+    def __init__(self):
+        config = _config()
+        self.fields = _snapshot_fields()
+        self._pk_index = self.fields.index(User._meta.pk.attname)
+        self.local = LRUCache(max_entries=config["MAX_ENTRIES"], ttl=config["TTL"])
+        self.shared_alias = config["SHARED_CACHE"]
+        self.shared_ttl = config["SHARED_TTL"]
+        self.shared_hits = 0
+        self.loads = 0
+        self.invalidations = 0
+        # user id -> email, so invalidation by id finds the local entry
+        self._emails = LRUCache(max_entries=config["MAX_ENTRIES"], ttl=config["TTL"])
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias] if self.shared_alias else None
+
+    def _build(self, values) -> User:
+        return User.from_db(DEFAULT_DB_ALIAS, self.fields, values)
+
+    def _remember(self, email, values):
+        self.local.set(email, values)
+        self._emails.set(values[self._pk_index], email)
+
+    def get_user(self, email: str) -> User:
+        """Return the user for ``email``; raises ``User.DoesNotExist``."""
+        values = self.local.get(email)
+        if values is not None:
+            return self._build(values)
+
+        shared = self.shared
+        if shared is not None:
+            values = shared.get(f"{KEY_PREFIX}:{email}")
+            if values is not None:
+                self.shared_hits += 1
+                self._remember(email, values)
+                return self._build(values)
+
+        values = User.objects.filter(email=email).values_list(*self.fields).get()
+        self.loads += 1
+        self._remember(email, values)
+        if shared is not None:
+            shared.set_many(
+                {f"{KEY_PREFIX}:{email}": values, f"{KEY_PREFIX}-id:{values[self._pk_index]}": email},
+                self.shared_ttl,
+            )
+        return self._build(values)
+
+    def invalidate(self, user_id, email: str = None):
+        self.invalidations += 1
+        emails = {email, self._emails.get(user_id)}
+        self._emails.delete(user_id)
+        shared = self.shared
+        if shared is not None:
+            emails.add(shared.get(f"{KEY_PREFIX}-id:{user_id}"))
+        emails.discard(None)
+        for address in emails:
+            self.local.delete(address)
+        if shared is not None:
+            shared.delete_many(
+                [f"{KEY_PREFIX}:{address}" for address in emails] + [f"{KEY_PREFIX}-id:{user_id}"]
+            )
+
+    def clear(self):
+        self.local.clear()
+        self._emails.clear()
+
+    def stats(self) -> dict:
+        return {
+            "local": self.local.stats(),
+            "shared_cache": self.shared_alias,
+            "shared_hits": self.shared_hits,
+            "database_loads": self.loads,
+            "invalidations": self.invalidations,
+        }
+
+
+principal_cache = PrincipalCache()
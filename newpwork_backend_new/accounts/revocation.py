@@ -0,0 +1,162 @@
+"""
+Revoked-token checks without a query per request.
+
+Every token carries a ``jti``; revoking one (logout, refresh-token rotation)
+stores it in the ``RevokedToken`` table until the token would have expired.
+Each worker keeps a Bloom filter of the unexpired revoked ``jti`` values, so
+``JWTAuthentication`` can tell that a token is *not* revoked - almost every
+request - from memory. Only a filter match (a revoked token, or a false
+positive at about ``FALSE_POSITIVE_RATE``) is confirmed against the table.
+
+The filter picks up rows added since its last look at most every
+``REFRESH_SECONDS`` (one indexed query) and is rebuilt from the table every
+``REBUILD_SECONDS`` or when it fills up, which also drops expired entries.
+A revocation is seen at once by the worker that made it, and by the others
+within ``REFRESH_SECONDS``. ``manage.py prune_revoked_tokens`` deletes rows
+whose tokens have expired.
+
+Settings (all optional)::
+
+    JWT_REVOCATION = {
+        "REFRESH_SECONDS": 5,
+        "REBUILD_SECONDS": 3600,
+        "FALSE_POSITIVE_RATE": 0.01,
+        "MIN_CAPACITY": 1024,    # jti values the filter is sized for, at least
+    }
+"""
+
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
+import jwt
+from django.conf import settings
+from django.utils import timezone
+
+from .models import RevokedToken
+
+
+def _config() -> dict:
+    config = {"REFRESH_SECONDS": 5, "REBUILD_SECONDS": 3600, "FALSE_POSITIVE_RATE": 0.01, "MIN_CAPACITY": 1024}
+    config.update(getattr(settings, "JWT_REVOCATION", {}))
+    return config
+
+
+class TokenRevoked(jwt.InvalidTokenError):
+    pass
+
+
+class BloomFilter:
+    """Fixed-size set of strings with no false negatives."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:], "big") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationList:
+    def __init__(self):
+        config = _config()
+        self.refresh_seconds = config["REFRESH_SECONDS"]
+        self.rebuild_seconds = config["REBUILD_SECONDS"]
+        self.error_rate = config["FALSE_POSITIVE_RATE"]
+        self.min_capacity = config["MIN_CAPACITY"]
+        self.filter = None
+        self._last_id = 0
+        self._refreshed_at = 0.0
+        self._rebuilt_at = 0.0
+        self._lock = threading.Lock()
+        self.rebuilds = 0
+        self.filter_matches = 0
+        self.false_positives = 0
+        self.rejections = 0
+
+    def _rebuild(self):
+        rows = list(
+            RevokedToken.objects.filter(expires_at__gt=timezone.now()).order_by("pk").values_list("pk", "jti")
+        )
+        bloom = BloomFilter(max(self.min_capacity, 2 * len(rows)), self.error_rate)
+        for _, jti in rows:
+            bloom.add(jti)
+        self.filter = bloom
+        if rows:
+            self._last_id = rows[-1][0]
+        self._rebuilt_at = self._refreshed_at = time.monotonic()
+        self.rebuilds += 1
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self.filter is not None and now - self._refreshed_at < self.refresh_seconds:
+            return
+        with self._lock:
+            if self.filter is None or now - self._rebuilt_at >= self.rebuild_seconds:
+                self._rebuild()
+                return
+            if now - self._refreshed_at < self.refresh_seconds:
+                return
+            for pk, jti in RevokedToken.objects.filter(pk__gt=self._last_id).order_by("pk").values_list("pk", "jti"):
+                self.filter.add(jti)
+                self._last_id = pk
+            self._refreshed_at = now
+            if self.filter.count > self.filter.capacity:
+                self._rebuild()
+
+    def is_revoked(self, claims: dict) -> bool:
+        jti = claims.get("jti")
+        if not jti:
+            # Issued before tokens carried a jti; they cannot be revoked
+            return False
+        self._refresh()
+        if jti not in self.filter:
+            return False
+        self.filter_matches += 1
+        if RevokedToken.objects.filter(jti=jti).exists():
+            self.rejections += 1
+            return True
+        self.false_positives += 1
+        return False
+
+    def revoke(self, claims: dict, user=None) -> bool:
+        """Record the token's ``jti``; False if it was already revoked."""
+        self._refresh()
+        expires_at = datetime.fromtimestamp(claims["exp"], tz=dt_timezone.utc)
+        _, created = RevokedToken.objects.get_or_create(
+            jti=claims["jti"], defaults={"expires_at": expires_at, "user": user}
+        )
+        if created:
+            self.filter.add(claims["jti"])
+        return created
+
+    def stats(self) -> dict:
+        bloom = self.filter
+        return {
+            "entries": bloom.count if bloom else None,
+            "capacity": bloom.capacity if bloom else None,
+            "filter_bytes": len(bloom.bits) if bloom else None,
+            "rebuilds": self.rebuilds,
+            "filter_matches": self.filter_matches,
+            "false_positives": self.false_positives,
+            "rejections": self.rejections,
+        }
+
+
+revocation_list = RevocationList()
@@ -3,8 +3,6 @@ from .models import User, KYCVerification
 
 
 class UserSerializer(serializers.ModelSerializer):
-    is_kyc_verified = serializers.SerializerMethodField()
-
     class Meta:
         model = User
         fields = [
@@ -16,15 +14,10 @@ class UserSerializer(serializers.ModelSerializer):
             "role",
             "avatar_url",
             "bio",
+            "kyc_status",
             "is_kyc_verified",
         ]
-        read_only_fields = ["id", "username", "email", "role"]
-
-    def get_is_kyc_verified(self, obj):
-        """Check if user has verified KYC"""
-        if hasattr(obj, 'kyc_verification'):
-            return obj.kyc_verification.is_verified
-        return False
+        read_only_fields = ["id", "username", "email", "role", "kyc_status", "is_kyc_verified"]
 
 
 class KYCVerificationSerializer(serializers.ModelSerializer):
@@ -32,6 +25,8 @@ class KYCVerificationSerializer(serializers.ModelSerializer):
     citizenship_url = serializers.SerializerMethodField()
     driving_license_url = serializers.SerializerMethodField()
     passport_url = serializers.SerializerMethodField()
+    photo_preview_url = serializers.SerializerMethodField()
+    citizenship_preview_url = serializers.SerializerMethodField()
     user_email = serializers.EmailField(source="user.email", read_only=True)
 
     class Meta:
@@ -42,12 +37,14 @@ class KYCVerificationSerializer(serializers.ModelSerializer):
             "user_email",
             "photo",
             "photo_url",
+            "photo_preview_url",
             "full_name",
             "address",
             "phone_number",
             "email",
             "citizenship",
             "citizenship_url",
+            "citizenship_preview_url",
             "driving_license",
             "driving_license_url",
             "passport",
@@ -101,3 +98,19 @@ class KYCVerificationSerializer(serializers.ModelSerializer):
             return obj.passport.url
         return None
 
+
+    def get_photo_preview_url(self, obj):
+        if obj.photo_preview:
+            request = self.context.get('request')
+            if request:
+                return request.build_absolute_uri(obj.photo_preview.url)
+            return obj.photo_preview.url
+        return None
+
+    def get_citizenship_preview_url(self, obj):
+        if obj.citizenship_preview:
+            request = self.context.get('request')
+            if request:
+                return request.build_absolute_uri(obj.citizenship_preview.url)
+            return obj.citizenship_preview.url
+        return None
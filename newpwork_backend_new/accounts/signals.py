@@ -0,0 +1,60 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from bookings.models import Booking
+from services.models import Service
+from .claims import claims_principals
+from .models import KYCVerification, User
+from .previews import needs_previews, schedule_previews
+from .principal_cache import principal_cache
+from . import stats as dashboard_stats
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_principal_on_user_change(sender, instance, **kwargs):
+    principal_cache.invalidate(instance.pk, instance.email)
+    claims_principals.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=KYCVerification)
+def sync_user_on_kyc_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        instance.sync_user()
+    principal_cache.invalidate(instance.user_id)
+    claims_principals.invalidate(instance.user_id)
+
+
+@receiver(post_delete, sender=KYCVerification)
+def sync_user_on_kyc_delete(sender, instance, origin=None, **kwargs):
+    # When the user itself is being deleted there is nothing left to update
+    if not isinstance(origin, User):
+        instance.sync_user(deleted=True)
+    principal_cache.invalidate(instance.user_id)
+    claims_principals.invalidate(instance.user_id)
+
+
+@receiver(post_save, sender=KYCVerification)
+def generate_kyc_previews(sender, instance, raw=False, **kwargs):
+    if not raw and needs_previews(instance):
+        schedule_previews(instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_stats_on_user_change(sender, instance, **kwargs):
+    dashboard_stats.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+def invalidate_stats_on_service_change(sender, instance, **kwargs):
+    dashboard_stats.invalidate(instance.provider_id)
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def invalidate_stats_on_booking_change(sender, instance, **kwargs):
+    provider_id = (
+        Service.objects.filter(pk=instance.service_id).values_list("provider_id", flat=True).first()
+    )
+    dashboard_stats.invalidate(instance.customer_id, provider_id)
@@ -0,0 +1,114 @@
+"""
+Dashboard statistics for the stats and user_stats endpoints.
+
+Each role's numbers come from one conditional aggregate per table and are
+cached (globally for admin stats, per user otherwise). The receivers in
+``accounts.signals`` drop the affected entries once a transaction that
+changes users, services or bookings commits. Every payload carries ``generated_at`` so clients can tell
+how fresh it is.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, Q
+from django.utils import timezone
+
+from bookings.models import Booking
+from services.models import Service
+from .models import User, UserRole
+
+GLOBAL_KEY = "dashboard-stats:global"
+
+
+def user_key(user_id) -> str:
+    return f"dashboard-stats:user:{user_id}"
+
+
+def _ttl() -> int:
+    return getattr(settings, "DASHBOARD_STATS_CACHE_TTL", 300)
+
+
+def _status_counts(prefix=""):
+    return {
+        f"{name}_bookings": Count(f"{prefix}id", filter=Q(**{f"{prefix}status": value}))
+        for name, value in (
+            ("pending", Booking.Status.PENDING),
+            ("confirmed", Booking.Status.CONFIRMED),
+            ("completed", Booking.Status.COMPLETED),
+        )
+    }
+
+
+def compute_global_stats() -> dict:
+    users = User.objects.aggregate(
+        total_users=Count("id"),
+        customers=Count("id", filter=Q(role=UserRole.CUSTOMER)),
+        providers=Count("id", filter=Q(role=UserRole.PROVIDER)),
+    )
+    services = Service.objects.filter(is_active=True).count()
+    bookings = Booking.objects.aggregate(
+        bookings=Count("id"),
+        active_bookings=Count("id", filter=Q(status=Booking.Status.CONFIRMED)),
+    )
+    return {
+        "total_users": users["total_users"],
+        "customers": users["customers"],
+        "providers": users["providers"],
+        "services": services,
+        "bookings": bookings["bookings"],
+        "active_bookings": bookings["active_bookings"],
+    }
+
+
+def compute_provider_stats(user) -> dict:
+    # Services LEFT JOIN bookings: distinct ids count services, joined ids count bookings
+    data = Service.objects.filter(provider=user).aggregate(
+        total_services=Count("id", distinct=True),
+        total_bookings=Count("bookings__id"),
+        **_status_counts("bookings__"),
+        average_rating=Avg(
+            "bookings__rating", filter=Q(bookings__status=Booking.Status.COMPLETED)
+        ),
+    )
+    data["average_rating"] = round(data["average_rating"] or 0, 1)
+    return data
+
+
+def compute_customer_stats(user) -> dict:
+    data = Booking.objects.filter(customer=user).aggregate(
+        total_bookings=Count("id"),
+        **_status_counts(),
+    )
+    data["active_bookings"] = data["confirmed_bookings"]
+    return data
+
+
+def _cached(key, compute) -> dict:
+    data = cache.get(key)
+    if data is None:
+        data = compute()
+        data["generated_at"] = timezone.now().isoformat()
+        cache.set(key, data, _ttl())
+    return data
+
+
+def global_stats() -> dict:
+    return _cached(GLOBAL_KEY, compute_global_stats)
+
+
+def stats_for_user(user) -> dict:
+    role = getattr(user, "role", None)
+    if role == UserRole.PROVIDER:
+        return _cached(user_key(user.pk), lambda: compute_provider_stats(user))
+    if role == UserRole.CUSTOMER:
+        return _cached(user_key(user.pk), lambda: compute_customer_stats(user))
+    return global_stats()
+
+
+def invalidate(*user_ids, include_global=True):
+    keys = [user_key(user_id) for user_id in user_ids if user_id is not None]
+    if include_global:
+        keys.append(GLOBAL_KEY)
+    # After commit: stats rebuilt before then would still count the old rows
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,62 @@
+import hashlib
+import os
+
+from django.core.files.storage import FileSystemStorage
+
+
+class _SameContent(FileExistsError):
+    """An identical upload already stored the file this one was going to."""
+
+
+def _is_content_name(name) -> bool:
+    directory, filename = os.path.split(name)
+    stem = os.path.splitext(filename)[0]
+    return len(stem) == 64 and os.path.basename(directory) == stem[:2]
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """File storage that names files after the SHA-256 of their content.
+
+    ``kyc/photos/scan.png`` is stored as ``kyc/photos/ab/abcdef....png``.
+    Identical uploads map to the same name and are written only once.
+    Uses the digest computed while streaming (``accounts.uploads``) when
+    present, otherwise hashes the content in chunks.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is derived from the content in _save. FileSystemStorage
+        # asks again when a concurrent identical upload created the file first;
+        # that file already holds this content, so end its retry loop instead.
+        if _is_content_name(name) and self.exists(name):
+            raise _SameContent(name)
+        return name
+
+    def _save(self, name, content):
+        digest = getattr(content, "sha256", None) or self._hash(content)
+        directory, filename = os.path.split(name)
+        extension = os.path.splitext(filename)[1].lower()
+        name = os.path.join(directory, digest[:2], f"{digest}{extension}")
+        if self.exists(name):
+            return name
+        try:
+            return super()._save(name, content)
+        except _SameContent:
+            return name
+
+    @staticmethod
+    def _hash(content) -> str:
+        hasher = hashlib.sha256()
+        if hasattr(content, "seek"):
+            content.seek(0)
+        for chunk in content.chunks():
+            hasher.update(chunk)
+        if hasattr(content, "seek"):
+            content.seek(0)
+        return hasher.hexdigest()
+
+
+kyc_storage = ContentAddressedStorage()
+
+
+def get_kyc_storage():
+    return kyc_storage
@@ -0,0 +1,248 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+
+from bookings.models import Booking
+from services.models import Service, ServiceCategory
+from . import stats as dashboard_stats
+from .auth import JWTAuthentication
+from .claims import check_claims_lifetime, claims_principals, enabled as claims_enabled
+from .models import KYCVerification, RevokedToken, User, UserRole
+from .principal_cache import principal_cache
+from .revocation import RevocationList, revocation_list
+from .token_cache import token_cache
+from .tokens import REFRESH, issue_tokens, verify_token
+
+REFRESH_URL = "/api/accounts/token/refresh/"
+LOGOUT_URL = "/api/accounts/logout/"
+PROTECTED_URL = "/api/accounts/user-stats/"
+
+
+class TokenTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="customer", email="customer@example.com", role=UserRole.CUSTOMER)
+
+    def setUp(self):
+        # Process-wide state outlives each test's rollback
+        principal_cache.clear()
+        token_cache.clear()
+        revocation_list.filter = None
+
+    def get(self, token):
+        return self.client.get(PROTECTED_URL, HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def refresh(self, refresh):
+        return self.client.post(REFRESH_URL, {"refresh": refresh}, content_type="application/json")
+
+
+class TokenRefreshTests(TokenTestCase):
+    def test_access_tokens_are_short_lived_by_default(self):
+        self.assertEqual(issue_tokens(self.user)["expires_in"], 900)
+
+    def test_refresh_returns_a_working_pair(self):
+        tokens = issue_tokens(self.user)
+        response = self.refresh(tokens["refresh"])
+        self.assertEqual(response.status_code, 200)
+        fresh = response.json()
+        self.assertNotEqual(fresh["token"], tokens["token"])
+        self.assertNotEqual(fresh["refresh"], tokens["refresh"])
+        self.assertEqual(self.get(fresh["token"]).status_code, 200)
+        self.assertEqual(self.refresh(fresh["refresh"]).status_code, 200)
+
+    def test_refresh_token_works_once(self):
+        refresh = issue_tokens(self.user)["refresh"]
+        self.assertEqual(self.refresh(refresh).status_code, 200)
+        response = self.refresh(refresh)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["error"], "Refresh token revoked")
+
+    def test_access_token_is_not_a_refresh_token(self):
+        response = self.refresh(issue_tokens(self.user)["token"])
+        self.assertEqual(response.status_code, 401)
+
+    def test_refresh_token_is_not_an_access_token(self):
+        self.assertEqual(self.get(issue_tokens(self.user)["refresh"]).status_code, 401)
+
+    def test_refresh_is_refused_for_a_deactivated_user(self):
+        refresh = issue_tokens(self.user)["refresh"]
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.refresh(refresh).status_code, 401)
+
+    @override_settings(JWT_ACCESS_TOKEN_LIFETIME=-1)
+    def test_expired_access_token_is_a_401(self):
+        # 401, not 403: the frontend refreshes on it
+        response = self.get(issue_tokens(self.user)["token"])
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["detail"], "Token expired")
+        self.assertTrue(response.has_header("WWW-Authenticate"))
+
+
+class LogoutTests(TokenTestCase):
+    def logout(self, tokens, refresh=None):
+        return self.client.post(
+            LOGOUT_URL,
+            {"refresh": refresh if refresh is not None else tokens["refresh"]},
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {tokens['token']}",
+        )
+
+    def test_logout_revokes_both_tokens(self):
+        tokens = issue_tokens(self.user)
+        self.assertEqual(self.get(tokens["token"]).status_code, 200)
+        self.assertEqual(self.logout(tokens).status_code, 200)
+
+        response = self.get(tokens["token"])
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["detail"], "Token revoked")
+        self.assertEqual(self.refresh(tokens["refresh"]).status_code, 401)
+
+    def test_logout_leaves_other_sessions_alone(self):
+        tokens, other = issue_tokens(self.user), issue_tokens(self.user)
+        self.logout(tokens)
+        self.assertEqual(self.get(other["token"]).status_code, 200)
+        self.assertEqual(self.refresh(other["refresh"]).status_code, 200)
+
+    def test_logout_ignores_another_users_refresh_token(self):
+        someone = User.objects.create(username="someone", email="someone@example.com")
+        theirs = issue_tokens(someone)
+        self.logout(issue_tokens(self.user), refresh=theirs["refresh"])
+        self.assertEqual(self.refresh(theirs["refresh"]).status_code, 200)
+
+
+class RevocationListTests(TokenTestCase):
+    def test_revoke_is_seen_by_other_workers_after_a_refresh(self):
+        claims = verify_token(issue_tokens(self.user)["refresh"], REFRESH)
+        other_worker = RevocationList()
+        self.assertFalse(other_worker.is_revoked(claims))
+
+        self.assertTrue(revocation_list.revoke(claims, self.user))
+        self.assertTrue(revocation_list.is_revoked(claims))
+        other_worker._refreshed_at = 0.0
+        self.assertTrue(other_worker.is_revoked(claims))
+
+    def test_revoke_only_succeeds_once(self):
+        claims = verify_token(issue_tokens(self.user)["refresh"], REFRESH)
+        self.assertTrue(revocation_list.revoke(claims, self.user))
+        self.assertFalse(revocation_list.revoke(claims, self.user))
+        self.assertEqual(RevokedToken.objects.filter(jti=claims["jti"]).count(), 1)
+
+    def test_false_positive_is_confirmed_against_the_table(self):
+        claims = verify_token(issue_tokens(self.user)["token"])
+        revocation_list.is_revoked(claims)
+        revocation_list.filter.add(claims["jti"])
+        false_positives = revocation_list.false_positives
+        self.assertFalse(revocation_list.is_revoked(claims))
+        self.assertEqual(revocation_list.false_positives, false_positives + 1)
+
+
+@override_settings(JWT_CLAIMS_PRINCIPAL=True, QUERY_BUDGET_ENFORCE=False)
+class ClaimsPrincipalTests(TokenTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin = User.objects.create(username="admin", email="admin@example.com", role=UserRole.ADMIN)
+
+    def setUp(self):
+        super().setUp()
+        claims_principals.clear()
+        # Its periodic refresh is not part of any one request
+        revocation_list._refresh()
+
+    def authenticate(self, token):
+        request = RequestFactory().get(PROTECTED_URL, HTTP_AUTHORIZATION=f"Bearer {token}")
+        return JWTAuthentication().authenticate(request)[0]
+
+    def test_principal_is_built_without_a_query(self):
+        token = issue_tokens(self.user)["token"]
+        with self.assertNumQueries(0):
+            user = self.authenticate(token)
+        self.assertEqual((user.pk, user.role, user.is_kyc_verified), (self.user.pk, UserRole.CUSTOMER, False))
+
+    def test_touching_a_deferred_field_loads_the_rest_once(self):
+        user = self.authenticate(issue_tokens(self.user)["token"])
+        loads = claims_principals.loads
+        with self.assertNumQueries(1):
+            self.assertEqual(user.username, "customer")
+            self.assertEqual(user.kyc_status, self.user.kyc_status)
+        self.assertEqual(claims_principals.loads, loads + 1)
+        self.assertEqual(user.get_deferred_fields(), {"password", "access_token"})
+
+    def test_demotion_applies_to_earlier_tokens(self):
+        token = issue_tokens(self.admin)["token"]
+        self.assertEqual(self.client.get("/api/accounts/auth-metrics/", HTTP_AUTHORIZATION=f"Bearer {token}").status_code, 200)
+
+        self.admin.role = UserRole.CUSTOMER
+        self.admin.save()
+        response = self.client.get("/api/accounts/auth-metrics/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, 403)
+
+    def test_kyc_approval_applies_to_earlier_tokens(self):
+        token = issue_tokens(self.user)["token"]
+        self.assertFalse(self.authenticate(token).is_kyc_verified)
+
+        KYCVerification.objects.create(
+            user=self.user,
+            photo="kyc/photos/photo.png",
+            citizenship="kyc/citizenship/citizenship.png",
+            full_name="Customer",
+            address="Kathmandu",
+            phone_number="9800000000",
+            email=self.user.email,
+            status=KYCVerification.Status.APPROVED,
+        )
+        self.assertTrue(self.authenticate(token).is_kyc_verified)
+
+    def test_deactivated_user_is_rejected(self):
+        token = issue_tokens(self.user)["token"]
+        self.assertEqual(self.get(token).status_code, 200)
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.get(token)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["detail"], "User inactive")
+
+    def test_deleted_user_is_rejected(self):
+        token = issue_tokens(self.user)["token"]
+        self.assertEqual(self.get(token).status_code, 200)
+
+        self.user.delete()
+        response = self.get(token)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["detail"], "User not found")
+
+    @override_settings(JWT_ACCESS_TOKEN_LIFETIME=7 * 24 * 3600)
+    def test_long_lived_access_tokens_turn_it_off(self):
+        self.assertFalse(claims_enabled())
+        self.assertNotIn("uid", verify_token(issue_tokens(self.user)["token"]))
+        self.assertEqual([w.id for w in check_claims_lifetime(None)], ["newpwork.W002"])
+
+
+class DashboardStatsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create(username="customer", email="customer@example.com", role=UserRole.CUSTOMER)
+        provider = User.objects.create(username="provider", email="provider@example.com", role=UserRole.PROVIDER)
+        cls.service = Service.objects.create(
+            provider=provider,
+            category=ServiceCategory.objects.create(name="Plumbing", slug="plumbing"),
+            title="Pipe fitting",
+            slug="pipe-fitting",
+            description="Pipes",
+            base_price=Decimal("100.00"),
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cached_stats_are_dropped_when_the_change_commits(self):
+        self.assertEqual(dashboard_stats.stats_for_user(self.customer)["total_bookings"], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Booking.objects.create(service=self.service, customer=self.customer)
+            # Rebuilt now, it would be cached again before the booking is visible elsewhere
+            self.assertIsNotNone(cache.get(dashboard_stats.user_key(self.customer.pk)))
+        self.assertIsNone(cache.get(dashboard_stats.user_key(self.customer.pk)))
+        self.assertEqual(dashboard_stats.stats_for_user(self.customer)["total_bookings"], 1)
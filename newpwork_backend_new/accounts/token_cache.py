@@ -0,0 +1,103 @@
+"""
+Cache of verified JWT claims for JWTAuthentication.
+
+Clients send the same token with every request until it expires, and
+verifying it - HMAC, JSON parsing, claim checks - is repeated each time.
+Verified claims are kept in a bounded in-process LRU keyed by the token's
+SHA-256 digest, so the raw token is never stored. An entry lives for
+``TTL`` seconds or until the token's ``exp``, whichever comes first; a
+repeat request within that window skips verification entirely.
+
+Claims are cached whether or not the token has been revoked since: revocation
+is checked on every request by ``JWTAuthentication`` (``accounts.revocation``).
+
+Settings (all optional)::
+
+    JWT_TOKEN_CACHE = {
+        "MAX_ENTRIES": 10000,   # local LRU size
+        "TTL": 60,              # seconds claims stay cached at most
+    }
+"""
+
+import hashlib
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+from newpwork_backend_new.caching import LRUCache
+
+# Authentication timings kept for the percentiles in stats()
+TIMING_WINDOW = 1024
+
+
+def _config() -> dict:
+    config = {"MAX_ENTRIES": 10000, "TTL": 60}
+    config.update(getattr(settings, "JWT_TOKEN_CACHE", {}))
+    return config
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class TokenCache:
+    def __init__(self):
+        config = _config()
+        self.local = LRUCache(max_entries=config["MAX_ENTRIES"], ttl=config["TTL"])
+        self.verifications = 0
+        self._timings = deque(maxlen=TIMING_WINDOW)
+        self._timing_lock = threading.Lock()
+        self.auth_requests = 0
+        self.auth_seconds = 0.0
+
+    def decode(self, token: str, verify) -> dict:
+        """Claims of ``token``; ``verify(token)`` runs on a miss and raises if invalid."""
+        digest = token_digest(token)
+        claims = self.local.get(digest)
+        if claims is not None:
+            return claims
+
+        claims = verify(token)
+        self.verifications += 1
+        ttl = self.local.ttl
+        if "exp" in claims:
+            ttl = min(ttl, claims["exp"] - time.time())
+        if ttl > 0:
+            self.local.set(digest, claims, ttl)
+        return claims
+
+    def record_auth(self, seconds: float):
+        with self._timing_lock:
+            self._timings.append(seconds)
+            self.auth_requests += 1
+            self.auth_seconds += seconds
+
+    def clear(self):
+        self.local.clear()
+
+    def stats(self) -> dict:
+        with self._timing_lock:
+            timings = sorted(self._timings)
+            requests, seconds = self.auth_requests, self.auth_seconds
+
+        def percentile(pct):
+            if not timings:
+                return None
+            return round(timings[min(len(timings) - 1, int(len(timings) * pct / 100))] * 1e6, 1)
+
+        return {
+            "local": self.local.stats(),
+            "verifications": self.verifications,
+            "auth_time_us": {
+                "requests": requests,
+                "mean": round(seconds / requests * 1e6, 1) if requests else None,
+                "p50": percentile(50),
+                "p95": percentile(95),
+                "p99": percentile(99),
+            },
+        }
+
+
+token_cache = TokenCache()
@@ -0,0 +1,85 @@
+"""
+Access and refresh tokens.
+
+``login``/``register`` return an access token (``token``, sent as
+``Authorization: Bearer``) and a refresh token (``refresh``).
+``POST /api/accounts/token/refresh/`` trades a refresh token for a new pair
+and revokes the old one, so each refresh token works once. Both carry a
+``jti`` for ``accounts.revocation``. Tokens issued before this change have no
+``type``; they are accepted as access tokens until their 7 days run out.
+
+Lifetimes, in seconds: ``JWT_ACCESS_TOKEN_LIFETIME`` (15 minutes by default)
+and ``JWT_REFRESH_TOKEN_LIFETIME`` (7 days). Clients refresh when an access
+token is rejected; the frontend does so in ``frontend/lib/api.js``.
+
+Tokens are signed with the keyring's current key (``accounts.keys``) and name
+it in their ``kid`` header; without a keyring they fall back to HS256.
+With ``JWT_CLAIMS_PRINCIPAL`` on, access tokens also carry the claims of
+``accounts.claims``.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import jwt
+from django.conf import settings
+
+from . import claims
+from .keys import keyring
+
+ACCESS = "access"
+REFRESH = "refresh"
+
+
+def _secret():
+    return getattr(settings, "NEXTAUTH_SECRET", settings.SECRET_KEY)
+
+
+def _lifetime(token_type) -> int:
+    if token_type == ACCESS:
+        return getattr(settings, "JWT_ACCESS_TOKEN_LIFETIME", 15 * 60)
+    return getattr(settings, "JWT_REFRESH_TOKEN_LIFETIME", 7 * 24 * 3600)
+
+
+def encode_token(user, token_type) -> str:
+    now = datetime.now(timezone.utc)
+    payload = {
+        "email": user.email,
+        "type": token_type,
+        "jti": uuid.uuid4().hex,
+        "iat": now,
+        "exp": now + timedelta(seconds=_lifetime(token_type)),
+    }
+    if token_type == ACCESS and claims.enabled():
+        payload.update(claims.principal_claims(user))
+    key = keyring.current()
+    if key is None:
+        return jwt.encode(payload, _secret(), algorithm="HS256")
+    return jwt.encode(payload, key.private_key, algorithm=key.algorithm, headers={"kid": key.kid})
+
+
+def issue_tokens(user) -> dict:
+    """The token fields of a login/register/refresh response."""
+    return {
+        "token": encode_token(user, ACCESS),
+        "refresh": encode_token(user, REFRESH),
+        "expires_in": _lifetime(ACCESS),
+    }
+
+
+def verify_token(token, token_type=ACCESS) -> dict:
+    """Claims of a valid ``token_type`` token; raises ``jwt.InvalidTokenError``."""
+    kid = jwt.get_unverified_header(token).get("kid")
+    if kid is not None:
+        key = keyring.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError("Unknown signing key")
+        # Only the key's own algorithm: no verifying an HS256 token with a public key
+        claims = jwt.decode(token, key.public_key, algorithms=[key.algorithm])
+    elif getattr(settings, "JWT_ACCEPT_HS256", True):
+        claims = jwt.decode(token, _secret(), algorithms=["HS256"])
+    else:
+        raise jwt.InvalidTokenError("HS256 tokens are not accepted")
+    if claims.get("type", ACCESS) != token_type:
+        raise jwt.InvalidTokenError("Wrong token type")
+    return claims
@@ -0,0 +1,46 @@
+"""
+Streaming upload handling for KYC documents.
+
+Django's default handlers keep uploads up to FILE_UPLOAD_MAX_MEMORY_SIZE
+(10 MB here) in worker memory. For KYC submissions every file is instead
+streamed to a temporary file in KYC_UPLOAD_CHUNK_SIZE pieces and hashed as
+it arrives, so a request holds at most one chunk per file in memory. The
+SHA-256 digest is attached to the uploaded file for the content-addressed
+storage in ``accounts.storage``.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from rest_framework.parsers import MultiPartParser
+
+
+class HashingFileUploadHandler(TemporaryFileUploadHandler):
+    """Write every upload to disk in fixed-size chunks, hashing on the fly."""
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.chunk_size = getattr(settings, "KYC_UPLOAD_CHUNK_SIZE", 64 * 2**10)
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        file.sha256 = self.hasher.hexdigest()
+        return file
+
+
+class KYCUploadParser(MultiPartParser):
+    """Multipart parser that streams files through HashingFileUploadHandler."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        request = parser_context["request"]
+        request.upload_handlers = [HashingFileUploadHandler(request._request)]
+        return super().parse(stream, media_type=media_type, parser_context=parser_context)
@@ -1,7 +1,7 @@
 from django.urls import path
 from . import views
 from django.http import JsonResponse
-from .views import sync_user, stats, user_stats, login, register, submit_kyc, get_kyc_status, list_pending_kyc, verify_kyc
+from .views import sync_user, stats, user_stats, login, register, refresh_token, logout, submit_kyc, get_kyc_status, list_pending_kyc, verify_kyc, auth_metrics
 
 def accounts_home(request):
     """Default view for /api/accounts/"""
@@ -10,9 +10,13 @@ def accounts_home(request):
         "endpoints": {
             "login": "/api/accounts/login/",
             "register": "/api/accounts/register/",
+            "token_refresh": "/api/accounts/token/refresh/",
+            "logout": "/api/accounts/logout/",
+            "jwks": "/.well-known/jwks.json",
             "sync": "/api/accounts/sync/",
             "stats": "/api/accounts/stats/",
             "user_stats": "/api/accounts/user-stats/",
+            "auth_metrics": "/api/accounts/auth-metrics/",
             "kyc_submit": "/api/accounts/kyc/submit/",
             "kyc_status": "/api/accounts/kyc/status/",
             "kyc_pending": "/api/accounts/kyc/pending/",
@@ -24,9 +28,12 @@ urlpatterns = [
     path("", accounts_home, name="accounts_home"),
     path("login/", login, name="login"),
     path("register/", register, name="register"),
+    path("token/refresh/", refresh_token, name="token_refresh"),
+    path("logout/", logout, name="logout"),
     path("sync/", sync_user, name="sync_user"),
     path("stats/", stats, name="stats"),
     path("user-stats/", user_stats, name="user_stats"),
+    path("auth-metrics/", auth_metrics, name="auth_metrics"),
     path("kyc/submit/", submit_kyc, name="submit_kyc"),
     path("kyc/status/", get_kyc_status, name="get_kyc_status"),
     path("kyc/pending/", list_pending_kyc, name="list_pending_kyc"),
@@ -1,18 +1,35 @@
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, parser_classes, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.db.models import Count
-from .models import User, UserRole, KYCVerification
+from .models import User, UserRole, KYCStatus, KYCVerification
 from django.conf import settings
-from services.models import Service
-from bookings.models import Booking
-from django.db import models
+from django.db import IntegrityError, transaction
 from django.contrib.auth import authenticate
 from django.utils import timezone
 from .serializers import KYCVerificationSerializer, UserSerializer
+from . import hashing
+from .keys import keyring
+from .revocation import revocation_list
+from .tokens import REFRESH, issue_tokens, verify_token
+from .claims import claims_principals
+from .principal_cache import principal_cache
+from .token_cache import token_cache
+from .uploads import KYCUploadParser
+from . import stats as dashboard_stats
+from newpwork_backend_new.pagination import paginate_queryset
+from newpwork_backend_new.querybudget import query_budget
 import jwt
-from datetime import datetime, timedelta
+
+
+def hashing_busy_response(exc):
+    return Response(
+        {"error": "Too many sign-in requests right now, please try again shortly"},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -28,22 +45,15 @@ def login(request):
     try:
         user = User.objects.get(email=email)
         # Check password manually since authenticate requires username
-        if not user.check_password(password):
+        if not hashing.check_password(user, password):
             return Response({"error": "Invalid email or password"}, status=status.HTTP_401_UNAUTHORIZED)
     except User.DoesNotExist:
         return Response({"error": "Invalid email or password"}, status=status.HTTP_401_UNAUTHORIZED)
-
-    # Generate JWT token
-    secret = getattr(settings, "NEXTAUTH_SECRET", settings.SECRET_KEY)
-    payload = {
-        "email": user.email,
-        "exp": datetime.utcnow() + timedelta(days=7),
-        "iat": datetime.utcnow()
-    }
-    token = jwt.encode(payload, secret, algorithm="HS256")
+    except hashing.HashingBusy as exc:
+        return hashing_busy_response(exc)
 
     return Response({
-        "token": token,
+        **issue_tokens(user),
         "user": {
             "email": user.email,
             "name": user.display_name or user.username,
@@ -109,24 +119,22 @@ def register(request):
     if User.objects.filter(email=email).exists():
         return Response({"error": "An account with this email already exists"}, status=status.HTTP_400_BAD_REQUEST)
 
-    user = User.objects.create_user(
-        username=username,
-        email=email,
-        password=password,
+    try:
+        encoded_password = hashing.make_password(password)
+    except hashing.HashingBusy as exc:
+        return hashing_busy_response(exc)
+
+    # What create_user does, with the password already hashed
+    user = User(
+        username=User.normalize_username(username),
+        email=User.objects.normalize_email(email),
+        password=encoded_password,
         role=role
     )
-
-    # Generate JWT token
-    secret = getattr(settings, "NEXTAUTH_SECRET", settings.SECRET_KEY)
-    payload = {
-        "email": user.email,
-        "exp": datetime.utcnow() + timedelta(days=7),
-        "iat": datetime.utcnow()
-    }
-    token = jwt.encode(payload, secret, algorithm="HS256")
+    user.save()
 
     return Response({
-        "token": token,
+        **issue_tokens(user),
         "user": {
             "email": user.email,
             "name": user.display_name or user.username,
@@ -137,6 +145,55 @@ def register(request):
     }, status=status.HTTP_201_CREATED)
 
 
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def refresh_token(request):
+    """Trade a refresh token for a new access/refresh pair (each refresh token works once)."""
+    refresh = request.data.get("refresh")
+    if not refresh:
+        return Response({"error": "Refresh token required"}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        claims = verify_token(refresh, REFRESH)
+        user = User.objects.get(email=claims["email"], is_active=True)
+    except jwt.ExpiredSignatureError:
+        return Response({"error": "Refresh token expired"}, status=status.HTTP_401_UNAUTHORIZED)
+    except (jwt.InvalidTokenError, User.DoesNotExist):
+        return Response({"error": "Invalid refresh token"}, status=status.HTTP_401_UNAUTHORIZED)
+
+    # Only one use can create the revocation row, however close they come
+    if not revocation_list.revoke(claims, user):
+        return Response({"error": "Refresh token revoked"}, status=status.HTTP_401_UNAUTHORIZED)
+    return Response(issue_tokens(user))
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def jwks(request):
+    """Public keys that verify our tokens, for services that check them locally."""
+    response = Response(keyring.jwks())
+    response["Cache-Control"] = f"public, max-age={getattr(settings, 'JWKS_MAX_AGE', 300)}"
+    return response
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def logout(request):
+    """Revoke the access token of this request and, if given, its refresh token."""
+    if isinstance(request.auth, dict) and "jti" in request.auth:
+        revocation_list.revoke(request.auth, request.user)
+
+    refresh = request.data.get("refresh")
+    if refresh:
+        try:
+            claims = verify_token(refresh, REFRESH)
+        except jwt.InvalidTokenError:
+            claims = None
+        if claims and claims["email"] == request.user.email:
+            revocation_list.revoke(claims, request.user)
+    return Response({"message": "Logged out"})
+
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def sync_user(request):
@@ -171,126 +228,89 @@ def sync_user(request):
     return Response({"message": "User synced", "created": created})
 
 
+@query_budget(5)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def stats(request):
     """Return basic admin statistics."""
-    total_users = User.objects.count()
-    total_customers = User.objects.filter(role=UserRole.CUSTOMER).count()
-    total_providers = User.objects.filter(role=UserRole.PROVIDER).count()
-    total_services = Service.objects.filter(is_active=True).count()
-    total_bookings = Booking.objects.count()
-    active_bookings = Booking.objects.filter(status=Booking.Status.CONFIRMED).count()
-    
-    data = {
-        "total_users": total_users,
-        "customers": total_customers,
-        "providers": total_providers,
-        "services": total_services,
-        "bookings": total_bookings,
-        "active_bookings": active_bookings,
-    }
-    return Response(data)
+    return Response(dashboard_stats.global_stats())
 
 
+@query_budget(3)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def user_stats(request):
     """Return user-specific dashboard statistics."""
-    user = request.user
-    
-    if getattr(user, "role", None) == UserRole.PROVIDER:
-        # Provider stats
-        my_services = Service.objects.filter(provider=user).count()
-        my_bookings = Booking.objects.filter(service__provider=user).count()
-        pending_bookings = Booking.objects.filter(service__provider=user, status=Booking.Status.PENDING).count()
-        confirmed_bookings = Booking.objects.filter(service__provider=user, status=Booking.Status.CONFIRMED).count()
-        completed_bookings = Booking.objects.filter(service__provider=user, status=Booking.Status.COMPLETED).count()
-        
-        # Calculate average rating
-        completed_with_ratings = Booking.objects.filter(
-            service__provider=user, 
-            status=Booking.Status.COMPLETED,
-            rating__isnull=False
+    return Response(dashboard_stats.stats_for_user(request.user))
+
+
+@query_budget(1)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def auth_metrics(request):
+    """Authentication cache counters (admin only)."""
+    if getattr(request.user, "role", None) != UserRole.ADMIN:
+        return Response(
+            {"detail": "Only admins can view authentication metrics."},
+            status=status.HTTP_403_FORBIDDEN
         )
-        avg_rating = completed_with_ratings.aggregate(avg=models.Avg('rating'))['avg'] or 0
-        
-        data = {
-            "total_services": my_services,
-            "total_bookings": my_bookings,
-            "pending_bookings": pending_bookings,
-            "confirmed_bookings": confirmed_bookings,
-            "completed_bookings": completed_bookings,
-            "average_rating": round(avg_rating, 1),
-        }
-    elif getattr(user, "role", None) == UserRole.CUSTOMER:
-        # Customer stats
-        my_bookings = Booking.objects.filter(customer=user).count()
-        pending_bookings = Booking.objects.filter(customer=user, status=Booking.Status.PENDING).count()
-        confirmed_bookings = Booking.objects.filter(customer=user, status=Booking.Status.CONFIRMED).count()
-        completed_bookings = Booking.objects.filter(customer=user, status=Booking.Status.COMPLETED).count()
-        
-        data = {
-            "total_bookings": my_bookings,
-            "pending_bookings": pending_bookings,
-            "confirmed_bookings": confirmed_bookings,
-            "completed_bookings": completed_bookings,
-            "active_bookings": confirmed_bookings,
-        }
-    else:
-        # Admin stats (same as public stats)
-        data = {
-            "total_users": User.objects.count(),
-            "customers": User.objects.filter(role=UserRole.CUSTOMER).count(),
-            "providers": User.objects.filter(role=UserRole.PROVIDER).count(),
-            "services": Service.objects.filter(is_active=True).count(),
-            "bookings": Booking.objects.count(),
-            "active_bookings": Booking.objects.filter(status=Booking.Status.CONFIRMED).count(),
-        }
-    
-    return Response(data)
+    return Response({
+        "principal_cache": principal_cache.stats(),
+        "claims_principal": claims_principals.stats(),
+        "token_cache": token_cache.stats(),
+        "revocation": revocation_list.stats(),
+    })
 
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@parser_classes([KYCUploadParser])
 def submit_kyc(request):
     """Submit KYC verification documents."""
     user = request.user
-    
-    # Check if KYC already exists
-    if hasattr(user, 'kyc_verification'):
-        return Response(
-            {"detail": "KYC verification already submitted. Please check status."},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    
+    already_submitted = Response(
+        {"detail": "KYC verification already submitted. Please check status."},
+        status=status.HTTP_400_BAD_REQUEST
+    )
+
+    # Check the table, not the principal's kyc_status: that may be cached
+    if KYCVerification.objects.filter(user=user).exists():
+        return already_submitted
+
     serializer = KYCVerificationSerializer(data=request.data)
     if serializer.is_valid():
-        serializer.save(user=user)
+        try:
+            with transaction.atomic():
+                serializer.save(user=user)
+        except IntegrityError:
+            # A concurrent submission got there first
+            return already_submitted
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@query_budget(3)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_kyc_status(request):
     """Get current user's KYC status."""
     user = request.user
     
-    if not hasattr(user, 'kyc_verification'):
+    if user.kyc_status == KYCStatus.NOT_SUBMITTED:
         return Response({
-            "status": "not_submitted",
+            "status": user.kyc_status,
             "is_verified": False
         })
     
     serializer = KYCVerificationSerializer(user.kyc_verification)
     return Response({
-        "status": user.kyc_verification.status,
-        "is_verified": user.kyc_verification.is_verified,
+        "status": user.kyc_status,
+        "is_verified": user.is_kyc_verified,
         "data": serializer.data
     })
 
 
+@query_budget(4)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def list_pending_kyc(request):
@@ -303,9 +323,14 @@ def list_pending_kyc(request):
             status=status.HTTP_403_FORBIDDEN
         )
     
-    pending_kyc = KYCVerification.objects.filter(status=KYCVerification.Status.PENDING)
-    serializer = KYCVerificationSerializer(pending_kyc, many=True)
-    return Response(serializer.data)
+    # Oldest submissions first, so the review queue is worked in order
+    pending_kyc, headers = paginate_queryset(
+        request,
+        KYCVerification.objects.filter(status=KYCVerification.Status.PENDING).select_related("user"),
+        ["created_at"],
+    )
+    serializer = KYCVerificationSerializer(pending_kyc, many=True, context={"request": request})
+    return Response(serializer.data, headers=headers)
 
 
 @api_view(['POST'])
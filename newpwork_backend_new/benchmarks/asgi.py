@@ -0,0 +1,182 @@
+"""
+Slow-client load test: WSGI (gunicorn, sync workers) against ASGI (uvicorn).
+
+Seeds a throwaway SQLite database and starts both servers on it with the
+same number of worker processes. For ``--duration`` seconds, ``--slow``
+clients keep connections busy by trickling their request over
+``--trickle`` seconds and reading the response slowly - mobile clients on a
+bad network - while ``--fast`` clients request the async-served endpoints
+(list_services, service_detail, list_categories, my_bookings) back to back.
+The report shows how many fast requests got through and their latency::
+
+    python -m benchmarks.asgi
+    python -m benchmarks.asgi --workers 4 --slow 50 --duration 20
+
+A sync worker is tied up by a slow client for as long as the client takes,
+so on WSGI the fast clients queue behind them; the ASGI server only spends
+time on a request once it has fully arrived.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+from benchmarks.endpoints import percentile
+from benchmarks.sqlite_concurrency import seed
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+HOST = "127.0.0.1"
+SERVERS = {
+    "wsgi": ["gunicorn", "newpwork_backend_new.wsgi:application", "--workers", "{workers}", "--bind", "{host}:{port}",
+             "--log-level", "warning"],
+    "asgi": ["uvicorn", "newpwork_backend_new.asgi:application", "--workers", "{workers}", "--host", "{host}",
+             "--port", "{port}", "--log-level", "warning", "--no-access-log"],
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind, workers, env):
+    port = free_port()
+    command = [part.format(workers=workers, host=HOST, port=port) for part in SERVERS[kind]]
+    process = subprocess.Popen(command, cwd=PROJECT_DIR, env=env)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((HOST, port), timeout=1).close()
+            return process, port
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"{kind} server did not start")
+
+
+def login(port, email):
+    request = urllib.request.Request(
+        f"http://{HOST}:{port}/api/accounts/login/",
+        data=json.dumps({"email": email, "password": "loadtest"}).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)["token"]
+
+
+async def fetch(port, path, token=None, trickle=0.0, read_delay=0.0):
+    """GET ``path`` over a fresh connection; returns the status code."""
+    reader, writer = await asyncio.open_connection(HOST, port)
+    try:
+        head = f"GET {path} HTTP/1.1\r\nHost: {HOST}\r\nConnection: close\r\nAccept: application/json\r\n"
+        if token:
+            head += f"Authorization: Bearer {token}\r\n"
+        data = (head + "\r\n").encode()
+        if trickle:
+            pieces = 10
+            step = -(-len(data) // pieces)
+            for start in range(0, len(data), step):
+                writer.write(data[start:start + step])
+                await writer.drain()
+                await asyncio.sleep(trickle / pieces)
+        else:
+            writer.write(data)
+            await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        while await reader.read(1024 if read_delay else 65536):
+            if read_delay:
+                await asyncio.sleep(read_delay)
+        return status
+    finally:
+        writer.close()
+
+
+async def load(port, fixture, args):
+    deadline = time.monotonic() + args.duration
+    paths = [
+        ("/api/services/services/?cursor=", None),
+        (f"/api/services/services/{fixture['service']}/detail/", None),
+        ("/api/services/categories/?cursor=", None),
+        ("/api/bookings/mine/?cursor=", fixture["token"]),
+    ]
+    timings, errors, slow_done = [], [0], [0]
+
+    async def fast_client(n):
+        i = n
+        while time.monotonic() < deadline:
+            path, token = paths[i % len(paths)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                status = await asyncio.wait_for(fetch(port, path, token), timeout=args.timeout)
+            except (OSError, asyncio.TimeoutError, ValueError, IndexError):
+                status = None
+            if status == 200:
+                timings.append((time.perf_counter() - start) * 1000)
+            else:
+                errors[0] += 1
+
+    async def slow_client():
+        while time.monotonic() < deadline:
+            try:
+                await fetch(port, "/api/services/services/?cursor=", trickle=args.trickle, read_delay=0.05)
+                slow_done[0] += 1
+            except (OSError, ValueError, IndexError):
+                await asyncio.sleep(0.1)
+
+    tasks = [slow_client() for _ in range(args.slow)] + [fast_client(n) for n in range(args.fast)]
+    await asyncio.gather(*tasks)
+    completed = len(timings)
+    timings = timings or [0.0]
+    return {
+        "fast_per_s": completed / args.duration,
+        "p50_ms": percentile(timings, 50),
+        "p95_ms": percentile(timings, 95),
+        "errors": errors[0],
+        "slow_done": slow_done[0],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=2, help="server worker processes (default: 2)")
+    parser.add_argument("--slow", type=int, default=20, help="slow clients (default: 20)")
+    parser.add_argument("--fast", type=int, default=4, help="fast clients (default: 4)")
+    parser.add_argument("--trickle", type=float, default=2.0, help="seconds a slow client takes to send (default: 2)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per server (default: 10)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="fast request timeout (default: 10)")
+    parser.add_argument("--servers", default="wsgi,asgi", help="comma-separated: wsgi, asgi")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.sqlite3")
+        emails, services = seed(db_path, 1)
+        env = dict(os.environ, SQLITE_PATH=db_path, DJANGO_DB_PROFILE="production")
+
+        print(f"{'server':<8}{'fast req/s':>12}{'p50':>10}{'p95':>10}{'errors':>8}{'slow done':>11}")
+        for kind in [name.strip() for name in args.servers.split(",") if name.strip()]:
+            process, port = start_server(kind, args.workers, env)
+            try:
+                fixture = {"service": services[0], "token": login(port, emails[0])}
+                row = asyncio.run(load(port, fixture, args))
+            finally:
+                process.terminate()
+                process.wait()
+            print(
+                f"{kind:<8}{row['fast_per_s']:>12.1f}{row['p50_ms']:>8.1f}ms{row['p95_ms']:>8.1f}ms"
+                f"{row['errors']:>8}{row['slow_done']:>11}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
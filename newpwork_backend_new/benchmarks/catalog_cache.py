@@ -0,0 +1,122 @@
+"""
+Catalog response cache: latency per tier and stampede coalescing.
+
+Replays the anonymous catalog endpoints through the Django test client with
+the cache disabled, on a miss (both tiers cleared before every request), on
+an L2 hit (only the in-process tier cleared) and on an L1 hit. Then it
+simulates a stampede: ``--threads`` clients request the same page right after
+a write invalidated it, and the report shows how many times the view
+actually ran::
+
+    python -m benchmarks.catalog_cache
+    python -m benchmarks.catalog_cache --scale medium --threads 32
+
+The L2 column needs a shared cache (``CACHE_REDIS_URL``, or
+``CATALOG_SHARED_CACHE`` naming a CACHES alias); without one it shows ``-``.
+"""
+
+import argparse
+import sys
+import threading
+import time
+
+import django
+
+from benchmarks.endpoints import SCALES, build_fixture, fill, percentile, seeded_database
+
+ENDPOINTS = {
+    "list_services": "/api/services/services/?cursor=",
+    "list_services_search": "/api/services/services/?q=repair&cursor=",
+    "service_detail": "/api/services/services/{service}/detail/",
+    "list_categories": "/api/services/categories/?cursor=",
+}
+
+
+def time_requests(client, path, iterations, before=None):
+    timings = []
+    for _ in range(iterations):
+        if before:
+            before()
+        start = time.perf_counter()
+        response = client.get(path)
+        timings.append((time.perf_counter() - start) * 1000)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {path} returned {response.status_code}")
+    return percentile(timings, 50)
+
+
+def stampede(path, threads, rounds, service_id):
+    """Average view builds per round when ``threads`` requests arrive at once."""
+    from django.db import connections
+    from django.test import Client
+
+    from services.models import Service
+    from services.response_cache import response_cache
+
+    builds = 0
+    for _ in range(rounds):
+        # A real write, so the entry is retired the way production retires it
+        Service.objects.get(pk=service_id).save(update_fields=["updated_at"])
+        barrier = threading.Barrier(threads)
+        before = response_cache.builds
+
+        def client():
+            barrier.wait()
+            Client().get(path)
+            connections.close_all()
+
+        workers = [threading.Thread(target=client) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        builds += response_cache.builds - before
+    return builds / rounds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", default="small", choices=SCALES)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=16, help="concurrent clients in the stampede (default: 16)")
+    parser.add_argument("--rounds", type=int, default=10, help="stampedes to average over (default: 10)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    django.setup()
+    from django.test import Client
+    from django.test.utils import setup_test_environment
+
+    from services.response_cache import response_cache
+
+    setup_test_environment(debug=False)
+
+    def clear_all():
+        response_cache.clear()
+        if response_cache.shared is not None:
+            response_cache.shared.clear()
+
+    with seeded_database(args.scale, args.seed):
+        client = Client()
+        fixture = build_fixture(client)
+        print(f"{'endpoint':<22}{'no cache':>11}{'miss':>11}{'L2 hit':>11}{'L1 hit':>11}")
+        for name, path in ENDPOINTS.items():
+            path = fill(path, fixture)
+            response_cache.enabled = False
+            uncached = time_requests(client, path, args.iterations)
+            response_cache.enabled = True
+            miss = time_requests(client, path, args.iterations, before=clear_all)
+            l2 = "-"
+            if response_cache.shared is not None:
+                l2 = f"{time_requests(client, path, args.iterations, before=response_cache.local.clear):.3f}ms"
+            l1 = time_requests(client, path, args.iterations)
+            print(f"{name:<22}{uncached:>9.3f}ms{miss:>9.3f}ms{l2:>11}{l1:>9.3f}ms")
+
+        path = fill(ENDPOINTS["service_detail"], fixture)
+        builds = stampede(path, args.threads, args.rounds, fixture["service"])
+        print(f"\nstampede: {args.threads} concurrent requests after a write -> {builds:.1f} view builds per round")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
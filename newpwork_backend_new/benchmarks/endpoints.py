@@ -0,0 +1,380 @@
+"""
+Latency, query and memory benchmarks for the hot API endpoints.
+
+For every scale the harness creates a throwaway test database, fills it with
+``generate_load_data`` and replays each endpoint through the Django test
+client. It reports p50/p95/p99 latency, queries per request and the peak
+memory allocated while serving one request, then compares the numbers with
+the committed baselines::
+
+    python -m benchmarks.endpoints                      # small + medium
+    python -m benchmarks.endpoints --scales large --iterations 20
+    python -m benchmarks.endpoints --update-baseline    # after a deliberate change
+
+Query counts do not depend on the machine, so they get no tolerance: a run
+fails (exit status 1) when an endpoint runs even one query more than its
+baseline. Timings do depend on it. Every run times a fixed calibration workload (JSON
+encoding and in-memory SQLite queries) before and after the endpoints and
+scales the baseline's latencies by how much slower or faster this machine
+is than the one that recorded them. A median latency more than
+``--threshold`` (and ``--min-delta-ms``) above the scaled baseline, or a
+peak memory ``--threshold`` above its baseline, is reported as a warning;
+it only fails the run with ``--strict-timings``, since shared machines are
+noisy even after calibration. The median is compared rather than p95
+because tail latency is noisier still.
+"""
+
+import argparse
+import io
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "newpwork_backend_new.settings")
+
+BASELINE_PATH = Path(__file__).with_name("baselines.json")
+
+SCALES = {
+    "small": {"customers": 200, "providers": 40, "services": 400, "bookings": 5000, "favorites": 1000},
+    "medium": {"customers": 2000, "providers": 300, "services": 5000, "bookings": 100000, "favorites": 10000},
+    "large": {"customers": 20000, "providers": 2000, "services": 20000, "bookings": 1000000, "favorites": 50000},
+}
+
+# name -> (method, path, actor, body); "{...}" placeholders are filled from the fixture
+ENDPOINTS = {
+    "list_services": ("get", "/api/services/services/?cursor=", None, None),
+    "list_services_search": ("get", "/api/services/services/?q=repair&cursor=", None, None),
+    "service_detail": ("get", "/api/services/services/{service}/detail/", None, None),
+    "list_categories": ("get", "/api/services/categories/?cursor=", None, None),
+    "my_bookings_customer": ("get", "/api/bookings/mine/?cursor=", "customer", None),
+    "my_bookings_provider": ("get", "/api/bookings/mine/?cursor=", "provider", None),
+    "user_stats_customer": ("get", "/api/accounts/user-stats/", "customer", None),
+    "user_stats_provider": ("get", "/api/accounts/user-stats/", "provider", None),
+    "stats": ("get", "/api/accounts/stats/", "admin", None),
+    "user_stats_customer_cold": ("get", "/api/accounts/user-stats/", "customer", None),
+    "user_stats_provider_cold": ("get", "/api/accounts/user-stats/", "provider", None),
+    "stats_cold": ("get", "/api/accounts/stats/", "admin", None),
+    "favorites": ("get", "/api/clients/favorites/?cursor=", "customer", None),
+    "login": ("post", "/api/accounts/login/", None, {"email": "{customer_email}", "password": "loadtest"}),
+}
+
+# Served with the actor's dashboard stats dropped from the cache before every
+# request, so they measure the aggregates rather than a cache hit
+COLD_CACHE = {"user_stats_customer_cold", "user_stats_provider_cold", "stats_cold"}
+
+# Password hashing dominates login; fewer rounds keep the run short
+ITERATION_OVERRIDES = {"login": 10}
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "queries", "peak_kb")
+
+# Key in the baseline file holding the calibration time of the machine that wrote it
+CALIBRATION_KEY = "_calibration_ms"
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def calibrate(rounds=7) -> float:
+    """Milliseconds for a fixed workload shaped like request handling.
+
+    The fastest of ``rounds`` after a warm-up: interruptions only ever make
+    a round slower, so the minimum is the steadiest measure of the machine.
+    """
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE row (id INTEGER PRIMARY KEY, title TEXT, price REAL)")
+    connection.executemany("INSERT INTO row (title, price) VALUES (?, ?)", [(f"row {n}", n * 1.5) for n in range(5000)])
+    timings = []
+    for _ in range(rounds + 1):
+        start = time.perf_counter()
+        for offset in range(0, 5000, 50):
+            rows = connection.execute(
+                "SELECT id, title, price FROM row WHERE id > ? ORDER BY price DESC, id LIMIT 50", (offset,)
+            ).fetchall()
+            json.dumps([{"id": pk, "title": title, "price": price} for pk, title, price in rows])
+        timings.append((time.perf_counter() - start) * 1000)
+    connection.close()
+    return round(min(timings[1:]), 2)
+
+
+def build_fixture(client):
+    from django.db.models import Count
+
+    from accounts.models import User, UserRole
+    from services.models import Service
+
+    customer = (
+        User.objects.filter(role=UserRole.CUSTOMER)
+        .annotate(n=Count("bookings"))
+        .order_by("-n", "pk")
+        .first()
+    )
+    provider = (
+        User.objects.filter(role=UserRole.PROVIDER)
+        .annotate(n=Count("services"))
+        .order_by("-n", "pk")
+        .first()
+    )
+    admin = User.objects.create_user(
+        username="bench-admin", email="bench-admin@example.com", password="loadtest", role=UserRole.ADMIN
+    )
+    service = Service.objects.filter(is_active=True).order_by("-rating_count", "pk").first()
+
+    tokens, user_ids = {}, {}
+    for role, user in (("customer", customer), ("provider", provider), ("admin", admin)):
+        response = client.post(
+            "/api/accounts/login/", {"email": user.email, "password": "loadtest"}, content_type="application/json"
+        )
+        tokens[role] = response.json()["token"]
+        user_ids[role] = user.pk
+    return {"service": service.pk, "customer_email": customer.email, "tokens": tokens, "user_ids": user_ids}
+
+
+def fill(value, fixture):
+    if isinstance(value, dict):
+        return {key: fill(item, fixture) for key, item in value.items()}
+    return value.format(**fixture) if isinstance(value, str) else value
+
+
+def run_endpoint(client, name, fixture, iterations, warmup):
+    from accounts import stats as dashboard_stats
+    from accounts.revocation import revocation_list
+    from newpwork_backend_new.querybudget import record_queries
+
+    method, path, actor, body = ENDPOINTS[name]
+    path = fill(path, fixture)
+    kwargs = {}
+    if actor:
+        kwargs["HTTP_AUTHORIZATION"] = f"Bearer {fixture['tokens'][actor]}"
+    if body is not None:
+        kwargs.update(data=fill(body, fixture), content_type="application/json")
+    request = getattr(client, method)
+    iterations = ITERATION_OVERRIDES.get(name, iterations)
+
+    def reset():
+        # Due now and then; left to a measured request it adds a query and allocations
+        revocation_list._refresh()
+        if name in COLD_CACHE:
+            # Autocommit here, so the on-commit delete runs straight away
+            dashboard_stats.invalidate(fixture["user_ids"][actor])
+
+    for _ in range(warmup):
+        reset()
+        response = request(path, **kwargs)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{name}: {method.upper()} {path} returned {response.status_code}")
+
+    timings, queries = [], []
+    for _ in range(iterations):
+        reset()
+        with record_queries() as recorder:
+            start = time.perf_counter()
+            request(path, **kwargs)
+            timings.append((time.perf_counter() - start) * 1000)
+        queries.append(recorder.count)
+
+    # Measured separately: tracing allocations slows requests down. The least
+    # of three, as a one-off allocation outside the view (the test client's
+    # weakref registry growing, say) inflates only one of them.
+    peaks = []
+    for _ in range(3):
+        reset()
+        tracemalloc.start()
+        request(path, **kwargs)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    peak = min(peaks)
+
+    return {
+        "p50_ms": round(percentile(timings, 50), 2),
+        "p95_ms": round(percentile(timings, 95), 2),
+        "p99_ms": round(percentile(timings, 99), 2),
+        "queries": max(queries),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+@contextmanager
+def seeded_database(scale, seed):
+    """Create a throwaway test database filled with ``generate_load_data``."""
+    from django.core.cache import caches
+    from django.core.management import call_command
+    from django.db import connection
+
+    # A file rather than SQLite's default in-memory test database: closer to
+    # production I/O, and it is really dropped between scales.
+    connection.settings_dict.setdefault("TEST", {})["NAME"] = os.path.join(
+        tempfile.gettempdir(), f"newpwork-bench-{scale}.sqlite3"
+    )
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        for cache in caches.all():
+            cache.clear()
+        call_command("generate_load_data", seed=seed, stdout=io.StringIO(), **SCALES[scale])
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def run_scale(scale, endpoints, iterations, warmup, seed):
+    from django.test import Client
+
+    from services.response_cache import response_cache
+
+    # Measure the views themselves; benchmarks.catalog_cache covers the cache
+    response_cache.enabled = False
+    with seeded_database(scale, seed):
+        client = Client()
+        fixture = build_fixture(client)
+        return {name: run_endpoint(client, name, fixture, iterations, warmup) for name in endpoints}
+
+
+def compare_queries(results, baselines):
+    """Endpoints running more queries than their baseline."""
+    regressions = []
+    for scale, endpoints in results.items():
+        for name, current in endpoints.items():
+            base = baselines.get(scale, {}).get(name)
+            if base and current["queries"] > base["queries"]:
+                regressions.append(f"{scale}/{name}: {current['queries']} queries (baseline {base['queries']})")
+    return regressions
+
+
+def compare_timings(results, baselines, threshold, min_delta_ms=1.0, speed=1.0):
+    """Endpoints slower or hungrier than their baseline by more than ``threshold``.
+
+    Baseline latencies are multiplied by ``speed`` (this machine's
+    calibration time over the baseline's), and latency changes smaller than
+    ``min_delta_ms`` are ignored, so timer noise on sub-millisecond
+    endpoints does not count.
+    """
+    slower = []
+    for scale, endpoints in results.items():
+        for name, current in endpoints.items():
+            base = baselines.get(scale, {}).get(name)
+            if not base:
+                continue
+            for metric, limit in (("p50_ms", base["p50_ms"] * speed), ("peak_kb", base["peak_kb"])):
+                if metric == "p50_ms" and current[metric] - limit < min_delta_ms:
+                    continue
+                if limit and current[metric] > limit * (1 + threshold):
+                    slower.append(
+                        f"{scale}/{name}: {metric} {current[metric]} vs baseline {limit:.2f} "
+                        f"(+{(current[metric] / limit - 1) * 100:.0f}%)"
+                    )
+    return slower
+
+
+def print_table(scale, rows, baselines, speed=1.0):
+    print(f"\n[{scale}]")
+    print(f"{'endpoint':<24}" + "".join(f"{metric:>10}" for metric in METRICS) + f"{'vs p50':>10}")
+    for name, row in rows.items():
+        base = baselines.get(scale, {}).get(name)
+        delta = f"{(row['p50_ms'] / (base['p50_ms'] * speed) - 1) * 100:+.0f}%" if base and base["p50_ms"] else "-"
+        print(f"{name:<24}" + "".join(f"{row[metric]:>10}" for metric in METRICS) + f"{delta:>10}")
+
+
+def machine_speed(baselines, calibration_ms):
+    """This machine's calibration time relative to the baseline's, and a note saying so."""
+    recorded = baselines.get(CALIBRATION_KEY)
+    if not recorded:
+        return 1.0, f"Calibration: {calibration_ms} ms; the baseline has none, so its latencies are used as recorded."
+    speed = calibration_ms / recorded
+    return speed, (
+        f"Calibration: {calibration_ms} ms here vs {recorded} ms for the baseline; "
+        f"baseline latencies are scaled by {speed:.2f}."
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", default="small,medium", help=f"comma-separated: {', '.join(SCALES)}")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="comma-separated endpoint names")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative growth (default: 0.25)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="ignore smaller latency changes (default: 1)")
+    parser.add_argument("--strict-timings", action="store_true", help="fail on latency/memory growth too")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--output", type=Path, help="also write the results as JSON here")
+    args = parser.parse_args(argv)
+
+    django.setup()
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment(debug=False)
+
+    scales = [scale.strip() for scale in args.scales.split(",") if scale.strip()]
+    endpoints = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+    unknown = [name for name in scales if name not in SCALES] + [name for name in endpoints if name not in ENDPOINTS]
+    if unknown:
+        parser.error(f"unknown scale or endpoint: {', '.join(unknown)}")
+
+    baselines = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    calibration_ms = calibrate()
+    results = {}
+    for scale in scales:
+        results[scale] = run_scale(scale, endpoints, args.iterations, args.warmup, args.seed)
+    calibration_ms = min(calibration_ms, calibrate())
+    speed, calibration_note = machine_speed(baselines, calibration_ms)
+    print(calibration_note)
+    for scale in scales:
+        print_table(scale, results[scale], baselines, speed)
+
+    if args.output:
+        args.output.write_text(json.dumps({CALIBRATION_KEY: calibration_ms, **results}, indent=2) + "\n")
+    if args.update_baseline:
+        recorded = baselines.get(CALIBRATION_KEY)
+        for scale, rows in results.items():
+            if recorded:
+                # Keep the file on one machine's scale: untouched rows were timed there
+                rows = {
+                    name: {**row, **{m: round(row[m] / speed, 2) for m in ("p50_ms", "p95_ms", "p99_ms")}}
+                    for name, row in rows.items()
+                }
+            baselines.setdefault(scale, {}).update(rows)
+        baselines.setdefault(CALIBRATION_KEY, calibration_ms)
+        args.baseline.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not baselines:
+        print("\nNo baseline to compare against.")
+        return 0
+    regressions = compare_queries(results, baselines)
+    slower = compare_timings(results, baselines, args.threshold, args.min_delta_ms, speed)
+    print(
+        f"\nQuery counts must not exceed the baseline. Median latency more than {args.threshold:.0%} "
+        f"(and {args.min_delta_ms} ms) over the calibrated baseline, or peak memory more than "
+        f"{args.threshold:.0%} over the baseline, "
+        + ("fails the run (--strict-timings)." if args.strict_timings else "is only a warning.")
+    )
+    if args.strict_timings:
+        regressions += slower
+    elif slower:
+        print("\nSlower than the baseline (warning):")
+        for line in slower:
+            print(f"  {line}")
+    if regressions:
+        print("\nRegressions:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("\nNo regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Cost of JWTAuthentication per request, with and without the token cache.
+
+Authenticates the same Bearer token repeatedly through
+``JWTAuthentication.authenticate`` (principal cache warm, so only token
+handling differs): once verifying the token every time, once through the
+verified-claims cache::
+
+    python -m benchmarks.jwt_auth
+    python -m benchmarks.jwt_auth --iterations 100000
+"""
+
+import argparse
+import sys
+import time
+
+import django
+
+from benchmarks.endpoints import build_fixture, percentile, seeded_database
+
+
+def time_authenticate(request, iterations, before=None):
+    from accounts.auth import JWTAuthentication
+
+    authentication = JWTAuthentication()
+    timings = []
+    for _ in range(iterations):
+        if before:
+            before()
+        start = time.perf_counter()
+        authentication.authenticate(request)
+        timings.append((time.perf_counter() - start) * 1e6)
+    return percentile(timings, 50), percentile(timings, 99)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    django.setup()
+    from django.test import Client, RequestFactory
+    from django.test.utils import setup_test_environment
+
+    from accounts.token_cache import token_cache
+
+    setup_test_environment(debug=False)
+    with seeded_database("small", args.seed):
+        token = build_fixture(Client())["tokens"]["customer"]
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        time_authenticate(request, 100)
+
+        rows = {
+            "verify every time": time_authenticate(request, args.iterations, before=token_cache.clear),
+            "token cache": time_authenticate(request, args.iterations),
+        }
+        print(f"{'':<20}{'p50':>10}{'p99':>10}")
+        for name, (p50, p99) in rows.items():
+            print(f"{name:<20}{p50:>8.1f}us{p99:>8.1f}us")
+        print(f"\n{token_cache.stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
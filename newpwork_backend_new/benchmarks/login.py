@@ -0,0 +1,142 @@
+"""
+Login burst against catalog latency: hashing inline vs in the process pool.
+
+Seeds a throwaway SQLite database and starts gunicorn (threaded workers) on
+it twice: once hashing passwords on the request thread
+(``PASSWORD_HASH_WORKERS=0``) and once through ``accounts.hashing``'s pool.
+For ``--duration`` seconds, ``--logins`` clients sign in back to back while
+``--readers`` clients request ``list_services`` (response cache off, so the
+view does its real work). The report shows login throughput, how many logins
+were turned away with 503, and the catalog latency next to them::
+
+    python -m benchmarks.login
+    python -m benchmarks.login --hasher argon2 --logins 32 --pool-workers 1
+
+Inline, every login thread hashes at once and the catalog requests wait for
+CPU. With the pool, hashing is limited to ``--pool-workers`` processes per
+server worker and the excess is shed with a fast 503.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from benchmarks.asgi import HOST, PROJECT_DIR, free_port
+from benchmarks.endpoints import percentile
+from benchmarks.sqlite_concurrency import seed
+
+
+def start_server(workers, threads, env):
+    port = free_port()
+    command = [
+        "gunicorn", "newpwork_backend_new.wsgi:application", "--workers", str(workers), "--threads", str(threads),
+        "--bind", f"{HOST}:{port}", "--log-level", "warning",
+    ]
+    process = subprocess.Popen(command, cwd=PROJECT_DIR, env=env)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://{HOST}:{port}/api/services/categories/", timeout=5).close()
+            return process, port
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("server did not start")
+
+
+def request(port, path, body=None):
+    """Status code of one request; 0 when the connection failed."""
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(f"http://{HOST}:{port}{path}", data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=30) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as exc:
+        return exc.code
+    except OSError:
+        return 0
+
+
+def load(port, emails, args):
+    deadline = time.monotonic() + args.duration
+    statuses, timings = [], []
+
+    def login_client(n):
+        body = {"email": emails[n % len(emails)], "password": "loadtest"}
+        while time.monotonic() < deadline:
+            statuses.append(request(port, "/api/accounts/login/", body))
+
+    def reader():
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            if request(port, "/api/services/services/") == 200:
+                timings.append((time.perf_counter() - start) * 1000)
+
+    clients = [threading.Thread(target=login_client, args=(n,)) for n in range(args.logins)]
+    clients += [threading.Thread(target=reader) for _ in range(args.readers)]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    timings = timings or [0.0]
+    return {
+        "logins_per_s": statuses.count(200) / args.duration,
+        "rejected": statuses.count(503),
+        "errors": len(statuses) - statuses.count(200) - statuses.count(503),
+        "catalog_per_s": len(timings) / args.duration,
+        "p50_ms": percentile(timings, 50),
+        "p95_ms": percentile(timings, 95),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hasher", default="pbkdf2", choices=["pbkdf2", "argon2"])
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn worker processes (default: 2)")
+    parser.add_argument("--threads", type=int, default=8, help="threads per gunicorn worker (default: 8)")
+    parser.add_argument("--pool-workers", type=int, default=1, help="hashing processes per server worker (default: 1)")
+    parser.add_argument("--max-pending", type=int, default=4, help="hashing jobs admitted per server worker (default: 4)")
+    parser.add_argument("--logins", type=int, default=16, help="login clients (default: 16)")
+    parser.add_argument("--readers", type=int, default=2, help="list_services clients (default: 2)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per mode (default: 10)")
+    args = parser.parse_args(argv)
+
+    os.environ["DJANGO_PASSWORD_HASHER"] = args.hasher
+    modes = {
+        "inline": {"PASSWORD_HASH_WORKERS": "0", "PASSWORD_HASH_MAX_PENDING": "100000"},
+        "pool": {"PASSWORD_HASH_WORKERS": str(args.pool_workers), "PASSWORD_HASH_MAX_PENDING": str(args.max_pending)},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.sqlite3")
+        emails, _ = seed(db_path, args.logins)
+        base_env = dict(os.environ, SQLITE_PATH=db_path, DJANGO_DB_PROFILE="production", CATALOG_CACHE_ENABLED="0")
+
+        print(f"hasher: {args.hasher}")
+        print(f"{'mode':<8}{'logins/s':>10}{'503s':>7}{'errors':>8}{'catalog/s':>11}{'p50':>10}{'p95':>10}")
+        for mode, env in modes.items():
+            process, port = start_server(args.workers, args.threads, dict(base_env, **env))
+            try:
+                # Upgrade the seeded hashes to the profile before measuring
+                for email in emails:
+                    request(port, "/api/accounts/login/", {"email": email, "password": "loadtest"})
+                row = load(port, emails, args)
+            finally:
+                process.terminate()
+                process.wait()
+            print(
+                f"{mode:<8}{row['logins_per_s']:>10.1f}{row['rejected']:>7}{row['errors']:>8}"
+                f"{row['catalog_per_s']:>11.1f}{row['p50_ms']:>8.1f}ms{row['p95_ms']:>8.1f}ms"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Per-request middleware overhead for Bearer-token API calls.
+
+Replays authenticated API endpoints through the Django test client twice:
+with the stock auth and messages middleware (the old stack) and with the
+current settings, whose lean-skipping subclasses pass JWT requests straight
+through. It also times the
+middleware chain alone around a no-op view, which isolates the overhead from
+the view's own work::
+
+    python -m benchmarks.middleware
+    python -m benchmarks.middleware --iterations 2000
+"""
+
+import argparse
+import sys
+import time
+
+import django
+
+from benchmarks.endpoints import build_fixture, percentile, seeded_database
+
+ENDPOINTS = {
+    "user_stats": "/api/accounts/user-stats/",
+    "my_bookings": "/api/bookings/mine/?cursor=",
+    "favorites": "/api/clients/favorites/?cursor=",
+}
+
+
+def full_stack():
+    """``MIDDLEWARE`` with each lean-skipping class swapped for the stock one."""
+    from django.conf import settings
+    from django.utils.module_loading import import_string
+
+    from newpwork_backend_new.middleware import LeanSkipMixin
+
+    stack = []
+    for path in settings.MIDDLEWARE:
+        cls = import_string(path)
+        if isinstance(cls, type) and issubclass(cls, LeanSkipMixin):
+            stock = cls.__mro__[cls.__mro__.index(LeanSkipMixin) + 1]
+            path = f"{stock.__module__}.{stock.__qualname__}"
+        stack.append(path)
+    return stack
+
+
+def time_requests(client, path, token, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        client.get(path, HTTP_AUTHORIZATION=f"Bearer {token}")
+        timings.append((time.perf_counter() - start) * 1000)
+    return percentile(timings, 50)
+
+
+def time_chain(middleware, iterations):
+    """Median time of the middleware chain around a view that does nothing."""
+    from django.core.handlers.base import BaseHandler
+    from django.http import HttpResponse
+    from django.test import RequestFactory, override_settings
+
+    with override_settings(MIDDLEWARE=middleware):
+        handler = BaseHandler()
+        handler.load_middleware()
+    # Stand in for URL resolution + view so only the middleware is measured
+    handler._get_response = lambda request: HttpResponse(b"{}", content_type="application/json")
+
+    factory = RequestFactory()
+    timings = []
+    for _ in range(iterations):
+        request = factory.get("/api/accounts/user-stats/", HTTP_AUTHORIZATION="Bearer x")
+        start = time.perf_counter()
+        handler.get_response(request)
+        timings.append((time.perf_counter() - start) * 1000)
+    return percentile(timings, 50)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    django.setup()
+    from django.conf import settings
+    from django.test import Client, override_settings
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment(debug=False)
+    stacks = {"full": full_stack(), "lean": list(settings.MIDDLEWARE)}
+
+    us = {name: time_chain(stack, args.iterations * 10) * 1000 for name, stack in stacks.items()}
+    print(f"middleware chain only: full {us['full']:.1f}us, lean {us['lean']:.1f}us "
+          f"(-{us['full'] - us['lean']:.1f}us per request)")
+
+    with seeded_database("small", args.seed):
+        fixture = build_fixture(Client())
+        token = fixture["tokens"]["customer"]
+        print(f"\n{'endpoint':<14}{'full p50':>11}{'lean p50':>11}{'saved':>10}")
+        for name, path in ENDPOINTS.items():
+            results = {}
+            for stack_name, stack in stacks.items():
+                with override_settings(MIDDLEWARE=stack):
+                    client = Client()
+                    time_requests(client, path, token, 10)
+                    results[stack_name] = time_requests(client, path, token, args.iterations)
+            saved = results["full"] - results["lean"]
+            print(f"{name:<14}{results['full']:>9.3f}ms{results['lean']:>9.3f}ms{saved * 1000:>8.0f}us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
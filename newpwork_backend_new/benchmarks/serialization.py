@@ -0,0 +1,86 @@
+"""
+JSON rendering and parsing time for large API payloads.
+
+Serializes every active service (``ServiceSerializer`` with nested reviews)
+and a page of bookings from a seeded database, then times DRF's stdlib
+``JSONRenderer``/``JSONParser`` against the orjson classes configured in
+``REST_FRAMEWORK``, checking that both produce the same data::
+
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --scale medium --rounds 20
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+
+import django
+
+from benchmarks.endpoints import SCALES, percentile, seeded_database
+
+
+def median_ms(rounds, func):
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return percentile(timings, 50)
+
+
+def payloads(limit):
+    from bookings.models import Booking
+    from bookings.serializers import BookingSerializer
+    from services.models import Service
+    from services.service_serializers import ServiceSerializer
+
+    services = ServiceSerializer.setup_eager_loading(Service.objects.filter(is_active=True)).order_by("pk")[:limit]
+    bookings = Booking.objects.select_related("service__provider", "customer")[:limit]
+    return {
+        "services": ServiceSerializer(services, many=True).data,
+        "bookings": BookingSerializer(bookings, many=True).data,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", default="small", choices=SCALES)
+    parser.add_argument("--limit", type=int, default=2000, help="rows per payload (default: 2000)")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    django.setup()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from newpwork_backend_new.parsers import ORJSONParser
+    from newpwork_backend_new.renderers import ORJSONRenderer
+
+    with seeded_database(args.scale, args.seed):
+        data = payloads(args.limit)
+
+    print(f"{'payload':<10}{'rows':>7}{'KB':>9}{'render std':>12}{'render orjson':>15}{'parse std':>11}"
+          f"{'parse orjson':>14}{'speedup':>9}")
+    for name, payload in data.items():
+        stdlib = JSONRenderer().render(payload)
+        fast = ORJSONRenderer().render(payload)
+        if json.loads(stdlib) != json.loads(fast):
+            print(f"{name}: orjson output differs from JSONRenderer", file=sys.stderr)
+            return 1
+
+        render_std = median_ms(args.rounds, lambda: JSONRenderer().render(payload))
+        render_fast = median_ms(args.rounds, lambda: ORJSONRenderer().render(payload))
+        parse_std = median_ms(args.rounds, lambda: JSONParser().parse(io.BytesIO(stdlib)))
+        parse_fast = median_ms(args.rounds, lambda: ORJSONParser().parse(io.BytesIO(stdlib)))
+        print(
+            f"{name:<10}{len(payload):>7}{len(stdlib) / 1024:>9.0f}{render_std:>10.2f}ms{render_fast:>13.2f}ms"
+            f"{parse_std:>9.2f}ms{parse_fast:>12.2f}ms{render_std / render_fast:>8.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Write throughput of SQLite under gunicorn with several worker processes.
+
+Seeds a throwaway database file, starts ``gunicorn`` (sync workers, as in
+production) with N workers on a copy of it and lets N client threads, each
+signed in as its own customer, hammer the booking endpoints over HTTP for a
+fixed time: create a booking, list ``/api/bookings/mine/`` and cancel the
+booking again. Each worker count is run against the default SQLite settings
+and against ``DJANGO_DB_PROFILE=production`` (WAL, busy_timeout, BEGIN
+IMMEDIATE, ...)::
+
+    python -m benchmarks.sqlite_concurrency
+    python -m benchmarks.sqlite_concurrency --workers 1,4,8 --duration 10
+
+Errors are requests that failed with a 5xx, almost always
+"database is locked", or got no answer within ``--timeout``.
+"""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import django
+
+from benchmarks.endpoints import percentile
+
+PROFILES = ("development", "production")
+
+
+def request(base, method, path, token, body=None, timeout=10.0):
+    """Send one JSON request; returns ``(status, parsed body or None)``."""
+    req = urllib.request.Request(
+        base + path,
+        method=method,
+        data=json.dumps(body).encode() if body is not None else None,
+        headers={"Content-Type": "application/json", "Authorization": f"Bearer {token}"},
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as exc:
+        return exc.code, None
+    except OSError:
+        # Timed out or dropped: counted like a 5xx
+        return 599, None
+
+
+def client(base, token, service_ids, duration, timeout, barrier, results):
+    writes, errors, timings = 0, 0, []
+    barrier.wait()
+    deadline = time.perf_counter() + duration
+    i = 0
+    while time.perf_counter() < deadline:
+        service = service_ids[i % len(service_ids)]
+        i += 1
+        start = time.perf_counter()
+        status, booking = request(
+            base, "POST", "/api/bookings/create/", token,
+            {"service": service, "scheduled_for": "2030-01-01T10:00:00Z"}, timeout,
+        )
+        if status != 201:
+            errors += 1
+            continue
+        statuses = [
+            request(base, "GET", "/api/bookings/mine/?cursor=", token, timeout=timeout)[0],
+            request(
+                base, "PATCH", f"/api/bookings/{booking['id']}/status/", token, {"status": "cancelled"}, timeout
+            )[0],
+        ]
+        failed = sum(code >= 500 for code in statuses)
+        errors += failed
+        writes += 2 - failed
+        timings.append((time.perf_counter() - start) * 1000)
+    results.append((writes, errors, timings))
+
+
+def seed(path, workers):
+    os.environ["SQLITE_PATH"] = path
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "newpwork_backend_new.settings")
+    django.setup()
+    from django.core.management import call_command
+    from django.db import connection
+
+    from accounts.models import User, UserRole
+    from services.models import Service
+
+    call_command("migrate", verbosity=0)
+    call_command(
+        "generate_load_data", customers=max(workers, 50), providers=20, services=200, bookings=2000,
+        favorites=200, stdout=io.StringIO(),
+    )
+    emails = list(User.objects.filter(role=UserRole.CUSTOMER).order_by("pk").values_list("email", flat=True)[:workers])
+    services = list(Service.objects.filter(is_active=True).order_by("pk").values_list("pk", flat=True)[:50])
+    connection.close()
+    return emails, services
+
+
+def run(seeded, profile, workers, emails, services, duration, timeout):
+    # Shares its server helpers, which import seed() from here
+    from benchmarks.asgi import HOST, login, start_server
+
+    # Fresh copy per run: WAL mode sticks to the file once enabled
+    db_path = os.path.join(os.path.dirname(seeded), f"run-{profile}-{workers}.sqlite3")
+    shutil.copy(seeded, db_path)
+
+    env = dict(os.environ, SQLITE_PATH=db_path, DJANGO_DB_PROFILE=profile)
+    process, port = start_server("wsgi", workers, env)
+    try:
+        base = f"http://{HOST}:{port}"
+        tokens = [login(port, email) for email in emails[:workers]]
+        barrier = threading.Barrier(workers)
+        results = []
+        threads = [
+            threading.Thread(target=client, args=(base, token, services, duration, timeout, barrier, results))
+            for token in tokens
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        process.terminate()
+        process.wait()
+
+    writes = sum(item[0] for item in results)
+    errors = sum(item[1] for item in results)
+    timings = [t for item in results for t in item[2]] or [0.0]
+    return {
+        "writes_per_s": writes / duration,
+        "errors": errors,
+        "p50_ms": percentile(timings, 50),
+        "p95_ms": percentile(timings, 95),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", default="1,2,4,8", help="comma-separated worker counts (default: 1,2,4,8)")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per run (default: 5)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="request timeout (default: 10)")
+    parser.add_argument("--profiles", default=",".join(PROFILES), help=f"comma-separated: {', '.join(PROFILES)}")
+    args = parser.parse_args(argv)
+
+    counts = [int(n) for n in args.workers.split(",") if n.strip()]
+    profiles = [name.strip() for name in args.profiles.split(",") if name.strip()]
+    with tempfile.TemporaryDirectory() as tmp:
+        seeded = os.path.join(tmp, "seed.sqlite3")
+        emails, services = seed(seeded, max(counts))
+
+        print(f"{'profile':<13}{'workers':>8}{'writes/s':>10}{'errors':>8}{'p50':>10}{'p95':>10}")
+        for profile in profiles:
+            for workers in counts:
+                row = run(seeded, profile, workers, emails, services, args.duration, args.timeout)
+                print(
+                    f"{profile:<13}{workers:>8}{row['writes_per_s']:>10.0f}{row['errors']:>8}"
+                    f"{row['p50_ms']:>8.1f}ms{row['p95_ms']:>8.1f}ms"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
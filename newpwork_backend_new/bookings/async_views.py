@@ -0,0 +1,23 @@
+"""Async version of ``my_bookings``, served under ASGI (see asgi_urls)."""
+
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from newpwork_backend_new.async_views import async_api_view
+from newpwork_backend_new.pagination import apaginate_queryset
+from newpwork_backend_new.querybudget import query_budget
+from newpwork_backend_new.streaming import wants_stream
+from .serializers import BookingSerializer
+from .views import MY_BOOKINGS_ORDERING, bookings_for, stream_bookings
+
+
+@query_budget(4)
+@async_api_view(["GET"], [IsAuthenticated])
+async def my_bookings(request):
+    """Async ``views.my_bookings``."""
+    qs = bookings_for(request.user)
+    if wants_stream(request):
+        return stream_bookings(qs, asynchronous=True)
+    page, headers = await apaginate_queryset(request, qs, MY_BOOKINGS_ORDERING)
+    serializer = BookingSerializer(page, many=True)
+    return Response(serializer.data, headers=headers)
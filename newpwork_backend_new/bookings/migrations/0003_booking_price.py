@@ -0,0 +1,26 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def snapshot_prices(apps, schema_editor):
+    Booking = apps.get_model("bookings", "Booking")
+    Service = apps.get_model("services", "Service")
+    base_price = Service.objects.filter(pk=OuterRef("service_id")).values("base_price")
+    Booking.objects.filter(price__isnull=True).update(price=Subquery(base_price))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0002_booking_service_status_idx'),
+        ('services', '0003_service_ranking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='price',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.RunPython(snapshot_prices, migrations.RunPython.noop),
+    ]
@@ -17,11 +17,49 @@ class Booking(models.Model):
     notes = models.TextField(blank=True)
     rating = models.PositiveSmallIntegerField(null=True, blank=True)
     review = models.TextField(blank=True)
+    # The service's base_price when the booking was made; counted in the
+    # customer's total_spent (clients.totals) once the booking is completed.
+    price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["service", "status"], name="booking_service_status_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"Booking #{self.id} - {self.service.title}"
+
+    # Persisted state as of the last load/save, used by post_save receivers
+    # to tell which transition a save made.
+    _loaded_status = None
+    _loaded_rating = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get("status")
+        instance._loaded_rating = instance.__dict__.get("rating")
+        return instance
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.price is None:
+            self.price = self.service.base_price
+        super().save(*args, **kwargs)
+        self._loaded_status = self.status
+        self._loaded_rating = self.rating
+
+    @property
+    def is_rated(self) -> bool:
+        """Whether this booking counts towards its service's rating."""
+        return self.status == self.Status.COMPLETED and self.rating is not None
+
+    @property
+    def rating_changed(self) -> bool:
+        """Whether the save in progress adds, removes or changes a counted rating."""
+        was_rated = self._loaded_status == self.Status.COMPLETED and self._loaded_rating is not None
+        if was_rated != self.is_rated:
+            return True
+        return self.is_rated and self._loaded_rating != self.rating
@@ -5,8 +5,12 @@ from rest_framework import status
 from accounts.models import UserRole
 from .models import Booking
 from .serializers import BookingSerializer
+from newpwork_backend_new.pagination import normalize_ordering, paginate_queryset
+from newpwork_backend_new.querybudget import query_budget
+from newpwork_backend_new.streaming import streaming_json_response, wants_stream
 
 
+@query_budget(8)
 @api_view(["POST"]) 
 @permission_classes([IsAuthenticated])
 def create_booking(request):
@@ -21,21 +25,43 @@ def create_booking(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-@api_view(["GET"]) 
-@permission_classes([IsAuthenticated])
-def my_bookings(request):
-    """Customer: list own bookings. Provider: list bookings on their services."""
-    user = request.user
+def bookings_for(user):
+    """Customer: own bookings. Provider: bookings on their services. Admin: all."""
     if getattr(user, "role", None) == UserRole.CUSTOMER:
         qs = Booking.objects.filter(customer=user)
     elif getattr(user, "role", None) == UserRole.PROVIDER:
         qs = Booking.objects.filter(service__provider=user)
     else:  # admin
         qs = Booking.objects.all()
-    serializer = BookingSerializer(qs, many=True)
-    return Response(serializer.data)
+    return qs.select_related("service__provider", "customer")
+
+
+# Newest first
+MY_BOOKINGS_ORDERING = ["-created_at"]
+
+
+def stream_bookings(qs, asynchronous=False):
+    """``?stream=1``: the full history, as one streamed array."""
+    return streaming_json_response(
+        qs.order_by(*normalize_ordering(MY_BOOKINGS_ORDERING)), BookingSerializer, asynchronous=asynchronous
+    )
+
+
+@query_budget(4)
+@api_view(["GET"]) 
+@permission_classes([IsAuthenticated])
+def my_bookings(request):
+    """Customer: list own bookings. Provider: list bookings on their services.
+    ``?stream=1`` streams the full history as one array instead of a page."""
+    qs = bookings_for(request.user)
+    if wants_stream(request):
+        return stream_bookings(qs)
+    page, headers = paginate_queryset(request, qs, MY_BOOKINGS_ORDERING)
+    serializer = BookingSerializer(page, many=True)
+    return Response(serializer.data, headers=headers)
 
 
+@query_budget(10)
 @api_view(["PATCH"]) 
 @permission_classes([IsAuthenticated])
 def update_booking_status(request, booking_id: int):
@@ -72,6 +98,7 @@ def update_booking_status(request, booking_id: int):
         return Response(BookingSerializer(booking).data)
 
 
+@query_budget(11)
 @api_view(["PATCH"]) 
 @permission_classes([IsAuthenticated])
 def rate_booking(request, booking_id: int):
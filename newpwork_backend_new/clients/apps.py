@@ -5,4 +5,6 @@ class ClientsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'clients'
 
+    def ready(self):
+        from . import signals  # noqa: F401
 
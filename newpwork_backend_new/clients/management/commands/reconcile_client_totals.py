@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from accounts.models import UserRole
+from bookings.models import Booking
+from clients.models import ClientProfile
+from clients.totals import reconcile_client_totals
+
+
+class Command(BaseCommand):
+    help = 'Backfill client profiles and recompute total_bookings/total_spent from bookings'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of profiles created or updated per statement (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        # Customers who have booked but never opened their profile
+        missing = (
+            Booking.objects.filter(customer__role=UserRole.CUSTOMER, customer__client_profile__isnull=True)
+            .order_by('customer_id')
+            .values_list('customer_id', flat=True)
+            .distinct()
+        )
+        created = 0
+        while True:
+            user_ids = list(missing[:batch_size])
+            if not user_ids:
+                break
+            ClientProfile.objects.bulk_create(
+                [ClientProfile(user_id=user_id) for user_id in user_ids],
+                ignore_conflicts=True,
+            )
+            created += len(user_ids)
+        if created:
+            self.stdout.write(f"Created {created} client profiles")
+
+        total = 0
+        last_id = 0
+        while True:
+            ids = list(
+                ClientProfile.objects.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            total += reconcile_client_totals(ClientProfile.objects.filter(pk__in=ids))
+            last_id = ids[-1]
+            self.stdout.write(f"Reconciled {total} client profiles")
+        self.stdout.write(self.style.SUCCESS(f'Reconciled totals for {total} client profiles'))
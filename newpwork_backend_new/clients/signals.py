@@ -0,0 +1,35 @@
+from decimal import Decimal
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from bookings.models import Booking
+from .totals import apply_delta
+
+
+def _price(booking) -> Decimal:
+    # Bookings made before prices were recorded have none; F() + NULL would NULL the total
+    return Decimal("0") if booking.price is None else booking.price
+
+
+@receiver(post_save, sender=Booking)
+def update_client_totals_on_booking_save(sender, instance, created, **kwargs):
+    completed = instance.status == Booking.Status.COMPLETED
+    if created:
+        apply_delta(instance.customer_id, bookings=1, spent=_price(instance) if completed else 0)
+        return
+    was_completed = instance._loaded_status == Booking.Status.COMPLETED
+    if completed != was_completed:
+        price = _price(instance)
+        apply_delta(instance.customer_id, spent=price if completed else -price)
+
+
+@receiver(post_delete, sender=Booking)
+def update_client_totals_on_booking_delete(sender, instance, **kwargs):
+    # Never create a profile here: the customer may be the one being deleted.
+    completed = instance.status == Booking.Status.COMPLETED
+    apply_delta(
+        instance.customer_id,
+        bookings=-1,
+        spent=-_price(instance) if completed else 0,
+        create=False,
+    )
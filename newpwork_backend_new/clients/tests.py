@@ -0,0 +1,74 @@
+from decimal import Decimal
+
+from django.test import TestCase
+
+from accounts.models import User, UserRole
+from bookings.models import Booking
+from services.models import Service, ServiceCategory
+from .models import ClientProfile
+from .totals import reconcile_client_totals
+
+
+class ClientTotalsSignalTests(TestCase):
+    """Booking saves and deletes keep the customer's counters equal to a reconcile."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create(username="customer", email="customer@example.com", role=UserRole.CUSTOMER)
+        provider = User.objects.create(username="provider", email="provider@example.com", role=UserRole.PROVIDER)
+        cls.service = Service.objects.create(
+            provider=provider,
+            category=ServiceCategory.objects.create(name="Plumbing", slug="plumbing"),
+            title="Pipe fitting",
+            slug="pipe-fitting",
+            description="Pipes",
+            base_price=Decimal("100.00"),
+        )
+
+    def book(self, **kwargs):
+        return Booking.objects.create(service=self.service, customer=self.customer, **kwargs)
+
+    def assertTotals(self, bookings, spent):
+        profile = ClientProfile.objects.get(user=self.customer)
+        self.assertEqual((profile.total_bookings, profile.total_spent), (bookings, Decimal(spent)))
+        # What the counters should be, recomputed from the bookings table
+        reconcile_client_totals()
+        profile.refresh_from_db()
+        self.assertEqual((profile.total_bookings, profile.total_spent), (bookings, Decimal(spent)))
+
+    def complete(self, booking):
+        booking.status = Booking.Status.COMPLETED
+        booking.save()
+
+    def test_create_complete_and_delete(self):
+        booking = self.book()
+        self.assertTotals(1, "0")
+
+        completed = self.book(status=Booking.Status.COMPLETED)
+        self.assertTotals(2, "100")
+
+        self.complete(booking)
+        self.assertTotals(2, "200")
+
+        booking.status = Booking.Status.CANCELLED
+        booking.save()
+        self.assertTotals(2, "100")
+
+        booking.delete()
+        self.assertTotals(1, "100")
+
+        completed.delete()
+        self.assertTotals(0, "0")
+
+    def test_booking_without_a_price_counts_as_free(self):
+        self.book(status=Booking.Status.COMPLETED)
+        legacy = self.book()
+        Booking.objects.filter(pk=legacy.pk).update(price=None)
+        legacy = Booking.objects.get(pk=legacy.pk)
+
+        self.complete(legacy)
+        self.assertTotals(2, "100")
+
+        legacy.delete()
+        self.assertTotals(1, "100")
+
@@ -0,0 +1,63 @@
+"""
+Keeps ClientProfile.total_bookings and total_spent in step with bookings.
+
+Counters move with atomic F() updates as bookings are created, change
+status or are deleted (see clients.signals). Spend is the booking's price
+(the service's base_price when it was booked), counted while a booking is
+COMPLETED. ``reconcile_client_totals``
+recomputes them from the bookings table.
+"""
+
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from bookings.models import Booking
+from .models import ClientProfile
+
+
+def apply_delta(user_id, bookings: int = 0, spent: Decimal = Decimal("0"), create: bool = True):
+    """Shift a customer's counters.
+
+    A missing profile is created (already reconciled, so the delta is not
+    applied on top) unless ``create`` is false.
+    """
+    if not bookings and not spent:
+        return
+    updated = ClientProfile.objects.filter(user_id=user_id).update(
+        total_bookings=F("total_bookings") + bookings,
+        total_spent=F("total_spent") + spent,
+    )
+    if not updated and create:
+        get_or_create_profile(user_id)
+
+
+def get_or_create_profile(user_id):
+    """Return the customer's profile; a newly created one starts reconciled."""
+    profile, created = ClientProfile.objects.get_or_create(user_id=user_id)
+    if created:
+        reconcile_client_totals(ClientProfile.objects.filter(pk=profile.pk))
+        profile.refresh_from_db(fields=["total_bookings", "total_spent"])
+    return profile
+
+
+def reconcile_client_totals(profiles=None) -> int:
+    """Recompute counters for ``profiles`` (default: all) in one UPDATE."""
+    if profiles is None:
+        profiles = ClientProfile.objects.all()
+    per_user = Booking.objects.filter(customer_id=OuterRef("user_id")).order_by().values("customer_id")
+    booking_count = per_user.annotate(value=Count("id")).values("value")
+    spent = (
+        per_user.filter(status=Booking.Status.COMPLETED)
+        .annotate(value=Sum("price"))
+        .values("value")
+    )
+    return profiles.update(
+        total_bookings=Coalesce(Subquery(booking_count), Value(0)),
+        total_spent=Coalesce(
+            Subquery(spent, output_field=DecimalField(max_digits=10, decimal_places=2)),
+            Value(Decimal("0")),
+            output_field=DecimalField(max_digits=10, decimal_places=2),
+        ),
+    )
@@ -3,14 +3,18 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from accounts.models import UserRole
-from .models import ClientProfile, ClientFavorite, ClientPreferences
+from .models import ClientFavorite, ClientPreferences
 from .serializers import (
     ClientProfileSerializer,
     ClientFavoriteSerializer,
     ClientPreferencesSerializer,
 )
+from .totals import get_or_create_profile
+from newpwork_backend_new.pagination import paginate_queryset
+from newpwork_backend_new.querybudget import query_budget
 
 
+@query_budget(5)
 @api_view(["GET", "PUT", "PATCH"])
 @permission_classes([IsAuthenticated])
 def client_profile(request):
@@ -22,7 +26,7 @@ def client_profile(request):
             status=status.HTTP_403_FORBIDDEN
         )
     
-    profile, created = ClientProfile.objects.get_or_create(user=user)
+    profile = get_or_create_profile(user.pk)
     
     if request.method == "GET":
         serializer = ClientProfileSerializer(profile)
@@ -37,6 +41,7 @@ def client_profile(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@query_budget(5)
 @api_view(["GET", "POST"])
 @permission_classes([IsAuthenticated])
 def favorites(request):
@@ -49,9 +54,11 @@ def favorites(request):
         )
     
     if request.method == "GET":
-        favorites = ClientFavorite.objects.filter(client=user)
+        favorites, headers = paginate_queryset(
+            request, ClientFavorite.objects.filter(client=user).select_related("service"), ["-created_at"]
+        )
         serializer = ClientFavoriteSerializer(favorites, many=True)
-        return Response(serializer.data)
+        return Response(serializer.data, headers=headers)
     
     # POST
     serializer = ClientFavoriteSerializer(data=request.data)
@@ -83,6 +90,7 @@ def remove_favorite(request, favorite_id: int):
         )
 
 
+@query_budget(15)
 @api_view(["GET", "PUT", "PATCH"])
 @permission_classes([IsAuthenticated])
 def preferences(request):
@@ -94,7 +102,7 @@ def preferences(request):
             status=status.HTTP_403_FORBIDDEN
         )
     
-    prefs, created = ClientPreferences.objects.get_or_create(client=user)
+    prefs, created = ClientPreferences.objects.prefetch_related("preferred_categories").get_or_create(client=user)
     
     if request.method == "GET":
         serializer = ClientPreferencesSerializer(prefs)
@@ -2,6 +2,9 @@
 ASGI config for newpwork_backend_new project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Requests are resolved against ``asgi_urls``, which serves the catalog and
+``my_bookings`` from async views; run it with e.g.
+``uvicorn newpwork_backend_new.asgi:application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -9,10 +12,21 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.core.handlers.asgi import ASGIHandler, ASGIRequest
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'newpwork_backend_new.settings')
 
+django.setup(set_prefix=False)
 
 
-application = get_asgi_application()
+class AsyncViewsRequest(ASGIRequest):
+    # Django resolves a request against request.urlconf when it is set
+    urlconf = "newpwork_backend_new.asgi_urls"
+
+
+class AsyncViewsHandler(ASGIHandler):
+    request_class = AsyncViewsRequest
+
+
+application = AsyncViewsHandler()
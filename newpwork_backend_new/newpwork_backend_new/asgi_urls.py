@@ -0,0 +1,20 @@
+"""
+URLconf for the ASGI deployment (see asgi.py).
+
+The public catalog and ``my_bookings`` are served by native async views;
+every other path falls through to the regular URLconf.
+"""
+
+from django.urls import path
+
+from bookings import async_views as booking_views
+from services import async_views as service_views
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path("api/services/categories/", service_views.list_categories, name="list_categories"),
+    path("api/services/services/", service_views.list_services, name="list_services"),
+    path("api/services/services/<int:service_id>/detail/", service_views.service_detail, name="service_detail"),
+    path("api/bookings/mine/", booking_views.my_bookings, name="my_bookings"),
+    *sync_urlpatterns,
+]
@@ -0,0 +1,81 @@
+"""
+Native async views for the ASGI deployment.
+
+DRF views are synchronous, so under ASGI every ``@api_view`` request is run
+on a thread for its whole duration. ``async_api_view`` runs an ``async def``
+view inside DRF's own request handling instead: an ``APIView`` wraps the
+request, authenticates it, checks permissions and throttles, turns
+exceptions into responses and renders the view's ``Response`` - the same
+code, settings and status codes as ``@api_view``. Only that setup runs on a
+thread (authentication may query the database); the view talks to the
+database through the async ORM (``aget``, ``async for``, ...), so a request
+only occupies a thread while a query is actually running.
+
+The async views are routed by ``asgi_urls`` (see ``asgi.py``); WSGI keeps
+serving the ``@api_view`` versions. Both share their querysets and
+serializers, so they answer alike.
+"""
+
+import functools
+
+from asgiref.sync import sync_to_async
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """DRF's request handling for one ``async_api_view``; the view runs outside it."""
+
+    def _allowed_methods(self):
+        return [method.upper() for method in self.http_method_names]
+
+
+def async_api_view(methods, permission_classes=None):
+    """Async counterpart of ``@api_view(methods)`` + ``@permission_classes(...)``."""
+
+    def decorator(view):
+        view_class = type(
+            view.__name__,
+            (AsyncAPIView,),
+            {
+                # As @api_view: OPTIONS is always allowed
+                "http_method_names": [method.lower() for method in methods] + ["options"],
+                "permission_classes": permission_classes or api_settings.DEFAULT_PERMISSION_CLASSES,
+            },
+        )
+
+        # Like APIView.as_view(): session CSRF is only enforced by authentication
+        @csrf_exempt
+        @functools.wraps(view)
+        async def wrapped(request, *args, **kwargs):
+            self = view_class()
+            self.args, self.kwargs = args, kwargs
+            request = self.initialize_request(request, *args, **kwargs)
+            self.request = request
+            self.headers = self.default_response_headers
+            try:
+                await sync_to_async(self.initial)(request, *args, **kwargs)
+                if request.method.lower() not in self.http_method_names:
+                    raise exceptions.MethodNotAllowed(request.method)
+                if request.method == "OPTIONS":
+                    response = await sync_to_async(self.options)(request, *args, **kwargs)
+                else:
+                    response = await view(request, *args, **kwargs)
+            except Exception as exc:
+                response = self.handle_exception(exc)
+            response = self.finalize_response(request, response, *args, **kwargs)
+            if isinstance(response, Response):
+                if response.accepted_renderer.format == "json":
+                    response.render()
+                else:
+                    # The browsable API renders forms, which may query
+                    await sync_to_async(response.render)()
+            return response
+
+        wrapped.cls = view_class
+        return wrapped
+
+    return decorator
@@ -0,0 +1,106 @@
+"""
+Small in-process caching primitives shared by the apps, and a system check
+that the caches meant to be shared between workers are.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+class LRUCache:
+    """Thread-safe, size-bounded LRU cache whose entries expire after a TTL.
+
+    Keeps hit/miss/eviction counters so callers can report effectiveness.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key) -> bool:
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+def _shared_cache_uses():
+    """``(setting, alias)`` for each cache alias that must be shared between workers."""
+    for setting in ("CATALOG_CACHE", "JWT_PRINCIPAL_CACHE"):
+        alias = getattr(settings, setting, {}).get("SHARED_CACHE")
+        if alias:
+            yield f'{setting}["SHARED_CACHE"]', alias
+    if getattr(settings, "DATABASE_REPLICAS", None):
+        yield "DATABASE_REPLICA_PIN_CACHE", getattr(settings, "DATABASE_REPLICA_PIN_CACHE", "default")
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_caches(app_configs, **kwargs):
+    errors = []
+    for setting, alias in _shared_cache_uses():
+        if isinstance(caches[alias], LocMemCache):
+            errors.append(
+                checks.Warning(
+                    f"{setting} uses the cache '{alias}', a LocMemCache private to each process.",
+                    hint="Invalidations and pins made in one worker will not reach the others. "
+                    "Point it at a shared cache (CACHE_REDIS_URL) or unset it.",
+                    id="newpwork.W001",
+                )
+            )
+    return errors
@@ -0,0 +1,189 @@
+"""
+Read replicas for read-only views.
+
+Every write goes to ``default`` (the primary). Views decorated with
+``@replica_reads`` run their queries against one of ``DATABASE_REPLICAS``
+instead, picked at random per request::
+
+    @query_budget(5)
+    @api_view(["GET"])
+    @permission_classes([AllowAny])
+    @replica_reads
+    def list_services(request): ...
+
+Replicas lag behind the primary, so a user who has just written something
+would not see it on the next read. ``ReadYourWritesMiddleware`` pins a user
+to the primary for ``DATABASE_REPLICA_PIN_SECONDS`` after any successful
+unsafe (POST/PUT/PATCH/DELETE) request; the pin lives in the
+``DATABASE_REPLICA_PIN_CACHE`` cache, which must be shared between workers
+for the pin to hold across them. Keep the pin longer than the replication
+interval.
+
+Locally, a replica is a second SQLite file refreshed from the primary by
+``manage.py replicate_database``::
+
+    export DJANGO_DB_REPLICAS=db-replica.sqlite3
+    python manage.py replicate_database --interval 2 &
+    python manage.py runserver
+
+Only queries the view itself runs are routed: a streamed (``?stream=1``)
+body is produced after the view returns and reads from the primary.
+Responses built for ``services.response_cache`` are read inside
+``primary_reads()``: a cached copy of lagging replica rows would outlive the
+write that invalidated them.
+"""
+
+import contextvars
+import functools
+import random
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+PIN_KEY_PREFIX = "db-pin"
+
+# Alias reads go to for the current request; None = let Django decide
+_read_alias = contextvars.ContextVar("db_read_alias", default=None)
+# True inside primary_reads(): @replica_reads leaves reads on the primary
+_primary_only = contextvars.ContextVar("db_primary_only", default=False)
+
+
+def get_replicas() -> list:
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+def _pin_cache():
+    return caches[getattr(settings, "DATABASE_REPLICA_PIN_CACHE", "default")]
+
+
+def pin_primary(user_id):
+    """Send ``user_id``'s reads to the primary for the next few seconds."""
+    _pin_cache().set(f"{PIN_KEY_PREFIX}:{user_id}", 1, getattr(settings, "DATABASE_REPLICA_PIN_SECONDS", 10))
+
+
+def is_pinned(user_id) -> bool:
+    return _pin_cache().get(f"{PIN_KEY_PREFIX}:{user_id}") is not None
+
+
+async def ais_pinned(user_id) -> bool:
+    return await _pin_cache().aget(f"{PIN_KEY_PREFIX}:{user_id}") is not None
+
+
+@contextmanager
+def primary_reads():
+    """Keep ``@replica_reads`` views called in the block on the primary."""
+    token = _primary_only.set(True)
+    try:
+        yield
+    finally:
+        _primary_only.reset(token)
+
+
+def choose_replica(request):
+    """Alias to serve ``request``'s reads from, or None for the primary."""
+    replicas = get_replicas()
+    if not replicas or request.method not in SAFE_METHODS or _primary_only.get():
+        return None
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated and is_pinned(user.pk):
+        return None
+    return random.choice(replicas)
+
+
+async def achoose_replica(request):
+    replicas = get_replicas()
+    if not replicas or request.method not in SAFE_METHODS or _primary_only.get():
+        return None
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated and await ais_pinned(user.pk):
+        return None
+    return random.choice(replicas)
+
+
+def replica_reads(view):
+    """Run the (DRF or async) view's reads on a replica; goes directly above ``def``."""
+    if iscoroutinefunction(view):
+
+        @functools.wraps(view)
+        async def async_wrapped(request, *args, **kwargs):
+            alias = await achoose_replica(request)
+            if alias is None:
+                return await view(request, *args, **kwargs)
+            # sync_to_async copies the context, so the ORM's threads see it
+            token = _read_alias.set(alias)
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                _read_alias.reset(token)
+
+        return async_wrapped
+
+    @functools.wraps(view)
+    def wrapped(request, *args, **kwargs):
+        alias = choose_replica(request)
+        if alias is None:
+            return view(request, *args, **kwargs)
+        token = _read_alias.set(alias)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+
+    return wrapped
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas are copies of the primary, so rows relate across them
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from replicate_database
+        return False if db in get_replicas() else None
+
+
+class ReadYourWritesMiddleware:
+    """Pin users to the primary after they change something."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not get_replicas():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            self.pin_writer(request)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            # request.user may still be a lazy, database-backed object
+            await sync_to_async(self.pin_writer)(request)
+        return response
+
+    def pin_writer(self, request):
+        # DRF sets request.user here too once it has authenticated a token
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            pin_primary(user.pk)
@@ -0,0 +1,50 @@
+"""
+Path-aware middleware dispatch.
+
+API requests that authenticate with a Bearer token never use ``request.user``
+from the session or messages, so for paths under ``LEAN_API_PATHS`` carrying
+``Authorization: Bearer ...`` the auth and messages middleware below hand
+the request straight to the next one.
+Every other request - admin, allauth, browsable API, anonymous or
+session-authenticated API calls - gets the full stack.
+
+They are the stock classes with that one check added, listed in
+``MIDDLEWARE`` in the stock classes' places, so Django's own checks (the
+admin's included) see them. Session, CSRF, security and clickjacking
+middleware stay stock: ``manage.py check --deploy`` looks for them by path.
+A Bearer request costs them next to nothing - the session is only loaded
+when something reads it, and DRF views are ``csrf_exempt``.
+"""
+
+from django.conf import settings
+from django.contrib.auth import middleware as auth_middleware
+from django.contrib.messages import middleware as messages_middleware
+
+
+def is_lean_request(request) -> bool:
+    """Bearer-token request to an API path; worked out once per request."""
+    lean = getattr(request, "lean_middleware", None)
+    if lean is None:
+        lean = request.headers.get("Authorization", "").startswith("Bearer ") and any(
+            request.path.startswith(prefix) for prefix in getattr(settings, "LEAN_API_PATHS", ("/api/",))
+        )
+        request.lean_middleware = lean
+    return lean
+
+
+class LeanSkipMixin:
+    """Skip this middleware for lean requests (see ``is_lean_request``)."""
+
+    def __call__(self, request):
+        if is_lean_request(request):
+            # A coroutine in async mode, which the caller awaits
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class AuthenticationMiddleware(LeanSkipMixin, auth_middleware.AuthenticationMiddleware):
+    pass
+
+
+class MessageMiddleware(LeanSkipMixin, messages_middleware.MessageMiddleware):
+    pass
@@ -0,0 +1,227 @@
+"""
+Keyset (cursor) pagination shared by the list endpoints.
+
+Pages are sliced with a WHERE clause on the last row's sort key instead of an
+OFFSET, so fetching page N costs the same as fetching page 1. The response
+body stays a plain JSON array; the next page is advertised through a ``Link``
+header (``rel="next"``) and ``X-Next-Cursor``.
+
+Pagination is opt-in: only requests carrying ``cursor``, ``page_size`` or
+``limit`` get pages (``?cursor=`` alone asks for the first page at the default
+size). Other requests get every row, as the endpoints always returned, since
+existing clients read the array and never follow the next-page headers.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import ParseError
+from rest_framework.utils.urls import replace_query_param
+
+CURSOR_PARAM = "cursor"
+PAGE_SIZE_PARAMS = ("page_size", "limit")
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(values) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise ParseError("Invalid cursor.")
+    if not isinstance(values, list) or len(values) != size:
+        raise ParseError("Invalid cursor.")
+    return values
+
+
+def normalize_ordering(ordering) -> list:
+    """Append the primary key as a tie-breaker so the order is total."""
+    ordering = list(ordering)
+    if not any(field.lstrip("-") in ("id", "pk") for field in ordering):
+        descending = ordering[-1].startswith("-") if ordering else False
+        ordering.append("-id" if descending else "id")
+    return ordering
+
+
+def keyset_filter(ordering, values) -> Q:
+    """Q selecting rows strictly after ``values`` in ``ordering``."""
+    condition = Q()
+    equal_so_far = Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        condition |= equal_so_far & Q(**{f"{name}__{lookup}": value})
+        equal_so_far &= Q(**{name: value})
+    return condition
+
+
+def wants_page(request) -> bool:
+    """Whether the request asks for a page rather than the full list."""
+    # request.GET rather than query_params: async views pass a plain HttpRequest
+    return any(param in request.GET for param in (CURSOR_PARAM, *PAGE_SIZE_PARAMS))
+
+
+def _requested_page_size(request):
+    """Page size from the query string, or None."""
+    maximum = getattr(settings, "API_MAX_PAGE_SIZE", 100)
+    for param in PAGE_SIZE_PARAMS:
+        # request.GET rather than query_params: async views pass a plain HttpRequest
+        raw = request.GET.get(param)
+        if raw:
+            try:
+                size = int(raw)
+            except ValueError:
+                continue
+            if size > 0:
+                return min(size, maximum)
+    return None
+
+
+def _preferences_query(request):
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        return None
+    from clients.models import ClientPreferences
+
+    return ClientPreferences.objects.filter(client_id=user.pk).values_list("items_per_page", flat=True)
+
+
+def get_page_size(request) -> int:
+    """Page size from the query string, the customer's preferences, or settings."""
+    size = _requested_page_size(request)
+    if size:
+        return size
+    query = _preferences_query(request)
+    preferred = query.first() if query is not None else None
+    if preferred:
+        return min(preferred, getattr(settings, "API_MAX_PAGE_SIZE", 100))
+    return getattr(settings, "API_PAGE_SIZE", 12)
+
+
+async def aget_page_size(request) -> int:
+    size = _requested_page_size(request)
+    if size:
+        return size
+    query = _preferences_query(request)
+    preferred = await query.afirst() if query is not None else None
+    if preferred:
+        return min(preferred, getattr(settings, "API_MAX_PAGE_SIZE", 100))
+    return getattr(settings, "API_PAGE_SIZE", 12)
+
+
+def _page_queryset(request, queryset, ordering):
+    queryset = queryset.order_by(*ordering)
+    cursor = request.GET.get(CURSOR_PARAM)
+    if cursor:
+        try:
+            queryset = queryset.filter(keyset_filter(ordering, decode_cursor(cursor, len(ordering))))
+        except (TypeError, ValueError, ValidationError):
+            # Values the sort fields cannot hold, e.g. a cursor from another endpoint
+            raise ParseError("Invalid cursor.")
+    return queryset
+
+
+def _next_page_headers(request, has_next, keys) -> dict:
+    if not has_next:
+        return {}
+    next_cursor = encode_cursor(keys)
+    next_url = replace_query_param(request.build_absolute_uri(), CURSOR_PARAM, next_cursor)
+    return {"Link": f'<{next_url}>; rel="next"', "X-Next-Cursor": next_cursor}
+
+
+def _all_rows(queryset, hydrate):
+    if hydrate is None:
+        return list(queryset)
+    ids = list(queryset.values_list("pk", flat=True))
+    # A subquery rather than the id list, which can outgrow SQLite's parameter limit
+    by_id = {obj.pk: obj for obj in hydrate(queryset.values("pk"))}
+    return [by_id[pk] for pk in ids if pk in by_id]
+
+
+async def _aall_rows(queryset, hydrate):
+    if hydrate is None:
+        return [obj async for obj in queryset]
+    ids = [pk async for pk in queryset.values_list("pk", flat=True)]
+    by_id = {obj.pk: obj async for obj in hydrate(queryset.values("pk"))}
+    return [by_id[pk] for pk in ids if pk in by_id]
+
+
+def paginate_queryset(request, queryset, ordering, hydrate=None):
+    """Return ``(page, headers)`` for the page selected by ``?cursor=``.
+
+    Without ``cursor``/``page_size``/``limit`` the "page" is every row, in
+    order, with no headers.
+
+    ``ordering`` lists the sort fields (``-`` for descending); they must be
+    non-null columns or annotations on the queryset. The primary key is
+    appended when missing.
+
+    When ``hydrate`` is given, the page is first located by selecting only the
+    primary key and sort keys, and ``hydrate(ids)`` then loads the full rows
+    (``ids`` is a list, or a ``values("pk")`` queryset for the full list).
+    Use it when the sort cannot come from an index, so joins and subqueries
+    are evaluated for the page only rather than for every candidate row.
+    """
+    ordering = normalize_ordering(ordering)
+    if not wants_page(request):
+        return _all_rows(queryset.order_by(*ordering), hydrate), {}
+    names = [field.lstrip("-") for field in ordering]
+    page_size = get_page_size(request)
+    queryset = _page_queryset(request, queryset, ordering)
+
+    if hydrate is None:
+        rows = list(queryset[: page_size + 1])
+        page = rows[:page_size]
+        keys = [getattr(page[-1], name) for name in names] if page else None
+    else:
+        rows = list(queryset.values_list("pk", *names)[: page_size + 1])
+        ids = [row[0] for row in rows[:page_size]]
+        by_id = {obj.pk: obj for obj in hydrate(ids)}
+        page = [by_id[pk] for pk in ids if pk in by_id]
+        keys = list(rows[page_size - 1][1:]) if len(rows) > page_size else None
+
+    return page, _next_page_headers(request, len(rows) > page_size, keys)
+
+
+async def apaginate_queryset(request, queryset, ordering, hydrate=None):
+    """``paginate_queryset`` for async views, on the async ORM.
+
+    ``hydrate(ids)`` must return a queryset.
+    """
+    ordering = normalize_ordering(ordering)
+    if not wants_page(request):
+        return await _aall_rows(queryset.order_by(*ordering), hydrate), {}
+    names = [field.lstrip("-") for field in ordering]
+    page_size = await aget_page_size(request)
+    queryset = _page_queryset(request, queryset, ordering)
+
+    if hydrate is None:
+        rows = [obj async for obj in queryset[: page_size + 1]]
+        page = rows[:page_size]
+        keys = [getattr(page[-1], name) for name in names] if page else None
+    else:
+        rows = [row async for row in queryset.values_list("pk", *names)[: page_size + 1]]
+        ids = [row[0] for row in rows[:page_size]]
+        by_id = {obj.pk: obj async for obj in hydrate(ids)}
+        page = [by_id[pk] for pk in ids if pk in by_id]
+        keys = list(rows[page_size - 1][1:]) if len(rows) > page_size else None
+
+    return page, _next_page_headers(request, len(rows) > page_size, keys)
@@ -0,0 +1,34 @@
+"""
+orjson-backed JSON parser.
+
+Accepts the same documents as DRF's ``JSONParser``: bodies in a charset
+other than UTF-8, and documents orjson rejects, are handed to the stdlib
+parser, which also produces the usual "JSON parse error - ..." message for
+invalid input. One difference remains: integers beyond 64 bits may come back
+as floats. No API field accepts values that large, so they fail validation
+either way.
+"""
+
+import io
+
+import orjson
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+from .renderers import ORJSONRenderer
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if encoding.lower().replace("_", "-") not in ("utf-8", "utf8"):
+            return super().parse(stream, media_type, parser_context)
+
+        raw = stream.read()
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(raw), media_type, parser_context)
@@ -0,0 +1,183 @@
+"""
+Per-request SQL instrumentation and query budgets.
+
+``QueryBudgetMiddleware`` counts the queries each request runs, their total
+time and how many repeat an earlier statement (the usual N+1 signature). The
+numbers are logged to the ``newpwork.queries`` logger (``QueryStatsFormatter``
+renders them as one JSON object per line) and, when
+``QUERY_BUDGET_HEADERS`` is on (the default under DEBUG), returned as
+``X-DB-*`` response headers.
+
+Views declare their budget next to the code::
+
+    @query_budget(4)
+    @api_view(["GET"])
+    def my_view(request): ...
+
+A request that runs more queries than its view's budget is logged as a
+warning, and raises ``QueryBudgetExceeded`` when ``QUERY_BUDGET_ENFORCE`` is
+on, which fails the test that made it. ``test_runner.QueryBudgetTestRunner``
+(the ``TEST_RUNNER``) turns it on for the whole suite; tests run some other
+way can use ``override_settings(QUERY_BUDGET_ENFORCE=True)``. Tests can also
+measure a block directly with ``record_queries()``; ``newpwork_backend_new.tests``
+requests every budgeted view.
+"""
+
+import json
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("newpwork.queries")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryRecorder:
+    """``connection.execute_wrapper`` that tallies the statements it sees."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] += 1
+
+    @property
+    def duplicates(self) -> int:
+        """Executions of a statement beyond its first (parameters ignored)."""
+        return sum(n - 1 for n in self.statements.values() if n > 1)
+
+    def most_repeated(self):
+        if not self.statements:
+            return None
+        sql, n = self.statements.most_common(1)[0]
+        return {"sql": sql, "count": n} if n > 1 else None
+
+    def summary(self) -> dict:
+        return {
+            "queries": self.count,
+            "query_time_ms": round(self.duration * 1000, 2),
+            "duplicate_queries": self.duplicates,
+        }
+
+    def assert_at_most(self, limit: int, label: str = "block"):
+        if self.count > limit:
+            raise QueryBudgetExceeded(self.describe(label, limit))
+
+    def describe(self, label, limit) -> str:
+        message = f"{label} ran {self.count} queries, budget is {limit}"
+        repeated = self.most_repeated()
+        if repeated:
+            message += f"; repeated {repeated['count']}x: {repeated['sql']}"
+        return message
+
+
+@contextmanager
+def record_queries(using=None):
+    """Record the queries run inside the block on every (or one) database."""
+    recorder = QueryRecorder()
+    aliases = [using] if using else list(connections)
+    with ExitStack() as stack:
+        for alias in aliases:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        yield recorder
+
+
+def query_budget(max_queries: int):
+    """Declare the most queries one request to the decorated view may run."""
+
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+
+    return decorator
+
+
+class QueryStatsFormatter(logging.Formatter):
+    """Format ``newpwork.queries`` records as JSON lines."""
+
+    def format(self, record):
+        payload = {"time": self.formatTime(record), "level": record.levelname}
+        payload.update(getattr(record, "query_stats", {"message": record.getMessage()}))
+        return json.dumps(payload, default=str)
+
+
+class QueryBudgetMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with record_queries() as recorder:
+            response = self.get_response(request)
+        return self.process_stats(request, response, recorder)
+
+    async def __acall__(self, request):
+        # Connections are per thread, and under ASGI a request's ORM calls run
+        # in its own sync_to_async thread, so the wrappers are installed there.
+        recording = record_queries()
+        recorder = await sync_to_async(recording.__enter__)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(recording.__exit__)(None, None, None)
+        return self.process_stats(request, response, recorder)
+
+    def process_stats(self, request, response, recorder):
+        match = getattr(request, "resolver_match", None)
+        budget = getattr(match.func, "query_budget", None) if match else None
+        view_name = (match.view_name if match else None) or request.path
+        stats = recorder.summary()
+
+        if getattr(settings, "QUERY_BUDGET_HEADERS", settings.DEBUG):
+            response["X-DB-Query-Count"] = str(stats["queries"])
+            response["X-DB-Query-Time-Ms"] = str(stats["query_time_ms"])
+            response["X-DB-Duplicate-Queries"] = str(stats["duplicate_queries"])
+            if budget is not None:
+                response["X-DB-Query-Budget"] = str(budget)
+
+        over_budget = budget is not None and recorder.count > budget
+        logger.log(
+            logging.WARNING if over_budget else logging.INFO,
+            "%s %s: %d queries in %.2f ms (%d duplicates)",
+            request.method,
+            view_name,
+            stats["queries"],
+            stats["query_time_ms"],
+            stats["duplicate_queries"],
+            extra={
+                "query_stats": {
+                    **stats,
+                    "method": request.method,
+                    "view": view_name,
+                    "status": response.status_code,
+                    "budget": budget,
+                    "most_repeated": recorder.most_repeated(),
+                }
+            },
+        )
+        if over_budget and getattr(settings, "QUERY_BUDGET_ENFORCE", False):
+            raise QueryBudgetExceeded(recorder.describe(f"{request.method} {view_name}", budget))
+        return response
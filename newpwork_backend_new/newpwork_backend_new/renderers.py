@@ -0,0 +1,45 @@
+"""
+orjson-backed JSON renderer.
+
+Produces the same JSON as DRF's ``JSONRenderer`` with the project's
+settings (compact, UTF-8, ``\\u2028``/``\\u2029`` escaped) several times
+faster; the bytes are identical except that floats needing an exponent are
+written ``1e16`` rather than ``1e+16``. orjson writes datetimes natively
+with ``OPT_UTC_Z``, which matches DRF's format (UTC as ``Z``, microseconds
+kept). Types orjson does not know - Decimals, lazy translation strings,
+querysets, timedeltas - are passed to DRF's ``JSONEncoder``, so e.g.
+Decimals still become numbers.
+
+Requests for indented output (``Accept: application/json; indent=4`` or the
+browsable API) and payloads orjson rejects (integers beyond 64 bits,
+timezone-aware times) are rendered by the stdlib implementation.
+"""
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+LINE_SEPARATOR = "\u2028".encode()
+PARAGRAPH_SEPARATOR = "\u2029".encode()
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same escaping as JSONRenderer, so the output stays a JavaScript subset
+        if LINE_SEPARATOR in ret:
+            ret = ret.replace(LINE_SEPARATOR, b"\\u2028")
+        if PARAGRAPH_SEPARATOR in ret:
+            ret = ret.replace(PARAGRAPH_SEPARATOR, b"\\u2029")
+        return ret
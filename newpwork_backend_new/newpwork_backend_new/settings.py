@@ -54,16 +54,25 @@ INSTALLED_APPS = [
 
 
 MIDDLEWARE = [
+    # First, so it counts the queries of every other middleware too
+    "newpwork_backend_new.querybudget.QueryBudgetMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    "allauth.account.middleware.AccountMiddleware", 
-    'django.contrib.messages.middleware.MessageMiddleware',
+    # The stock auth/messages middleware, skipped for Bearer-token requests
+    # to LEAN_API_PATHS (newpwork_backend_new/middleware.py)
+    'newpwork_backend_new.middleware.AuthenticationMiddleware',
+    # allauth refuses to start unless it is listed here; it only sets up a
+    # request context, so API requests run it too
+    "allauth.account.middleware.AccountMiddleware",
+    'newpwork_backend_new.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Only active when DATABASE_REPLICAS is set
+    "newpwork_backend_new.db_router.ReadYourWritesMiddleware",
 ]
+LEAN_API_PATHS = ["/api/"]
 
 ROOT_URLCONF = 'newpwork_backend_new.urls'
 WSGI_APPLICATION = 'newpwork_backend_new.wsgi.application'
@@ -73,6 +82,7 @@ CORS_ALLOWED_ORIGINS = [
     "http://127.0.0.1:3000",
 ]
 CORS_ALLOW_CREDENTIALS = True
+CORS_EXPOSE_HEADERS = ["Link", "X-Next-Cursor"]
 CORS_ALLOW_ALL_HEADERS = True
 CORS_ALLOW_METHODS = [
     "DELETE",
@@ -93,8 +103,102 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    # orjson-backed JSON with the same output as DRF's stdlib classes
+    "DEFAULT_RENDERER_CLASSES": [
+        "newpwork_backend_new.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "newpwork_backend_new.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
+
+# CACHE_REDIS_URL (e.g. redis://localhost:6379/1) makes "default" a Redis cache
+# shared by every worker; without it each worker has its own LocMemCache. The
+# catalog and principal caches, dashboard stats and replica pins invalidate
+# across workers only through a shared cache, and fall back to short
+# per-worker lifetimes without one (`manage.py check` warns about LocMem).
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL")
+if CACHE_REDIS_URL:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": CACHE_REDIS_URL}}
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+# CACHES alias shared across workers, or None
+SHARED_CACHE = "default" if CACHE_REDIS_URL else None
+
+# Cache of authenticated principals used by accounts.auth.JWTAuthentication.
+# Set SHARED_CACHE to a CACHES alias to share entries across workers.
+JWT_PRINCIPAL_CACHE = {
+    "MAX_ENTRIES": 10000,
+    "TTL": 60,
+    "SHARED_CACHE": os.getenv("JWT_PRINCIPAL_SHARED_CACHE") or SHARED_CACHE,
+    "SHARED_TTL": 300,
+}
+
+# Token lifetimes in seconds (accounts/tokens.py). Clients renew access tokens
+# at /api/accounts/token/refresh/ (the frontend does on a 401, see
+# frontend/lib/api.js); a refresh token lasts as long as a sign-in.
+JWT_ACCESS_TOKEN_LIFETIME = int(os.getenv("JWT_ACCESS_TOKEN_LIFETIME", "900"))
+JWT_REFRESH_TOKEN_LIFETIME = int(os.getenv("JWT_REFRESH_TOKEN_LIFETIME", str(7 * 24 * 3600)))
+
+# Asymmetric token signing (accounts/keys.py). Keys are created and rotated by
+# `manage.py rotate_jwt_keys`; until then tokens are signed with HS256.
+# Turn JWT_ACCEPT_HS256 off once HS256 tokens issued before have expired.
+JWT_KEYS_DIR = os.getenv("JWT_KEYS_DIR", str(BASE_DIR / "jwt_keys"))
+JWT_SIGNING_ALGORITHM = os.getenv("JWT_SIGNING_ALGORITHM", "EdDSA")
+JWT_ACCEPT_HS256 = os.getenv("JWT_ACCEPT_HS256", "1") == "1"
+# Seconds verifiers may cache /.well-known/jwks.json
+JWKS_MAX_AGE = 300
+
+# Access tokens carry the user's id, role and KYC flag, and authentication
+# builds request.user from them without a query (accounts/claims.py). A
+# changed user's older tokens load the current row instead; with
+# JWT_PRINCIPAL_CACHE["SHARED_CACHE"] unset, other workers only notice when
+# the token is refreshed, so the mode stays off unless access tokens last at
+# most JWT_CLAIMS_MAX_AGE seconds.
+JWT_CLAIMS_PRINCIPAL = os.getenv("JWT_CLAIMS_PRINCIPAL", "") == "1"
+JWT_CLAIMS_MAX_AGE = int(os.getenv("JWT_CLAIMS_MAX_AGE", "900"))
+
+# Verified JWT claims, keyed by the token's SHA-256, skip re-verification for
+# TTL seconds (never past exp).
+JWT_TOKEN_CACHE = {
+    "MAX_ENTRIES": 10000,
+    "TTL": 60,
 }
 
+# Revoked tokens (logout, used refresh tokens) are checked against a per-worker
+# Bloom filter rebuilt from the RevokedToken table (accounts/revocation.py).
+JWT_REVOCATION = {
+    "REFRESH_SECONDS": 5,
+    "REBUILD_SECONDS": 3600,
+    "FALSE_POSITIVE_RATE": 0.01,
+}
+
+# Seconds the stats/user_stats payloads stay cached. Writes invalidate them in
+# the shared cache; a per-worker cache only sees its own worker's writes.
+DASHBOARD_STATS_CACHE_TTL = 300 if SHARED_CACHE else 10
+
+# Anonymous catalog responses (services/response_cache.py): a per-worker LRU
+# for TTL seconds, then SHARED_CACHE, which also holds the invalidation tags
+# and must be shared between workers (None = per-worker LRU only).
+CATALOG_CACHE = {
+    "ENABLED": os.getenv("CATALOG_CACHE_ENABLED", "1") == "1",
+    "MAX_ENTRIES": 2000,
+    "TTL": 5,
+    "SHARED_CACHE": os.getenv("CATALOG_SHARED_CACHE") or SHARED_CACHE,
+    "SHARED_TTL": 300,
+}
+
+# Keyset pagination for list endpoints (see newpwork_backend_new/pagination.py),
+# for requests that pass ?cursor=, ?page_size= or ?limit=; others get every row.
+# Customers' ClientPreferences.items_per_page takes precedence over the default.
+API_PAGE_SIZE = 12
+API_MAX_PAGE_SIZE = 100
+# Rows serialized per chunk by ?stream=1 list responses (newpwork_backend_new/streaming.py)
+API_STREAM_CHUNK_SIZE = 500
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -119,10 +223,83 @@ WSGI_APPLICATION = 'newpwork_backend_new.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.getenv("SQLITE_PATH") or BASE_DIR / 'db.sqlite3',
+    }
+}
+
+# DJANGO_DB_PROFILE=production tunes SQLite for several worker processes:
+# WAL lets readers run alongside the single writer, busy_timeout makes
+# writers wait for the lock instead of failing with "database is locked",
+# and BEGIN IMMEDIATE takes the write lock up front so a transaction never
+# has to upgrade a read lock (which fails immediately, whatever the timeout).
+DB_PROFILE = os.getenv("DJANGO_DB_PROFILE", "development")
+if DB_PROFILE == "production":
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+        "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+        # Negative values are KiB rather than pages
+        "cache_size": -int(os.getenv("SQLITE_CACHE_KB", str(64 * 1024))),
+        "temp_store": "MEMORY",
     }
+    DATABASES['default'].update({
+        'OPTIONS': {
+            'init_command': "; ".join(f"PRAGMA {name}={value}" for name, value in SQLITE_PRAGMAS.items()),
+            'transaction_mode': 'IMMEDIATE',
+        },
+        'CONN_MAX_AGE': int(os.getenv("CONN_MAX_AGE", "600")),
+        'CONN_HEALTH_CHECKS': True,
+    })
+
+# Read replicas: DJANGO_DB_REPLICAS is a comma-separated list of SQLite files
+# kept in sync by `manage.py replicate_database`. Views marked @replica_reads
+# read from them (newpwork_backend_new/db_router.py); writes stay on default.
+DATABASE_REPLICAS = []
+for _path in filter(None, (part.strip() for part in os.getenv("DJANGO_DB_REPLICAS", "").split(","))):
+    DATABASE_REPLICAS.append(f"replica{len(DATABASE_REPLICAS) + 1}")
+    DATABASES[DATABASE_REPLICAS[-1]] = {**DATABASES['default'], 'NAME': _path, 'TEST': {'MIRROR': 'default'}}
+DATABASE_ROUTERS = ["newpwork_backend_new.db_router.ReplicaRouter"]
+# Seconds a user's reads stay on the primary after they write; keep it above
+# the replication interval. The cache must be shared across workers
+# (CACHE_REDIS_URL), or a write only pins the worker that handled it.
+DATABASE_REPLICA_PIN_SECONDS = int(os.getenv("DATABASE_REPLICA_PIN_SECONDS", "10"))
+DATABASE_REPLICA_PIN_CACHE = "default"
+
+
+# Password hashing. DJANGO_PASSWORD_HASHER=argon2 (needs argon2-cffi) makes
+# Argon2 the preferred hasher; other hashes keep working and are upgraded on
+# the user's next login. login/register hash in a process pool with a bounded
+# queue and answer 503 beyond it (accounts/hashing.py).
+PASSWORD_HASHER_PROFILES = {
+    "pbkdf2": "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "argon2": "accounts.hashing.Argon2PasswordHasher",
 }
+PASSWORD_HASHER = PASSWORD_HASHER_PROFILES[os.getenv("DJANGO_PASSWORD_HASHER", "pbkdf2")]
+PASSWORD_HASHERS = [PASSWORD_HASHER] + [
+    path
+    for path in [
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+        "accounts.hashing.Argon2PasswordHasher",
+        "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+        "django.contrib.auth.hashers.ScryptPasswordHasher",
+    ]
+    if path != PASSWORD_HASHER
+]
 
+PASSWORD_HASHING = {
+    "WORKERS": int(os.getenv("PASSWORD_HASH_WORKERS", "2")),
+    "MAX_PENDING": int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32")),
+    "TIMEOUT": 10,
+    "RETRY_AFTER": 1,
+    # OWASP's minimum for Argon2id: 19 MiB, 2 passes, 1 lane
+    "ARGON2": {
+        "time_cost": int(os.getenv("ARGON2_TIME_COST", "2")),
+        "memory_cost": int(os.getenv("ARGON2_MEMORY_COST", "19456")),
+        "parallelism": int(os.getenv("ARGON2_PARALLELISM", "1")),
+    },
+}
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -174,4 +351,35 @@ AUTH_USER_MODEL = 'accounts.User'
 
 # File upload settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
-DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
\ No newline at end of file
+DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
+# KYC documents are streamed to disk in chunks of this size (accounts/uploads.py)
+KYC_UPLOAD_CHUNK_SIZE = 64 * 1024  # 64KB
+# Review-queue previews of KYC images (accounts/previews.py); 0 workers renders inline
+KYC_PREVIEW_SIZE = (320, 320)
+KYC_PREVIEW_QUALITY = 70
+KYC_PREVIEW_WORKERS = int(os.getenv("KYC_PREVIEW_WORKERS", "2"))
+
+# Per-request SQL instrumentation (newpwork_backend_new/querybudget.py).
+# X-DB-* headers are only sent outside production; over-budget requests
+# raise under TEST_RUNNER (or with QUERY_BUDGET_ENFORCE=1).
+QUERY_BUDGET_HEADERS = DEBUG
+QUERY_BUDGET_ENFORCE = os.getenv("QUERY_BUDGET_ENFORCE", "") == "1"
+TEST_RUNNER = "newpwork_backend_new.test_runner.QueryBudgetTestRunner"
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "query_stats": {"()": "newpwork_backend_new.querybudget.QueryStatsFormatter"},
+    },
+    "handlers": {
+        "query_stats": {"class": "logging.StreamHandler", "formatter": "query_stats"},
+    },
+    "loggers": {
+        "newpwork.queries": {
+            "handlers": ["query_stats"],
+            "level": os.getenv("QUERY_LOG_LEVEL", "WARNING"),
+            "propagate": False,
+        },
+    },
+}
@@ -0,0 +1,71 @@
+"""
+Streaming JSON array responses for list endpoints.
+
+``?stream=1`` on a list endpoint returns the whole (unpaginated) result as
+one JSON array that is produced while it is sent: rows are read with
+``QuerySet.iterator(chunk_size)``, serialized a chunk at a time and written
+out, so memory use depends on the chunk size, not on the number of rows.
+
+Because the status line goes out before the rows are read, an error half
+way through truncates the body instead of turning into a 500.
+"""
+
+import itertools
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+from .renderers import ORJSONRenderer
+
+STREAM_PARAM = "stream"
+
+
+def wants_stream(request) -> bool:
+    return request.GET.get(STREAM_PARAM, "").lower() in ("1", "true", "yes")
+
+
+def get_chunk_size() -> int:
+    return getattr(settings, "API_STREAM_CHUNK_SIZE", 500)
+
+
+def iter_json_array(queryset, serializer_class, context=None, chunk_size=None):
+    """Yield ``queryset`` serialized as a JSON array, one chunk of rows at a time."""
+    chunk_size = chunk_size or get_chunk_size()
+    renderer = ORJSONRenderer()
+    rows = queryset.iterator(chunk_size=chunk_size)
+
+    yield b"["
+    separator = b""
+    while chunk := list(itertools.islice(rows, chunk_size)):
+        # Render the chunk as an array and drop its brackets
+        body = renderer.render(serializer_class(chunk, many=True, context=context).data)[1:-1]
+        yield separator + body
+        separator = b","
+    yield b"]"
+
+
+async def aiter_json_array(queryset, serializer_class, context=None, chunk_size=None):
+    """``iter_json_array`` on the async ORM, for responses served under ASGI."""
+    chunk_size = chunk_size or get_chunk_size()
+    renderer = ORJSONRenderer()
+
+    yield b"["
+    separator = b""
+    chunk = []
+    async for row in queryset.aiterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield separator + renderer.render(serializer_class(chunk, many=True, context=context).data)[1:-1]
+            separator = b","
+            chunk = []
+    if chunk:
+        yield separator + renderer.render(serializer_class(chunk, many=True, context=context).data)[1:-1]
+    yield b"]"
+
+
+def streaming_json_response(queryset, serializer_class, context=None, chunk_size=None, asynchronous=False):
+    iterate = aiter_json_array if asynchronous else iter_json_array
+    return StreamingHttpResponse(
+        iterate(queryset, serializer_class, context, chunk_size),
+        content_type="application/json",
+    )
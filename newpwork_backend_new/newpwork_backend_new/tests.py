@@ -0,0 +1,401 @@
+from decimal import Decimal
+from unittest import mock
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.core.cache import caches
+from django.test import AsyncClient, Client, TestCase, override_settings
+from django.utils import timezone
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+from accounts.models import KYCVerification, User, UserRole
+from accounts.principal_cache import principal_cache
+from accounts.revocation import revocation_list
+from accounts.token_cache import token_cache
+from accounts.tokens import issue_tokens
+from bookings.models import Booking
+from clients.models import ClientFavorite, ClientPreferences
+from services.models import Service, ServiceCategory
+from services.response_cache import response_cache
+from .pagination import encode_cursor
+from .querybudget import record_queries
+
+# url name -> (method, actor, {url kwarg: fixture attribute}, body). Every URL
+# whose view declares a @query_budget must be listed.
+BUDGETED_REQUESTS = {
+    "list_services": ("get", None, {}, None),
+    "list_categories": ("get", None, {}, None),
+    "service_detail": ("get", None, {"service_id": "service"}, None),
+    "my_services": ("get", "provider", {}, None),
+    "create_service": ("post", "provider", {}, {"title": "Drain cleaning", "description": "Drains", "base_price": "80.00", "category": "category"}),
+    "update_service": ("patch", "provider", {"service_id": "service"}, {"title": "Leak repair"}),
+    "create_booking": ("post", "customer", {}, {"service": "service", "notes": "Kitchen sink"}),
+    "my_bookings": ("get", "customer", {}, None),
+    "update_booking_status": ("patch", "provider", {"booking_id": "pending_booking"}, {"status": "confirmed"}),
+    "rate_booking": ("patch", "customer", {"booking_id": "completed_booking"}, {"rating": 5, "review": "Quick"}),
+    "stats": ("get", "admin", {}, None),
+    "user_stats": ("get", "customer", {}, None),
+    "auth_metrics": ("get", "admin", {}, None),
+    "get_kyc_status": ("get", "provider", {}, None),
+    "list_pending_kyc": ("get", "admin", {}, None),
+    "client_profile": ("get", "customer", {}, None),
+    "favorites": ("get", "customer", {}, None),
+    "preferences": ("get", "customer", {}, None),
+}
+
+
+def budgeted_views(patterns=None, found=None):
+    """``{url name: budget}`` for every URL whose view has a ``@query_budget``."""
+    found = {} if found is None else found
+    for pattern in get_resolver().url_patterns if patterns is None else patterns:
+        if isinstance(pattern, URLResolver):
+            budgeted_views(pattern.url_patterns, found)
+        elif isinstance(pattern, URLPattern) and hasattr(pattern.callback, "query_budget"):
+            found[pattern.name] = pattern.callback.query_budget
+    return found
+
+
+def kyc_submission(user, status):
+    return KYCVerification.objects.create(
+        user=user,
+        photo="kyc/photos/photo.png",
+        citizenship="kyc/citizenship/citizenship.png",
+        full_name=user.username,
+        address="Kathmandu",
+        phone_number="9800000000",
+        email=user.email,
+        status=status,
+    )
+
+
+@override_settings(QUERY_BUDGET_ENFORCE=True)
+class QueryBudgetTests(TestCase):
+    """Each budgeted view, requested with enforcement on, stays within its budget."""
+
+    @classmethod
+    def setUpTestData(cls):
+        def user(name, role):
+            return User.objects.create(username=name, email=f"{name}@example.com", role=role)
+
+        cls.admin = user("admin", UserRole.ADMIN)
+        cls.customer = user("customer", UserRole.CUSTOMER)
+        cls.provider = user("provider", UserRole.PROVIDER)
+        kyc_submission(cls.provider, KYCVerification.Status.APPROVED)
+        kyc_submission(user("applicant", UserRole.PROVIDER), KYCVerification.Status.PENDING)
+
+        cls.category = ServiceCategory.objects.create(name="Plumbing", slug="plumbing")
+        cls.service = Service.objects.create(
+            provider=cls.provider,
+            category=cls.category,
+            title="Pipe fitting",
+            slug="pipe-fitting",
+            description="Pipes",
+            base_price=Decimal("100.00"),
+        )
+        cls.pending_booking = Booking.objects.create(service=cls.service, customer=cls.customer)
+        cls.completed_booking = Booking.objects.create(
+            service=cls.service, customer=cls.customer, status=Booking.Status.COMPLETED
+        )
+        ClientFavorite.objects.create(client=cls.customer, service=cls.service)
+        ClientPreferences.objects.create(client=cls.customer)
+
+    def setUp(self):
+        # Process-wide caches outlive each test's rollback
+        for cache in (principal_cache, token_cache, response_cache):
+            cache.clear()
+        caches["default"].clear()
+
+    def resolve(self, value):
+        return getattr(self, value).pk if isinstance(value, str) and hasattr(self, value) else value
+
+    def test_every_budgeted_view_is_requested(self):
+        self.assertEqual(set(budgeted_views()) - set(BUDGETED_REQUESTS), set())
+
+    def test_views_stay_within_their_budget(self):
+        budgets = budgeted_views()
+        for name, (method, actor, kwargs, body) in BUDGETED_REQUESTS.items():
+            with self.subTest(view=name):
+                url = reverse(name, kwargs={key: self.resolve(value) for key, value in kwargs.items()})
+                headers = {}
+                if actor:
+                    headers["HTTP_AUTHORIZATION"] = f"Bearer {issue_tokens(getattr(self, actor))['token']}"
+                if body is not None:
+                    body = {key: self.resolve(value) for key, value in body.items()}
+                    headers["content_type"] = "application/json"
+                # Its periodic refresh is not part of any one request
+                revocation_list._refresh()
+
+                with record_queries() as recorder:
+                    response = getattr(self.client, method)(url, body, **headers)
+                self.assertLess(response.status_code, 300, response.content)
+                recorder.assert_at_most(budgets[name], name)
+
+
+# The first booking also creates the customer's profile; budgets are covered above
+@override_settings(QUERY_BUDGET_ENFORCE=False)
+class MiddlewareDispatchTests(TestCase):
+    """Bearer-token API requests skip the auth/messages middleware; nothing else does."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create(username="customer", email="customer@example.com", role=UserRole.CUSTOMER)
+        provider = User.objects.create(username="provider", email="provider@example.com", role=UserRole.PROVIDER)
+        category = ServiceCategory.objects.create(name="Plumbing", slug="plumbing")
+        cls.service = Service.objects.create(
+            provider=provider,
+            category=category,
+            title="Pipe fitting",
+            slug="pipe-fitting",
+            description="Pipes",
+            base_price=Decimal("100.00"),
+        )
+
+    def setUp(self):
+        for cache in (principal_cache, token_cache, response_cache):
+            cache.clear()
+        self.bearer = {"HTTP_AUTHORIZATION": f"Bearer {issue_tokens(self.customer)['token']}"}
+
+    def assertLean(self, response, lean):
+        request = response.wsgi_request if hasattr(response, "wsgi_request") else response.asgi_request
+        self.assertIs(request.lean_middleware, lean)
+        # Set by MessageMiddleware, which lean requests skip
+        self.assertIs(hasattr(request, "_messages"), not lean)
+
+    def test_bearer_api_request_is_lean(self):
+        response = self.client.get("/api/accounts/user-stats/", **self.bearer)
+        self.assertEqual(response.status_code, 200)
+        self.assertLean(response, True)
+
+    async def test_bearer_api_request_is_lean_under_asgi(self):
+        token = self.bearer["HTTP_AUTHORIZATION"]
+        response = await AsyncClient().get("/api/accounts/user-stats/", headers={"Authorization": token})
+        self.assertEqual(response.status_code, 200)
+        self.assertLean(response, True)
+
+    def test_other_requests_get_the_full_stack(self):
+        requests = {
+            "admin": ("/admin/login/", {}),
+            "admin with a bearer token": ("/admin/login/", self.bearer),
+            "anonymous api": ("/api/services/services/", {}),
+        }
+        for label, (path, headers) in requests.items():
+            with self.subTest(label):
+                response = self.client.get(path, **headers)
+                self.assertEqual(response.status_code, 200)
+                self.assertLean(response, False)
+
+    def test_session_requests_are_csrf_checked(self):
+        client = Client(enforce_csrf_checks=True)
+        response = client.post("/admin/login/", {"username": "customer", "password": "x"})
+        self.assertEqual(response.status_code, 403)
+
+        client.force_login(self.customer)
+        response = client.post("/api/bookings/create/", {"service": self.service.pk}, content_type="application/json")
+        self.assertEqual(response.status_code, 403)
+        self.assertIn("CSRF", response.json()["detail"])
+
+    def test_bearer_requests_need_no_csrf_token(self):
+        client = Client(enforce_csrf_checks=True)
+        response = client.post(
+            "/api/bookings/create/", {"service": self.service.pk}, content_type="application/json", **self.bearer
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertLean(response, True)
+
+
+class PaginationTests(TestCase):
+    """Keyset pages over the service catalog, whose sort keys are all tied here."""
+
+    @classmethod
+    def setUpTestData(cls):
+        provider = User.objects.create(username="provider", email="provider@example.com", role=UserRole.PROVIDER)
+        category = ServiceCategory.objects.create(name="Plumbing", slug="plumbing")
+        for n in range(25):
+            Service.objects.create(
+                provider=provider,
+                category=category,
+                title="Pipe repair",
+                slug=f"pipe-repair-{n}",
+                description="Pipes",
+                base_price=Decimal("100.00"),
+            )
+        # Same rating, credentials and creation time: only the id breaks the tie
+        Service.objects.update(created_at=timezone.now())
+        cls.ids = set(Service.objects.values_list("pk", flat=True))
+
+    def setUp(self):
+        # Measure the paging, not the catalog response cache
+        patcher = mock.patch.object(response_cache, "enabled", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get(self, query):
+        response = self.client.get(f"/api/services/services/?{query}")
+        self.assertEqual(response.status_code, 200, response.content)
+        return response
+
+    def walk(self, query):
+        """Ids of every page reached by following ``X-Next-Cursor`` from the first."""
+        pages, cursor = [], ""
+        while True:
+            response = self.get(f"{query}&cursor={cursor}")
+            pages.append([row["id"] for row in response.json()])
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                return pages
+            self.assertIn('rel="next"', response.headers["Link"])
+
+    def test_walk_visits_every_row_once(self):
+        for label, query in (("list", "page_size=4"), ("search", "q=pipe&page_size=4")):
+            with self.subTest(label):
+                pages = self.walk(query)
+                self.assertEqual([len(page) for page in pages], [4] * 6 + [1])
+                ids = [pk for page in pages for pk in page]
+                self.assertEqual(len(ids), len(set(ids)))
+                self.assertEqual(set(ids), self.ids)
+                # Same order as the unpaged list
+                self.assertEqual(ids, [row["id"] for row in self.get(query.replace("page_size=4", "")).json()])
+
+    def test_requests_without_paging_parameters_get_every_row(self):
+        response = self.get("")
+        self.assertEqual(len(response.json()), 25)
+        self.assertNotIn("X-Next-Cursor", response.headers)
+        self.assertNotIn("Link", response.headers)
+
+    @override_settings(API_PAGE_SIZE=5, API_MAX_PAGE_SIZE=10)
+    def test_page_size_is_clamped(self):
+        cases = {
+            "cursor=": 5,
+            "page_size=3": 3,
+            "limit=3": 3,
+            "page_size=1000": 10,
+            "limit=1000": 10,
+            "page_size=0": 5,
+            "page_size=-2": 5,
+            "page_size=many": 5,
+        }
+        for query, expected in cases.items():
+            with self.subTest(query):
+                self.assertEqual(len(self.get(query).json()), expected)
+
+    def test_invalid_cursor_is_a_400(self):
+        cursors = {
+            "not base64": "!!!",
+            "not json": "bm90IGpzb24",
+            "not a list": "eyJhIjoxfQ",
+            "wrong length": encode_cursor([1, 2]),
+            "wrong types": encode_cursor(["high", "yes", "today", "first"]),
+        }
+        for label, cursor in cursors.items():
+            with self.subTest(label):
+                response = self.client.get(f"/api/services/services/?cursor={cursor}")
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()["detail"], "Invalid cursor.")
+
+
+class AsyncViewParityTests(TestCase):
+    """The async views served under ASGI answer exactly like their ``@api_view`` versions."""
+
+    HEADERS = ("Content-Type", "Vary", "Link", "X-Next-Cursor", "WWW-Authenticate")
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create(username="customer", email="customer@example.com", role=UserRole.CUSTOMER)
+        cls.provider = User.objects.create(username="provider", email="provider@example.com", role=UserRole.PROVIDER)
+        category = ServiceCategory.objects.create(name="Plumbing", slug="plumbing")
+        ServiceCategory.objects.create(name="Wiring", slug="wiring")
+        cls.services = [
+            Service.objects.create(
+                provider=cls.provider,
+                category=category,
+                title=f"Pipe repair {n}",
+                slug=f"pipe-repair-{n}",
+                description="Pipes",
+                base_price=Decimal("100.00"),
+            )
+            for n in range(5)
+        ]
+        for service in cls.services[:3]:
+            Booking.objects.create(
+                service=service, customer=cls.customer, status=Booking.Status.COMPLETED, rating=4, review="Fine"
+            )
+
+    def setUp(self):
+        for cache in (principal_cache, token_cache):
+            cache.clear()
+        # Compare the views, not the catalog response cache they share
+        patcher = mock.patch.object(response_cache, "enabled", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def bearer(self, user):
+        return {"Authorization": f"Bearer {issue_tokens(user)['token']}"}
+
+    def assertSameResponse(self, method, path, headers=None, client=None, async_client=None):
+        client = client or self.client
+        async_client = async_client or self.async_client
+        sync = getattr(client, method)(path, headers=headers)
+        with self.settings(ROOT_URLCONF="newpwork_backend_new.asgi_urls"):
+            response = async_to_sync(getattr(async_client, method))(path, headers=headers)
+            # Resolved lazily, against the URLconf in effect
+            self.assertTrue(iscoroutinefunction(response.resolver_match.func), path)
+        self.assertFalse(iscoroutinefunction(sync.resolver_match.func), path)
+
+        self.assertEqual(response.status_code, sync.status_code, response.content)
+        self.assertEqual(response.content, sync.content)
+        for name in self.HEADERS:
+            self.assertEqual(response.headers.get(name), sync.headers.get(name), name)
+        # @api_view lists them in set order
+        self.assertEqual(self.allowed(response), self.allowed(sync))
+        return response
+
+    def allowed(self, response):
+        return set(response["Allow"].split(", "))
+
+    def test_catalog(self):
+        paths = [
+            "/api/services/services/",
+            "/api/services/services/?page_size=2",
+            "/api/services/services/?q=pipe&page_size=2",
+            "/api/services/services/?q=nothing",
+            "/api/services/categories/?cursor=",
+            f"/api/services/services/{self.services[0].pk}/detail/",
+            "/api/services/services/0/detail/",
+        ]
+        for path in paths:
+            with self.subTest(path):
+                self.assertSameResponse("get", path)
+
+    def test_cursor_from_either_path_works_on_the_other(self):
+        response = self.assertSameResponse("get", "/api/services/services/?page_size=2")
+        self.assertSameResponse("get", f"/api/services/services/?page_size=2&cursor={response['X-Next-Cursor']}")
+
+    def test_my_bookings(self):
+        for user in (self.customer, self.provider):
+            for path in ("/api/bookings/mine/", "/api/bookings/mine/?page_size=2"):
+                with self.subTest(user=user.username, path=path):
+                    response = self.assertSameResponse("get", path, self.bearer(user))
+                    self.assertEqual(len(response.json()), 3 if "page_size" not in path else 2)
+
+    def test_unauthenticated_is_a_401(self):
+        for headers in (None, {"Authorization": "Bearer not-a-token"}):
+            with self.subTest(headers=headers):
+                response = self.assertSameResponse("get", "/api/bookings/mine/", headers)
+                self.assertEqual(response.status_code, 401)
+
+    def test_session_post_without_csrf_token_is_a_403(self):
+        client, async_client = Client(enforce_csrf_checks=True), AsyncClient(enforce_csrf_checks=True)
+        client.force_login(self.customer)
+        async_client.force_login(self.customer)
+        response = self.assertSameResponse("post", "/api/bookings/mine/", client=client, async_client=async_client)
+        self.assertEqual(response.status_code, 403)
+
+    def test_other_methods_are_a_405(self):
+        for method, path, headers in (
+            ("post", "/api/services/services/", None),
+            ("delete", f"/api/services/services/{self.services[0].pk}/detail/", None),
+            ("put", "/api/bookings/mine/", self.bearer(self.customer)),
+        ):
+            with self.subTest(method=method, path=path):
+                response = self.assertSameResponse(method, path, headers)
+                self.assertEqual(response.status_code, 405)
+                self.assertEqual(self.allowed(response), {"GET", "OPTIONS"})
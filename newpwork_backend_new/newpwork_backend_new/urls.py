@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from accounts.views import jwks
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -9,6 +10,7 @@ urlpatterns = [
     path('api/services/', include('services.urls')),
     path("api/accounts/", include("accounts.urls")),
     path("api/clients/", include("clients.urls")),
+    path(".well-known/jwks.json", jwks, name="jwks"),
 ]
 
 # Serve media files in development
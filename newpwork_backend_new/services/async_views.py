@@ -0,0 +1,58 @@
+"""Async versions of the public catalog views, served under ASGI (see asgi_urls)."""
+
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+from newpwork_backend_new.async_views import async_api_view
+from newpwork_backend_new.db_router import replica_reads
+from newpwork_backend_new.pagination import apaginate_queryset
+from newpwork_backend_new.querybudget import query_budget
+from newpwork_backend_new.streaming import wants_stream
+from .category_serializers import ServiceCategorySerializer
+from .category_views import categories_queryset
+from .response_cache import cache_response, category_list_tags, service_list_tags, service_tags
+from .service_models import Service
+from .service_serializers import ServiceSerializer
+from .service_views import catalog_queryset, detail_queryset, hydrate_services, stream_services
+
+
+@query_budget(5)
+@async_api_view(["GET"], [AllowAny])
+@cache_response("list_services", service_list_tags)
+@replica_reads
+async def list_services(request):
+    """Async ``service_views.list_services``."""
+    queryset, ordering = catalog_queryset(request)
+
+    if wants_stream(request):
+        return stream_services(queryset, ordering, asynchronous=True)
+
+    page, headers = await apaginate_queryset(request, queryset, ordering, hydrate=hydrate_services)
+    serializer = ServiceSerializer(page, many=True)
+    return Response(serializer.data, headers=headers)
+
+
+@query_budget(3)
+@async_api_view(["GET"], [AllowAny])
+@cache_response("service_detail", service_tags)
+@replica_reads
+async def service_detail(request, service_id: int):
+    """Async ``service_views.service_detail``."""
+    try:
+        service = await detail_queryset().aget(id=service_id)
+    except Service.DoesNotExist:
+        return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+    serializer = ServiceSerializer(service)
+    return Response(serializer.data)
+
+
+@query_budget(3)
+@async_api_view(["GET"], [AllowAny])
+@cache_response("list_categories", category_list_tags)
+@replica_reads
+async def list_categories(request):
+    """Async ``category_views.list_categories``."""
+    categories, headers = await apaginate_queryset(request, categories_queryset(), ["name"])
+    serializer = ServiceCategorySerializer(categories, many=True)
+    return Response(serializer.data, headers=headers)
@@ -11,6 +11,8 @@ class ServiceCategorySerializer(serializers.ModelSerializer):
         fields = ["id", "name", "slug", "description", "service_count"]
 
     def get_service_count(self, obj):
+        if hasattr(obj, "active_service_count"):
+            return obj.active_service_count
         return Service.objects.filter(category=obj, is_active=True).count()
 
 
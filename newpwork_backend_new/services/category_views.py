@@ -1,16 +1,30 @@
+from django.db.models import Count, Q
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from .category_models import ServiceCategory
 from .category_serializers import ServiceCategorySerializer
+from .response_cache import cache_response, category_list_tags
+from newpwork_backend_new.pagination import paginate_queryset
+from newpwork_backend_new.db_router import replica_reads
+from newpwork_backend_new.querybudget import query_budget
 
 
+def categories_queryset():
+    return ServiceCategory.objects.annotate(
+        active_service_count=Count("services", filter=Q(services__is_active=True))
+    )
+
+
+@query_budget(3)
 @api_view(["GET"])
 @permission_classes([AllowAny])
+@cache_response("list_categories", category_list_tags)
+@replica_reads
 def list_categories(request):
     """Return all service categories."""
-    categories = ServiceCategory.objects.all()
+    categories, headers = paginate_queryset(request, categories_queryset(), ["name"])
     serializer = ServiceCategorySerializer(categories, many=True)
-    return Response(serializer.data)
+    return Response(serializer.data, headers=headers)
 
 
@@ -0,0 +1,296 @@
+import itertools
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from accounts import stats as dashboard_stats
+from accounts.models import KYCStatus, KYCVerification, User, UserRole
+from bookings.models import Booking
+from clients.models import ClientFavorite, ClientPreferences
+from services.category_models import ServiceCategory
+from services.service_models import Service
+
+CATEGORIES = [
+    "Home Services", "Tech Services", "Creative Services", "Professional Services",
+    "Beauty & Wellness", "Tutoring", "Events", "Moving & Delivery",
+    "Automotive", "Health & Fitness", "Pet Care", "Repairs",
+]
+SKILLS = [
+    "Plumbing", "Electrical Repair", "Web Development", "Logo Design", "House Cleaning",
+    "Photography", "Math Tutoring", "Yoga Classes", "Car Wash", "Dog Walking",
+    "Catering", "Interior Painting", "Tax Consulting", "Video Editing", "Guitar Lessons",
+    "Mobile Repair", "Gardening", "Event Planning", "Hair Styling", "Translation",
+]
+ADJECTIVES = ["Affordable", "Professional", "Express", "Premium", "Friendly", "Reliable", "Expert", "Same-day"]
+LOCATIONS = ["Kathmandu", "Lalitpur", "Bhaktapur", "Pokhara", "Biratnagar", "Chitwan", "Butwal", "Dharan", "Remote"]
+REVIEWS = [
+    "Great work, would book again.",
+    "On time and very professional.",
+    "Good value for the price.",
+    "Decent service but arrived late.",
+    "Not what I expected.",
+    "Excellent attention to detail!",
+    "Friendly and quick.",
+]
+# (status, weight) for generated bookings
+STATUS_WEIGHTS = [
+    (Booking.Status.COMPLETED, 55),
+    (Booking.Status.CONFIRMED, 15),
+    (Booking.Status.PENDING, 15),
+    (Booking.Status.CANCELLED, 15),
+]
+KYC_WEIGHTS = [(KYCStatus.APPROVED, 70), (KYCStatus.PENDING, 20), (KYCStatus.REJECTED, 10)]
+
+
+@contextmanager
+def manual_timestamps(*models):
+    """Let bulk_create keep the created_at/updated_at values we assign."""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    help = 'Bulk-generate a large, deterministic data set (users, services, bookings, ...) for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--customers', type=int, default=10000, help='Customer accounts (default: 10000)')
+        parser.add_argument('--providers', type=int, default=1000, help='Provider accounts (default: 1000)')
+        parser.add_argument('--kyc', type=int, default=None,
+                            help='Providers with a KYC submission (default: all providers)')
+        parser.add_argument('--services', type=int, default=5000, help='Services (default: 5000)')
+        parser.add_argument('--bookings', type=int, default=200000, help='Bookings (default: 200000)')
+        parser.add_argument('--favorites', type=int, default=20000, help='Favorites (default: 20000)')
+        parser.add_argument('--preferences', type=int, default=None,
+                            help='Customers with saved preferences (default: half of the customers)')
+        parser.add_argument('--skew', type=float, default=1.1,
+                            help='Zipf exponent for service popularity; 0 = uniform (default: 1.1)')
+        parser.add_argument('--days', type=int, default=365, help='Spread created_at over this many days (default: 365)')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed (default: 1)')
+        parser.add_argument('--prefix', default='load', help='Prefix for generated usernames, emails and slugs')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per INSERT (default: 5000)')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.prefix = f"{options['prefix']}{options['seed']}"
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.span = timedelta(days=options['days']).total_seconds()
+        kyc = options['providers'] if options['kyc'] is None else min(options['kyc'], options['providers'])
+        preferences = options['customers'] // 2 if options['preferences'] is None else options['preferences']
+
+        with manual_timestamps(User, KYCVerification, Service, Booking, ClientFavorite, ClientPreferences):
+            categories = self.create_categories()
+            customers = self.create_users(UserRole.CUSTOMER, options['customers'], kyc=0)
+            providers = self.create_users(UserRole.PROVIDER, options['providers'], kyc=kyc)
+            self.create_kyc(providers[:kyc])
+            services = self.create_services(options['services'], providers, categories)
+            self.create_bookings(options['bookings'], services, customers, options['skew'])
+            self.create_favorites(options['favorites'], services, customers, options['skew'])
+            self.create_preferences(customers[:preferences], categories)
+
+        # bulk_create skips the signals that maintain derived columns
+        call_command('rebuild_service_rankings', batch_size=self.batch_size, stdout=self.stdout)
+        call_command('reconcile_client_totals', batch_size=self.batch_size, stdout=self.stdout)
+        dashboard_stats.invalidate()
+        self.stdout.write(self.style.SUCCESS('Load data generated'))
+
+    # -- helpers ---------------------------------------------------------
+
+    def timestamp(self, after=None):
+        start = after or self.now - timedelta(seconds=self.span)
+        return start + (self.now - start) * self.rng.random()
+
+    def weighted(self, weights, k):
+        values, cum = zip(*itertools.accumulate(weights, lambda acc, item: (item[0], acc[1] + item[1])))
+        return self.rng.choices(values, cum_weights=cum, k=k)
+
+    def popularity(self, items, skew):
+        """Cumulative Zipf weights over ``items`` in a shuffled order."""
+        ranked = list(items)
+        self.rng.shuffle(ranked)
+        cum = list(itertools.accumulate(1 / (rank ** skew) for rank in range(1, len(ranked) + 1)))
+        return ranked, cum
+
+    def insert(self, model, objects, label):
+        created = []
+        total = 0
+        for batch in batched(objects, self.batch_size):
+            with transaction.atomic():
+                created.extend(obj.pk for obj in model.objects.bulk_create(batch))
+            total += len(batch)
+            self.stdout.write(f"Created {total} {label}")
+        return created
+
+    # -- generators ------------------------------------------------------
+
+    def create_categories(self):
+        categories = []
+        for name in CATEGORIES:
+            category, _ = ServiceCategory.objects.get_or_create(
+                name=name, defaults={"slug": slugify(name), "description": f"{name} offered near you"}
+            )
+            categories.append(category.pk)
+        return categories
+
+    def create_users(self, role, count, kyc):
+        password = make_password("loadtest")
+        kyc_statuses = self.weighted(KYC_WEIGHTS, kyc)
+        tag = "c" if role == UserRole.CUSTOMER else "p"
+
+        def build():
+            for i in range(count):
+                kyc_status = kyc_statuses[i] if i < kyc else KYCStatus.NOT_SUBMITTED
+                username = f"{self.prefix}-{tag}{i}"
+                yield User(
+                    username=username,
+                    email=f"{username}@example.com",
+                    password=password,
+                    role=role,
+                    display_name=f"{role.label} {i}",
+                    date_joined=self.timestamp(),
+                    kyc_status=kyc_status,
+                    is_kyc_verified=kyc_status == KYCStatus.APPROVED,
+                )
+
+        return self.insert(User, build(), f"{role}s")
+
+    def create_kyc(self, provider_ids):
+        statuses = dict(User.objects.filter(pk__in=provider_ids).values_list("pk", "kyc_status"))
+
+        def build():
+            for user_id in provider_ids:
+                created_at = self.timestamp()
+                kyc_status = statuses[user_id]
+                yield KYCVerification(
+                    user_id=user_id,
+                    photo="kyc/photos/loadtest.png",
+                    citizenship="kyc/citizenship/loadtest.pdf",
+                    full_name=f"Provider {user_id}",
+                    address=self.rng.choice(LOCATIONS),
+                    phone_number=f"98{self.rng.randrange(10**8):08d}",
+                    email=f"kyc{user_id}@example.com",
+                    status=kyc_status,
+                    verified_at=None if kyc_status == KYCStatus.PENDING else created_at,
+                    created_at=created_at,
+                    updated_at=created_at,
+                )
+
+        self.insert(KYCVerification, build(), "KYC submissions")
+
+    def create_services(self, count, providers, categories):
+        def build():
+            for i in range(count):
+                title = f"{self.rng.choice(ADJECTIVES)} {self.rng.choice(SKILLS)}"
+                location = self.rng.choice(LOCATIONS)
+                certified = self.rng.random() < 0.3
+                created_at = self.timestamp()
+                yield Service(
+                    provider_id=self.rng.choice(providers),
+                    category_id=self.rng.choice(categories),
+                    title=title,
+                    slug=f"{self.prefix}-{slugify(title)}-{i}",
+                    description=f"{title} in {location}. Experienced, insured and available on weekends.",
+                    base_price=Decimal(self.rng.randrange(500, 50000, 50)),
+                    pricing_type=self.rng.choice(Service.PricingType.values),
+                    location=location,
+                    certificates="Certified professional" if certified else "",
+                    has_credentials=certified,
+                    is_active=self.rng.random() < 0.95,
+                    created_at=created_at,
+                    updated_at=created_at,
+                )
+
+        return self.insert(Service, build(), "services")
+
+    def create_bookings(self, count, services, customers, skew):
+        ranked, cum = self.popularity(services, skew)
+        service_rows = Service.objects.filter(pk__in=services).values_list("pk", "created_at", "base_price")
+        created = {pk: created_at for pk, created_at, _ in service_rows}
+        prices = {pk: base_price for pk, _, base_price in service_rows}
+        # Each service gets a typical rating so averages differ between services
+        quality = {pk: self.rng.uniform(2.5, 5.0) for pk in services}
+
+        def build():
+            for chunk in batched(range(count), self.batch_size):
+                picked = self.rng.choices(ranked, cum_weights=cum, k=len(chunk))
+                statuses = self.weighted(STATUS_WEIGHTS, len(chunk))
+                for service_id, booking_status in zip(picked, statuses):
+                    created_at = self.timestamp(created[service_id])
+                    rating, review = None, ""
+                    if booking_status == Booking.Status.COMPLETED and self.rng.random() < 0.7:
+                        rating = min(5, max(1, round(self.rng.gauss(quality[service_id], 0.8))))
+                        if self.rng.random() < 0.6:
+                            review = self.rng.choice(REVIEWS)
+                    yield Booking(
+                        service_id=service_id,
+                        customer_id=self.rng.choice(customers),
+                        status=booking_status,
+                        scheduled_for=created_at + timedelta(days=self.rng.randint(1, 30)),
+                        rating=rating,
+                        review=review,
+                        price=prices[service_id],
+                        created_at=created_at,
+                        updated_at=created_at,
+                    )
+
+        self.insert(Booking, build(), "bookings")
+
+    def create_favorites(self, count, services, customers, skew):
+        ranked, cum = self.popularity(services, skew)
+        count = min(count, len(services) * len(customers))
+
+        def build():
+            seen = set()
+            while len(seen) < count:
+                pair = (self.rng.choice(customers), self.rng.choices(ranked, cum_weights=cum)[0])
+                if pair in seen:
+                    continue
+                seen.add(pair)
+                yield ClientFavorite(client_id=pair[0], service_id=pair[1], created_at=self.timestamp())
+
+        self.insert(ClientFavorite, build(), "favorites")
+
+    def create_preferences(self, customer_ids, categories):
+        def build():
+            for user_id in customer_ids:
+                created_at = self.timestamp()
+                yield ClientPreferences(
+                    client_id=user_id,
+                    default_search_radius=self.rng.choice([5, 10, 25, 50]),
+                    items_per_page=self.rng.choice([12, 12, 12, 24, 48]),
+                    created_at=created_at,
+                    updated_at=created_at,
+                )
+
+        preference_ids = self.insert(ClientPreferences, build(), "preferences")
+        through = ClientPreferences.preferred_categories.through
+        links = (
+            through(clientpreferences_id=pk, servicecategory_id=category)
+            for pk in preference_ids
+            for category in self.rng.sample(categories, self.rng.randint(0, 3))
+        )
+        self.insert(through, links, "preferred categories")
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from services.search import fts_enabled, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for services (SQLite FTS5)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Number of services indexed per transaction (default: 5000)',
+        )
+
+    def handle(self, *args, **options):
+        if not fts_enabled():
+            self.stdout.write('Full-text index is only used on SQLite; nothing to do.')
+            return
+        total = 0
+        for indexed in rebuild_search_index(batch_size=options['batch_size']):
+            total += indexed
+            self.stdout.write(f"Indexed {total} services")
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt search index for {total} services'))
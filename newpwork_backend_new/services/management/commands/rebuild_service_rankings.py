@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from services.ranking import rebuild_service_rankings
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored rating columns used to rank services'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of services updated per statement (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        for updated in rebuild_service_rankings(batch_size=options['batch_size']):
+            total += updated
+            self.stdout.write(f"Updated {total} services")
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt rankings for {total} services'))
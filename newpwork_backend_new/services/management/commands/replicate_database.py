@@ -0,0 +1,47 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from newpwork_backend_new.db_router import get_replicas
+
+
+class Command(BaseCommand):
+    help = 'Copy the primary SQLite database onto the read replicas (DATABASE_REPLICAS)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Repeat every INTERVAL seconds until interrupted; 0 copies once (default: 0)',
+        )
+
+    def handle(self, *args, **options):
+        replicas = get_replicas()
+        if not replicas:
+            raise CommandError('No read replicas configured; set DJANGO_DB_REPLICAS.')
+        primary = connections[DEFAULT_DB_ALIAS]
+        if primary.vendor != 'sqlite':
+            raise CommandError('replicate_database only copies SQLite databases.')
+
+        while True:
+            for alias in replicas:
+                start = time.perf_counter()
+                self.copy(primary, connections[alias].settings_dict['NAME'])
+                self.stdout.write(f"Copied to {alias} in {(time.perf_counter() - start) * 1000:.0f} ms")
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+
+    def copy(self, primary, path):
+        # The online backup API copies a consistent snapshot while the primary
+        # keeps serving writes; readers of the replica wait on busy_timeout
+        # while the pages are swapped in.
+        primary.ensure_connection()
+        target = sqlite3.connect(str(path), timeout=30)
+        try:
+            primary.connection.backup(target)
+        finally:
+            target.close()
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:44
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Avg, Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_ranking(apps, schema_editor):
+    Service = apps.get_model('services', 'Service')
+    Booking = apps.get_model('bookings', 'Booking')
+    per_service = Booking.objects.filter(
+        service_id=OuterRef('pk'), status='completed', rating__isnull=False
+    ).order_by().values('service_id')
+    Service.objects.update(
+        rating_average=Coalesce(Subquery(per_service.annotate(value=Avg('rating')).values('value')), Value(0.0)),
+        rating_count=Coalesce(Subquery(per_service.annotate(value=Count('id')).values('value')), Value(0)),
+    )
+    Service.objects.exclude(certificates='', degrees='').update(has_credentials=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0002_service_certificates_service_degrees'),
+        ('bookings', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='service',
+            name='has_credentials',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='rating_average',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['is_active', '-rating_average', '-has_credentials', '-created_at'], name='service_ranking_idx'),
+        ),
+        migrations.RunPython(backfill_ranking, migrations.RunPython.noop),
+    ]
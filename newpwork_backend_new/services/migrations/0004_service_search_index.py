@@ -0,0 +1,81 @@
+from django.db import migrations
+
+FTS_TABLE = 'services_service_fts'
+
+CREATE_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, location, certificates, category,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS services_service_fts_insert
+    AFTER INSERT ON services_service BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description, location, certificates, category)
+        VALUES (
+            new.id, new.title, new.description, new.location, new.certificates,
+            (SELECT name FROM services_servicecategory WHERE id = new.category_id)
+        );
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS services_service_fts_update
+    AFTER UPDATE OF title, description, location, certificates, category_id ON services_service BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+        INSERT INTO {FTS_TABLE}(rowid, title, description, location, certificates, category)
+        VALUES (
+            new.id, new.title, new.description, new.location, new.certificates,
+            (SELECT name FROM services_servicecategory WHERE id = new.category_id)
+        );
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS services_service_fts_delete
+    AFTER DELETE ON services_service BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS services_servicecategory_fts_update
+    AFTER UPDATE OF name ON services_servicecategory BEGIN
+        UPDATE {FTS_TABLE} SET category = new.name
+        WHERE rowid IN (SELECT id FROM services_service WHERE category_id = new.id);
+    END
+    """,
+    f"""
+    INSERT INTO {FTS_TABLE}(rowid, title, description, location, certificates, category)
+    SELECT s.id, s.title, s.description, s.location, s.certificates, c.name
+    FROM services_service s JOIN services_servicecategory c ON c.id = s.category_id
+    """,
+]
+
+DROP_SQL = [
+    'DROP TRIGGER IF EXISTS services_servicecategory_fts_update',
+    'DROP TRIGGER IF EXISTS services_service_fts_delete',
+    'DROP TRIGGER IF EXISTS services_service_fts_update',
+    'DROP TRIGGER IF EXISTS services_service_fts_insert',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        # FTS5 is SQLite-specific; other backends search with icontains.
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0003_service_ranking'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(CREATE_SQL), _run(DROP_SQL)),
+    ]
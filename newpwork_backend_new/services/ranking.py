@@ -0,0 +1,46 @@
+from django.db.models import Avg, Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from bookings.models import Booking
+from .service_models import Service
+
+
+def _rated_bookings():
+    return Booking.objects.filter(status=Booking.Status.COMPLETED, rating__isnull=False)
+
+
+def refresh_service_ranking(service_id: int) -> None:
+    """Recompute the stored rating columns of a single service.
+
+    Only touches that service's bookings, through the (service, status) index.
+    """
+    stats = _rated_bookings().filter(service_id=service_id).aggregate(
+        average=Avg("rating"), count=Count("id")
+    )
+    Service.objects.filter(pk=service_id).update(
+        rating_average=stats["average"] or 0,
+        rating_count=stats["count"],
+    )
+
+
+def rebuild_service_rankings(batch_size: int = 1000):
+    """Recompute the rating columns of every service, one id range at a time.
+
+    Yields the number of services updated per batch so callers can report progress.
+    """
+    per_service = _rated_bookings().filter(service_id=OuterRef("pk")).order_by().values("service_id")
+    average = per_service.annotate(value=Avg("rating")).values("value")
+    count = per_service.annotate(value=Count("id")).values("value")
+
+    last_id = 0
+    while True:
+        ids = list(
+            Service.objects.filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[:batch_size]
+        )
+        if not ids:
+            return
+        updated = Service.objects.filter(pk__in=ids).update(
+            rating_average=Coalesce(Subquery(average), Value(0.0)),
+            rating_count=Coalesce(Subquery(count), Value(0)),
+        )
+        last_id = ids[-1]
+        yield updated
@@ -0,0 +1,399 @@
+"""
+Response cache for the public catalog endpoints.
+
+``list_services``, ``service_detail`` and ``list_categories`` return the same
+bytes to every anonymous caller, so their rendered JSON is cached under the
+endpoint, its URL arguments and the query parameters that shape the result
+(``category``, ``q``, ``cursor``, ``page_size``/``limit``). Authenticated
+callers (whose page size can come from their preferences), ``?stream=1`` and
+non-JSON renderers bypass the cache.
+
+There are two tiers, as for ``principal_cache``: a small in-process LRU
+(L1) with a short TTL and a shared Django cache (L2). Entries are tagged -
+``service:<id>``, ``provider:<id>``, ``services`` for any list, ``categories``
+- and carry the version each tag had when they were built. Writes bump the
+versions of the tags they affect (see ``services.signals``), which retires
+exactly the entries built from the old data: a booking's new rating purges
+that service and the lists (its position may change), a KYC decision purges
+only the provider's services. Tag versions live in L2, so bumps are seen by
+every worker's L2 reads at once; other workers' L1 copies expire after the
+L1 TTL. L2 must be shared by the workers (a per-process LocMemCache would
+keep serving entries another worker's write retired); without one, leave
+``SHARED_CACHE`` unset and every worker's entries last only the L1 TTL.
+A customer who renames themselves is not tagged on the reviews they wrote;
+those entries pick the new name up when they expire (``SHARED_TTL``).
+
+Concurrent misses on one key in a worker are coalesced: the first request
+builds the response while the others wait for it.
+
+Settings (all optional)::
+
+    CATALOG_CACHE = {
+        "ENABLED": True,
+        "MAX_ENTRIES": 2000,        # L1 size
+        "TTL": 5,                   # seconds an L1 entry stays valid
+        "SHARED_CACHE": None,       # alias in CACHES for L2, None = L1 only
+        "SHARED_TTL": 300,          # seconds an L2 entry stays valid
+        "WAIT_TIMEOUT": 10,         # seconds a coalesced request waits
+    }
+"""
+
+import asyncio
+import functools
+import hashlib
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+from newpwork_backend_new.caching import LRUCache
+from newpwork_backend_new.db_router import primary_reads
+from newpwork_backend_new.renderers import ORJSONRenderer
+
+KEY_PREFIX = "catalog"
+CACHE_HEADER = "X-Catalog-Cache"
+KEY_PARAMS = ("category", "q", "cursor", "page_size", "limit")
+CACHED_HEADERS = ("Link", "X-Next-Cursor")
+
+
+def _config() -> dict:
+    config = {
+        "ENABLED": True,
+        "MAX_ENTRIES": 2000,
+        "TTL": 5,
+        "SHARED_CACHE": None,
+        "SHARED_TTL": 300,
+        "WAIT_TIMEOUT": 10,
+    }
+    config.update(getattr(settings, "CATALOG_CACHE", {}))
+    return config
+
+
+class _Flight:
+    """A response being built for a key, which other requests wait for."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry = None
+
+
+class ResponseCache:
+    def __init__(self):
+        config = _config()
+        self.enabled = config["ENABLED"]
+        self.local = LRUCache(max_entries=config["MAX_ENTRIES"], ttl=config["TTL"])
+        self.shared_alias = config["SHARED_CACHE"]
+        self.shared_ttl = config["SHARED_TTL"]
+        self.wait_timeout = config["WAIT_TIMEOUT"]
+        # Latest version seen for each tag, so local bumps retire L1 entries at once
+        self._versions = {}
+        self._flights = {}
+        self._async_flights = {}
+        self._lock = threading.Lock()
+        self.shared_hits = 0
+        self.coalesced = 0
+        self.builds = 0
+        self.invalidations = 0
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias] if self.shared_alias else None
+
+    # -- keys and tags -------------------------------------------------------
+
+    def make_key(self, endpoint, request, kwargs) -> str:
+        # None for an absent parameter: "?cursor=" asks for a page, no cursor does not
+        params = [(name, request.GET.get(name)) for name in KEY_PARAMS]
+        # Link headers carry absolute URLs
+        raw = repr((endpoint, request.scheme, request.get_host(), sorted(kwargs.items()), params))
+        return f"{KEY_PREFIX}:{endpoint}:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+    @staticmethod
+    def _tag_key(tag) -> str:
+        return f"{KEY_PREFIX}-tag:{tag}"
+
+    def _missing_versions(self, tags, found) -> dict:
+        # Start unseen tags at a unique value: an evicted counter must not
+        # come back as a version an old entry was built with
+        return {self._tag_key(tag): time.time_ns() for tag in tags if self._tag_key(tag) not in found}
+
+    def _remember_versions(self, tags, found) -> dict:
+        versions = {tag: found.get(self._tag_key(tag), 0) for tag in tags}
+        self._versions.update(versions)
+        return versions
+
+    def _current_versions(self, tags) -> dict:
+        shared = self.shared
+        if shared is None:
+            return {tag: self._versions.get(tag, 0) for tag in tags}
+        found = shared.get_many([self._tag_key(tag) for tag in tags])
+        missing = self._missing_versions(tags, found)
+        if missing:
+            for key, value in missing.items():
+                shared.add(key, value, timeout=None)
+            found.update(shared.get_many(list(missing)))
+        return self._remember_versions(tags, found)
+
+    async def _acurrent_versions(self, tags) -> dict:
+        shared = self.shared
+        if shared is None:
+            return {tag: self._versions.get(tag, 0) for tag in tags}
+        found = await shared.aget_many([self._tag_key(tag) for tag in tags])
+        missing = self._missing_versions(tags, found)
+        if missing:
+            for key, value in missing.items():
+                await shared.aadd(key, value, timeout=None)
+            found.update(await shared.aget_many(list(missing)))
+        return self._remember_versions(tags, found)
+
+    def _is_fresh(self, entry, versions=None) -> bool:
+        known = self._versions if versions is None else versions
+        return all(known.get(tag, version) == version for tag, version in entry["tags"].items())
+
+    def invalidate(self, *tags):
+        """Retire every entry built with any of ``tags``."""
+        self.invalidations += 1
+        shared = self.shared
+        for tag in tags:
+            if shared is None:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+                continue
+            key = self._tag_key(tag)
+            try:
+                self._versions[tag] = shared.incr(key)
+            except ValueError:
+                shared.add(key, time.time_ns(), timeout=None)
+                self._versions[tag] = shared.get(key)
+
+    # -- lookups -------------------------------------------------------------
+
+    def _lookup(self, key):
+        """Return ``(entry, tier)`` or ``(None, None)``."""
+        entry = self.local.get(key)
+        if entry is not None and self._is_fresh(entry):
+            return entry, "l1"
+        shared = self.shared
+        if shared is None:
+            return None, None
+        entry = shared.get(key)
+        if entry is None or not self._is_fresh(entry, self._current_versions(entry["tags"])):
+            return None, None
+        self.shared_hits += 1
+        self.local.set(key, entry)
+        return entry, "l2"
+
+    async def _alookup(self, key):
+        entry = self.local.get(key)
+        if entry is not None and self._is_fresh(entry):
+            return entry, "l1"
+        shared = self.shared
+        if shared is None:
+            return None, None
+        entry = await shared.aget(key)
+        if entry is None or not self._is_fresh(entry, await self._acurrent_versions(entry["tags"])):
+            return None, None
+        self.shared_hits += 1
+        self.local.set(key, entry)
+        return entry, "l2"
+
+    def _store(self, key, entry):
+        self.local.set(key, entry)
+        if self.shared is not None:
+            self.shared.set(key, entry, self.shared_ttl)
+
+    async def _astore(self, key, entry):
+        self.local.set(key, entry)
+        if self.shared is not None:
+            await self.shared.aset(key, entry, self.shared_ttl)
+
+    def _build_entry(self, content, headers, versions) -> dict:
+        self.builds += 1
+        return {
+            "content": content,
+            "headers": {name: headers[name] for name in CACHED_HEADERS if name in headers},
+            "tags": versions,
+        }
+
+    def get_or_build(self, key, build):
+        """Cached entry for ``key``, or the one ``build()`` returns (None = uncacheable)."""
+        entry, tier = self._lookup(key)
+        if entry is not None:
+            return entry, tier
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            if flight.done.wait(self.wait_timeout) and flight.entry is not None:
+                self.coalesced += 1
+                return flight.entry, "coalesced"
+            return build(), "miss"
+
+        try:
+            flight.entry = build()
+            if flight.entry is not None:
+                self._store(key, flight.entry)
+            return flight.entry, "miss"
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    async def aget_or_build(self, key, build):
+        """``get_or_build`` for async views; ``build`` is a coroutine function.
+
+        Uses the shared cache's async API (``aget``/``aset``...), so a network
+        backend does not block the event loop.
+        """
+        entry, tier = await self._alookup(key)
+        if entry is not None:
+            return entry, tier
+
+        future = self._async_flights.get(key)
+        if future is not None:
+            try:
+                entry = await asyncio.wait_for(asyncio.shield(future), self.wait_timeout)
+            except asyncio.TimeoutError:
+                entry = None
+            if entry is not None:
+                self.coalesced += 1
+                return entry, "coalesced"
+            return await build(), "miss"
+
+        future = self._async_flights[key] = asyncio.get_running_loop().create_future()
+        try:
+            entry = await build()
+            if entry is not None:
+                await self._astore(key, entry)
+            return entry, "miss"
+        finally:
+            del self._async_flights[key]
+            if not future.done():
+                future.set_result(entry)
+
+    def clear(self):
+        self.local.clear()
+        self._versions.clear()
+
+    def stats(self) -> dict:
+        return {
+            "local": self.local.stats(),
+            "shared_cache": self.shared_alias,
+            "shared_hits": self.shared_hits,
+            "coalesced": self.coalesced,
+            "builds": self.builds,
+            "invalidations": self.invalidations,
+        }
+
+
+response_cache = ResponseCache()
+
+
+def _cacheable(request) -> bool:
+    if not response_cache.enabled or request.method != "GET" or request.GET.get("stream"):
+        return False
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return False
+    # DRF's content negotiation: the browsable API is not cached
+    renderer = getattr(request, "accepted_renderer", None)
+    return renderer is None or renderer.format == "json"
+
+
+def _respond(entry, tier):
+    response = HttpResponse(entry["content"], content_type="application/json", headers=entry["headers"])
+    response[CACHE_HEADER] = tier
+    return response
+
+
+def cache_response(endpoint, tags):
+    """Cache the view's 200 responses for anonymous callers.
+
+    ``tags(data, **kwargs)`` names the tags of a response built from ``data``;
+    called with ``data=None`` before the view runs, it names the tags known
+    from the URL alone. Those are versioned before the view reads anything, so
+    a write committed while the response is built still retires it. The view
+    reads from the primary while an entry is built, even under
+    ``@replica_reads``: rows from a lagging replica would be stored under the
+    new versions. Goes below ``@permission_classes``/``@async_api_view``.
+    """
+
+    def versions_after(before, data, kwargs):
+        found = tags(data, **kwargs) - before.keys()
+        return {**before, **response_cache._current_versions(found)} if found else before
+
+    async def aversions_after(before, data, kwargs):
+        found = tags(data, **kwargs) - before.keys()
+        return {**before, **await response_cache._acurrent_versions(found)} if found else before
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+
+            @functools.wraps(view)
+            async def async_wrapped(request, *args, **kwargs):
+                if not _cacheable(request):
+                    return await view(request, *args, **kwargs)
+                built = []
+
+                async def build():
+                    before = await response_cache._acurrent_versions(tags(None, **kwargs))
+                    with primary_reads():
+                        response = await view(request, *args, **kwargs)
+                    built.append(response)
+                    if response.status_code != 200:
+                        return None
+                    versions = await aversions_after(before, response.data, kwargs)
+                    return response_cache._build_entry(ORJSONRenderer().render(response.data), response.headers, versions)
+
+                key = response_cache.make_key(endpoint, request, kwargs)
+                entry, tier = await response_cache.aget_or_build(key, build)
+                return _respond(entry, tier) if entry is not None else built[0]
+
+            return async_wrapped
+
+        @functools.wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if not _cacheable(request):
+                return view(request, *args, **kwargs)
+            built = []
+
+            def build():
+                before = response_cache._current_versions(tags(None, **kwargs))
+                with primary_reads():
+                    response = view(request, *args, **kwargs)
+                built.append(response)
+                if response.status_code != 200:
+                    return None
+                versions = versions_after(before, response.data, kwargs)
+                # Render once here; hits are served as these bytes
+                return response_cache._build_entry(ORJSONRenderer().render(response.data), response.headers, versions)
+
+            key = response_cache.make_key(endpoint, request, kwargs)
+            entry, tier = response_cache.get_or_build(key, build)
+            return _respond(entry, tier) if entry is not None else built[0]
+
+        return wrapped
+
+    return decorator
+
+
+def service_tags(data, service_id, **kwargs):
+    """A service detail: the service and its provider."""
+    tags = {f"service:{service_id}"}
+    if data is not None:
+        tags.add(f"provider:{data['provider']}")
+    return tags
+
+
+def service_list_tags(data, **kwargs):
+    """A page of services: any service change, plus the providers shown."""
+    return {"services"} | {f"provider:{row['provider']}" for row in data or ()}
+
+
+def category_list_tags(data, **kwargs):
+    return {"categories"}
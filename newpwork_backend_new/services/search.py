@@ -0,0 +1,103 @@
+"""
+Full-text search over services.
+
+On SQLite the catalog is mirrored into an FTS5 table (``services_service_fts``)
+that SQL triggers keep in sync with ``services_service`` and the category name
+in ``services_servicecategory``; see migration 0004. Queries are matched with
+prefix terms and ranked with BM25. Other backends fall back to ``icontains``.
+"""
+
+import re
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "services_service_fts"
+
+# Column weights for bm25(), in FTS column order:
+# title, description, location, certificates, category
+BM25_WEIGHTS = (10.0, 2.0, 3.0, 1.0, 5.0)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def fts_enabled() -> bool:
+    return connection.vendor == "sqlite"
+
+
+def build_match_query(text: str) -> str:
+    """Turn free text into an FTS5 query: every word must match as a prefix.
+
+    Words are quoted so FTS5 operators and punctuation in user input are
+    treated literally.
+    """
+    return " ".join(f'"{token}"*' for token in _TOKEN_RE.findall(text.lower()))
+
+
+def search_services(queryset, text: str):
+    """Filter ``queryset`` to services matching ``text``.
+
+    On SQLite the result is annotated with ``search_rank`` (lower is better),
+    which callers order by. Returns ``(queryset, ordering)``.
+    """
+    match = build_match_query(text)
+    if not match:
+        return queryset.none(), []
+
+    if not fts_enabled():
+        condition = Q()
+        for token in _TOKEN_RE.findall(text):
+            condition &= (
+                Q(title__icontains=token)
+                | Q(description__icontains=token)
+                | Q(location__icontains=token)
+                | Q(certificates__icontains=token)
+                | Q(category__name__icontains=token)
+            )
+        return queryset.filter(condition), []
+
+    weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+    queryset = queryset.extra(
+        tables=[FTS_TABLE],
+        where=[f"{FTS_TABLE}.rowid = services_service.id", f"{FTS_TABLE} MATCH %s"],
+        params=[match],
+    ).annotate(search_rank=RawSQL(f"bm25({FTS_TABLE}, {weights})", ()))
+    return queryset, ["search_rank"]
+
+
+def rebuild_search_index(batch_size: int = 5000):
+    """Rewrite the FTS table from ``services_service`` in id-range batches.
+
+    Each batch replaces the index rows for its own id range in one
+    transaction, so searches never see an empty index and rows written by the
+    triggers meanwhile are either replaced with the same values or written
+    after the batch. Yields the number of services indexed per batch.
+    """
+    if not fts_enabled():
+        return
+    insert = (
+        f"INSERT INTO {FTS_TABLE}(rowid, title, description, location, certificates, category) "
+        "SELECT s.id, s.title, s.description, s.location, s.certificates, c.name "
+        "FROM services_service s JOIN services_servicecategory c ON c.id = s.category_id "
+        "WHERE s.id > %s AND s.id <= %s"
+    )
+    last_id = 0
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT MAX(id) FROM (SELECT id FROM services_service WHERE id > %s ORDER BY id LIMIT %s)",
+                [last_id, batch_size],
+            )
+            batch_end = cursor.fetchone()[0]
+            if batch_end is None:
+                # Also drops index rows left behind by deleted services
+                cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid > %s", [last_id])
+                break
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid > %s AND rowid <= %s", [last_id, batch_end])
+            cursor.execute(insert, [last_id, batch_end])
+            indexed = cursor.rowcount
+        last_id = batch_end
+        yield indexed
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
@@ -19,6 +19,12 @@ class Service(models.Model):
     certificates = models.TextField(blank=True, help_text="List of certificates and degrees (comma-separated or JSON)")
     degrees = models.TextField(blank=True, help_text="Educational degrees and qualifications")
     is_active = models.BooleanField(default=True)
+
+    # Ranking columns, maintained from completed bookings (see services.ranking)
+    rating_average = models.FloatField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    has_credentials = models.BooleanField(default=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -26,10 +32,21 @@ class Service(models.Model):
         indexes = [
             models.Index(fields=["slug"]),
             models.Index(fields=["is_active", "category"]),
+            models.Index(
+                fields=["is_active", "-rating_average", "-has_credentials", "-created_at"],
+                name="service_ranking_idx",
+            ),
         ]
         ordering = ["-created_at"]
 
     def __str__(self) -> str:
         return self.title
 
+    def save(self, *args, **kwargs):
+        self.has_credentials = bool(self.certificates or self.degrees)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"certificates", "degrees"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "has_credentials"}
+        super().save(*args, **kwargs)
+
 
@@ -1,8 +1,18 @@
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce
 from rest_framework import serializers
 from .service_models import Service
 from bookings.models import Booking
 
 
+RECENT_REVIEWS_LIMIT = 10
+
+
+def completed_reviews_filter():
+    """Q matching completed bookings that carry a non-empty review."""
+    return Q(status=Booking.Status.COMPLETED, review__isnull=False) & ~Q(review="")
+
+
 class ServiceSerializer(serializers.ModelSerializer):
     provider_email = serializers.EmailField(source="provider.email", read_only=True)
     provider_name = serializers.CharField(source="provider.display_name", read_only=True)
@@ -39,18 +49,41 @@ class ServiceSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["provider", "created_at", "updated_at", "is_active"]
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Annotate and prefetch everything the serializer reads.
+
+        Keeps list endpoints at a constant number of queries: one for the
+        services (with the review count and provider, KYC and category joined
+        in) and one for the latest reviews of every service. The rating comes
+        from the stored ranking columns, so no aggregate over bookings is needed.
+        """
+        recent_reviews = (
+            Booking.objects.filter(completed_reviews_filter())
+            .select_related("customer")
+            .order_by("-updated_at")[:RECENT_REVIEWS_LIMIT]
+        )
+        review_count = (
+            Booking.objects.filter(completed_reviews_filter(), service=OuterRef("pk"))
+            .order_by()
+            .values("service")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+        return queryset.select_related("provider", "category").annotate(
+            review_count=Coalesce(Subquery(review_count, output_field=IntegerField()), 0),
+        ).prefetch_related(
+            Prefetch("bookings", queryset=recent_reviews, to_attr="recent_reviews")
+        )
+
     def get_average_rating(self, obj):
-        """Calculate average rating from completed bookings with ratings"""
-        from django.db.models import Avg
-        avg = Booking.objects.filter(
-            service=obj,
-            status=Booking.Status.COMPLETED,
-            rating__isnull=False
-        ).aggregate(avg_rating=Avg('rating'))['avg_rating']
-        return round(avg, 1) if avg else None
+        """Average rating from completed bookings, kept on the service row"""
+        return round(obj.rating_average, 1) if obj.rating_count else None
 
     def get_total_reviews(self, obj):
         """Count total reviews"""
+        if hasattr(obj, "review_count"):
+            return obj.review_count
         return Booking.objects.filter(
             service=obj,
             status=Booking.Status.COMPLETED,
@@ -59,17 +92,18 @@ class ServiceSerializer(serializers.ModelSerializer):
 
     def get_provider_verified(self, obj):
         """Check if provider has verified KYC"""
-        if hasattr(obj.provider, 'kyc_verification'):
-            return obj.provider.kyc_verification.is_verified
-        return False
+        return obj.provider.is_kyc_verified
 
     def get_reviews(self, obj):
         """Get recent reviews for this service"""
-        reviews = Booking.objects.filter(
-            service=obj,
-            status=Booking.Status.COMPLETED,
-            review__isnull=False
-        ).exclude(review='').order_by('-updated_at')[:10]
+        if hasattr(obj, "recent_reviews"):
+            reviews = obj.recent_reviews
+        else:
+            reviews = Booking.objects.filter(
+                service=obj,
+                status=Booking.Status.COMPLETED,
+                review__isnull=False
+            ).exclude(review='').select_related("customer").order_by('-updated_at')[:RECENT_REVIEWS_LIMIT]
         return [
             {
                 "id": r.id,
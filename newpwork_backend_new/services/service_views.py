@@ -3,59 +3,71 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.utils.text import slugify
-from django.db import models
 from .service_models import Service
 from .service_serializers import ServiceSerializer
+from .response_cache import cache_response, service_list_tags, service_tags
+from .search import search_services
 from accounts.models import UserRole
+from newpwork_backend_new.pagination import normalize_ordering, paginate_queryset
+from newpwork_backend_new.db_router import replica_reads
+from newpwork_backend_new.querybudget import query_budget
+from newpwork_backend_new.streaming import streaming_json_response, wants_stream
 
 
-@api_view(["GET"]) 
-@permission_classes([AllowAny])
-def list_services(request):
-    """Public list of active services, optionally filtered by category or search.
-    Services are prioritized: rating first, then certificates/degrees."""
-    from bookings.models import Booking
-    from django.db.models import Avg, Case, When, IntegerField
-    from .category_models import ServiceCategory
-    
+def catalog_queryset(request):
+    """Active services matching ``?category=``/``?q=``, and their ordering."""
     queryset = Service.objects.filter(is_active=True)
-    category = request.query_params.get("category")
-    search = request.query_params.get("q")
+    category = request.GET.get("category")
+    search = (request.GET.get("q") or "").strip()
     
     if category:
         queryset = queryset.filter(category__slug=category)
+
+    # Rating is primary, then certificates/degrees, then newest. All three are
+    # stored columns covered by service_ranking_idx. Searches rank by relevance.
+    ordering = ['-rating_average', '-has_credentials', '-created_at']
     if search:
-        queryset = queryset.filter(title__icontains=search)
-    
-    # Annotate with priority: rating is primary, then certificates/degrees
-    queryset = queryset.annotate(
-        avg_rating=Avg(
-            Case(
-                When(
-                    bookings__status='completed',
-                    bookings__rating__isnull=False,
-                    then='bookings__rating'
-                ),
-                default=None,
-                output_field=models.FloatField()
-            )
-        ),
-        has_certificates_or_degrees=Case(
-            When(certificates__isnull=False, certificates__gt='', then=1),
-            When(degrees__isnull=False, degrees__gt='', then=1),
-            default=0,
-            output_field=IntegerField()
-        )
-    ).order_by(
-        '-avg_rating',  # Higher rating first
-        '-has_certificates_or_degrees',  # Has certs/degrees second
-        '-created_at'  # Newest last
-    )
+        queryset, search_ordering = search_services(queryset, search)
+        ordering = search_ordering or ordering
+    return queryset, ordering
+
+
+def hydrate_services(ids):
+    """The services of a catalog page, with what ``ServiceSerializer`` reads."""
+    return ServiceSerializer.setup_eager_loading(Service.objects.filter(pk__in=ids))
+
+
+def stream_services(queryset, ordering, asynchronous=False):
+    """``?stream=1``: every service in ``queryset``, as one streamed array."""
+    queryset = ServiceSerializer.setup_eager_loading(queryset).order_by(*normalize_ordering(ordering))
+    return streaming_json_response(queryset, ServiceSerializer, asynchronous=asynchronous)
+
+
+def detail_queryset():
+    return ServiceSerializer.setup_eager_loading(Service.objects.filter(is_active=True))
+
+
+@query_budget(5)
+@api_view(["GET"]) 
+@permission_classes([AllowAny])
+@cache_response("list_services", service_list_tags)
+@replica_reads
+def list_services(request):
+    """Public list of active services, optionally filtered by category or search.
+    Services are prioritized: rating first, then certificates/degrees.
+    ``?stream=1`` streams every match as one array instead of a page."""
+    queryset, ordering = catalog_queryset(request)
+
+    if wants_stream(request):
+        return stream_services(queryset, ordering)
     
-    serializer = ServiceSerializer(queryset, many=True)
-    return Response(serializer.data)
+    # Locate the page on the bare rows, then load serializer data for it only.
+    page, headers = paginate_queryset(request, queryset, ordering, hydrate=hydrate_services)
+    serializer = ServiceSerializer(page, many=True)
+    return Response(serializer.data, headers=headers)
 
 
+@query_budget(8)
 @api_view(["POST"]) 
 @permission_classes([IsAuthenticated])
 def create_service(request):
@@ -65,11 +77,11 @@ def create_service(request):
         return Response({"detail": "Only providers can create services."}, status=status.HTTP_403_FORBIDDEN)
     
     # Check if provider has verified KYC
-    if not hasattr(user, 'kyc_verification') or not user.kyc_verification.is_verified:
+    if not user.is_kyc_verified:
         return Response({
             "detail": "KYC verification required to post services. Please complete your KYC verification first.",
             "kyc_required": True,
-            "kyc_status": user.kyc_verification.status if hasattr(user, 'kyc_verification') else "not_submitted"
+            "kyc_status": user.kyc_status
         }, status=status.HTTP_403_FORBIDDEN)
     data = request.data.copy()
     if not data.get("slug") and data.get("title"):
@@ -81,6 +93,7 @@ def create_service(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@query_budget(4)
 @api_view(["GET"]) 
 @permission_classes([IsAuthenticated])
 def my_services(request):
@@ -88,11 +101,12 @@ def my_services(request):
     user = request.user
     if getattr(user, "role", None) != UserRole.PROVIDER:
         return Response({"detail": "Only providers can view their services."}, status=status.HTTP_403_FORBIDDEN)
-    queryset = Service.objects.filter(provider=user)
+    queryset = ServiceSerializer.setup_eager_loading(Service.objects.filter(provider=user))
     serializer = ServiceSerializer(queryset, many=True)
     return Response(serializer.data)
 
 
+@query_budget(8)
 @api_view(["PATCH", "PUT"]) 
 @permission_classes([IsAuthenticated])
 def update_service(request, service_id: int):
@@ -112,12 +126,15 @@ def update_service(request, service_id: int):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@query_budget(3)
 @api_view(["GET"])
 @permission_classes([AllowAny])
+@cache_response("service_detail", service_tags)
+@replica_reads
 def service_detail(request, service_id: int):
     """Public service detail with reviews."""
     try:
-        service = Service.objects.get(id=service_id, is_active=True)
+        service = detail_queryset().get(id=service_id)
     except Service.DoesNotExist:
         return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
     serializer = ServiceSerializer(service)
@@ -0,0 +1,66 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from accounts.models import KYCVerification, User
+from bookings.models import Booking
+from .category_models import ServiceCategory
+from .ranking import refresh_service_ranking
+from .response_cache import response_cache
+from .service_models import Service
+
+
+def invalidate_catalog(*tags):
+    # After commit: a response rebuilt before then would still see the old rows
+    transaction.on_commit(lambda: response_cache.invalidate(*tags))
+
+
+@receiver(post_save, sender=Booking)
+def update_ranking_on_booking_save(sender, instance, **kwargs):
+    if instance.rating_changed:
+        refresh_service_ranking(instance.service_id)
+
+
+@receiver(post_delete, sender=Booking)
+def update_ranking_on_booking_delete(sender, instance, origin=None, **kwargs):
+    # Bookings removed by deleting their service need no refresh.
+    if isinstance(origin, Service) or getattr(origin, "model", None) is Service:
+        return
+    if instance.is_rated:
+        refresh_service_ranking(instance.service_id)
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+def invalidate_catalog_on_service_change(sender, instance, **kwargs):
+    # Category listings count active services
+    invalidate_catalog(f"service:{instance.pk}", "services", "categories")
+
+
+@receiver(post_save, sender=ServiceCategory)
+@receiver(post_delete, sender=ServiceCategory)
+def invalidate_catalog_on_category_change(sender, instance, **kwargs):
+    invalidate_catalog("categories", "services")
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def invalidate_catalog_on_review_change(sender, instance, **kwargs):
+    # Ratings and reviews only come from completed bookings
+    completed = Booking.Status.COMPLETED
+    if instance.rating_changed or completed in (instance.status, instance._loaded_status):
+        invalidate_catalog(f"service:{instance.service_id}", "services")
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_catalog_on_user_change(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login, which the catalog does not show
+    if update_fields is None or set(update_fields) != {"last_login"}:
+        invalidate_catalog(f"provider:{instance.pk}")
+
+
+@receiver(post_save, sender=KYCVerification)
+@receiver(post_delete, sender=KYCVerification)
+def invalidate_catalog_on_kyc_change(sender, instance, **kwargs):
+    # sync_user() updates the provider's verified flag without a User save
+    invalidate_catalog(f"provider:{instance.user_id}")
@@ -0,0 +1,109 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+
+from accounts.models import User, UserRole
+from bookings.models import Booking
+from newpwork_backend_new.querybudget import record_queries
+from .models import Service, ServiceCategory
+from .response_cache import CACHE_HEADER, response_cache
+
+
+class ServiceListQueryCountTests(TestCase):
+    """``list_services`` runs the same number of queries however big the catalog is."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = ServiceCategory.objects.create(name="Plumbing", slug="plumbing")
+        cls.customers = [
+            User.objects.create(username=f"customer{i}", email=f"customer{i}@example.com", role=UserRole.CUSTOMER)
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        # Measure the view, not the catalog response cache
+        patcher = mock.patch.object(response_cache, "enabled", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def add_services(self, count):
+        for _ in range(count):
+            n = Service.objects.count()
+            provider = User.objects.create(
+                username=f"provider{n}", email=f"provider{n}@example.com", role=UserRole.PROVIDER
+            )
+            service = Service.objects.create(
+                provider=provider,
+                category=self.category,
+                title=f"Service {n}",
+                slug=f"service-{n}",
+                description="Pipes fixed",
+                base_price=Decimal("100.00"),
+                certificates="Licensed" if n % 2 else "",
+            )
+            for rating, customer in enumerate(self.customers, start=3):
+                Booking.objects.create(
+                    service=service,
+                    customer=customer,
+                    status=Booking.Status.COMPLETED,
+                    rating=rating,
+                    review=f"Review {rating}",
+                )
+
+    def list_services(self):
+        with record_queries() as recorder:
+            response = self.client.get("/api/services/services/")
+        self.assertEqual(response.status_code, 200)
+        return response.json(), recorder.count
+
+    def test_query_count_is_flat_as_the_catalog_grows(self):
+        self.add_services(2)
+        small, small_queries = self.list_services()
+        self.add_services(18)
+        large, large_queries = self.list_services()
+
+        self.assertEqual(len(small), 2)
+        self.assertEqual(len(large), 20)
+        self.assertEqual(large_queries, small_queries)
+
+    def test_rows_carry_rating_reviews_and_provider(self):
+        self.add_services(2)
+        rows, _ = self.list_services()
+        for row in rows:
+            self.assertEqual(row["average_rating"], 4.0)
+            self.assertEqual(row["total_reviews"], 3)
+            self.assertEqual(len(row["reviews"]), 3)
+            self.assertIn("provider", row)
+
+
+class CatalogCacheKeyTests(TestCase):
+    """Cached catalog responses are keyed on which paging parameters are present."""
+
+    @classmethod
+    def setUpTestData(cls):
+        category = ServiceCategory.objects.create(name="Plumbing", slug="plumbing")
+        provider = User.objects.create(username="provider", email="provider@example.com", role=UserRole.PROVIDER)
+        for n in range(15):
+            Service.objects.create(
+                provider=provider,
+                category=category,
+                title=f"Service {n}",
+                slug=f"service-{n}",
+                description="Pipes fixed",
+                base_price=Decimal("100.00"),
+            )
+
+    def setUp(self):
+        response_cache.clear()
+        self.addCleanup(response_cache.clear)
+
+    def test_empty_paging_parameter_does_not_share_the_unpaged_entry(self):
+        for param in ("cursor", "page_size", "limit"):
+            with self.subTest(param=param):
+                response_cache.clear()
+                paged = self.client.get(f"/api/services/services/?{param}=")
+                unpaged = self.client.get("/api/services/services/")
+                self.assertEqual(len(paged.json()), 12)
+                self.assertEqual(len(unpaged.json()), 15)
+                self.assertEqual(unpaged[CACHE_HEADER], "miss")